@@ -0,0 +1,198 @@
+"""Atomic, batched output for generated assets.
+Every file is written to a temp file in its own directory and renamed over
+the target with os.replace, so an interrupted run or Godot's filesystem
+watcher never sees a half-written PNG. Writes go to an I/O thread pool
+while the caller keeps rendering and encoding; messages are collected in
+.log instead of printed per file. Uses only Python built-ins.
+
+    with AssetWriter(fsync=True) as out:
+        for spec in specs:
+            out.write_png(path, w, h, grid)    # encodes here, writes on the pool
+    print(out.summary())
+
+fsync=True makes the batch durable at one sync point: temp files are
+written unsynced, close() waits for them, syncs once, then renames them
+all into place and syncs the directories. Where os.sync is missing
+(Windows) each temp file is fsynced instead. Without fsync each file is
+renamed as soon as it is written. A path is logged once it is in place.
+"""
+import hashlib, os, time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Godot 4 importer settings for files we generate, matching the sidecars
+# the editor wrote for the committed assets: (importer, type, extension, params)
+IMPORTERS = {
+    ".png": ("texture", "CompressedTexture2D", "ctex", {"vram_texture": "false"}, """\
+compress/mode=0
+compress/high_quality=false
+compress/lossy_quality=0.7
+compress/uastc_level=0
+compress/rdo_quality_loss=0.0
+compress/hdr_compression=1
+compress/normal_map=0
+compress/channel_pack=0
+mipmaps/generate=false
+mipmaps/limit=-1
+roughness/mode=0
+roughness/src_normal=""
+process/channel_remap/red=0
+process/channel_remap/green=1
+process/channel_remap/blue=2
+process/channel_remap/alpha=3
+process/fix_alpha_border=true
+process/premult_alpha=false
+process/normal_map_invert_y=false
+process/hdr_as_srgb=false
+process/hdr_clamp_exposure=false
+process/size_limit=0
+detect_3d/compress_to=1
+"""),
+    ".wav": ("wav", "AudioStreamWAV", "sample", {}, """\
+force/8_bit=false
+force/mono=false
+force/max_rate=false
+force/max_rate_hz=44100
+edit/trim=false
+edit/normalize=false
+edit/loop_mode=0
+edit/loop_begin=0
+edit/loop_end=-1
+compress/mode=0
+"""),
+}
+
+def write_atomic(path, data, tmp=None):
+    """Write next to the target, then rename over it — readers never see a partial file."""
+    tmp = tmp or f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+def _uid(res):
+    """Stable ResourceUID text for a res:// path (Godot's base-34 a-y, 0-8 digits)."""
+    n = int.from_bytes(hashlib.sha256(res.encode()).digest()[:8], "big") & (2 ** 63 - 1)
+    digits = "abcdefghijklmnopqrstuvwxy012345678"
+    txt = ""
+    while n:
+        n, c = divmod(n, 34)
+        txt = digits[c] + txt
+    return "uid://" + txt
+
+def write_import(path):
+    """Write Godot's <path>.import sidecar for a generated file inside the
+    project, so exported builds import it. An existing sidecar belongs to
+    the editor and is left alone. Returns the sidecar path, or None."""
+    rel = os.path.relpath(os.path.abspath(path), ROOT)
+    ext = os.path.splitext(path)[1].lower()
+    if rel.startswith("..") or ext not in IMPORTERS or os.path.exists(path + ".import"):
+        return None
+    importer, rtype, dext, meta, params = IMPORTERS[ext]
+    res = "res://" + rel.replace(os.sep, "/")
+    dest = f"res://.godot/imported/{os.path.basename(path)}-{hashlib.md5(res.encode()).hexdigest()}.{dext}"
+    lines = ["[remap]", "", f'importer="{importer}"', f'type="{rtype}"', f'uid="{_uid(res)}"', f'path="{dest}"']
+    if meta:
+        lines += ["metadata={"] + [f'"{k}": {v}' for k, v in meta.items()] + ["}"]
+    lines += ["", "[deps]", "", f'source_file="{res}"', f'dest_files=["{dest}"]', "", "[params]", ""]
+    write_atomic(path + ".import", ("\n".join(lines) + "\n" + params).encode())
+    return path + ".import"
+
+def _sync():
+    if hasattr(os, "sync"):
+        os.sync()
+
+def _fsync_dir(path):
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:  # directories can't be opened on Windows
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+class AssetWriter:
+    """Batch of atomic file writes on a thread pool. Use as a context manager;
+    leaving the block with an exception drops temp files of pending writes."""
+
+    def __init__(self, workers=4, fsync=False):
+        self.fsync = fsync
+        self.log = []
+        self.files = 0
+        self.bytes = 0
+        self._pool = ThreadPoolExecutor(workers)
+        self._pending = []      # (path, tmp, future)
+        self._t0 = time.perf_counter()
+
+    def _write(self, path, tmp, data):
+        if self.fsync:
+            with open(tmp, "wb") as f:
+                f.write(data)
+                if not hasattr(os, "sync"):
+                    f.flush()
+                    os.fsync(f.fileno())
+        else:
+            write_atomic(path, data, tmp)
+
+    def write(self, path, data):
+        """Queue `data` for `path`; returns immediately."""
+        tmp = f"{path}.{os.getpid()}.{self.files}.tmp"
+        self._pending.append((path, tmp, self._pool.submit(self._write, path, tmp, data)))
+        self.files += 1
+        self.bytes += len(data)
+
+    def write_png(self, path, width, height, pixels):
+        from generate_sprites_v2 import encode_png
+        self.write(path, encode_png(width, height, pixels))
+
+    def close(self):
+        """Wait for every write; with fsync, sync once and rename the batch into place."""
+        pending, self._pending = self._pending, []
+        try:
+            for path, _, fut in pending:
+                fut.result()
+                if not self.fsync:
+                    self.log.append(f"Created {path}")
+            if self.fsync and pending:
+                _sync()
+                for path, tmp, _ in pending:
+                    os.replace(tmp, path)
+                    self.log.append(f"Created {path}")
+                for d in {os.path.dirname(os.path.abspath(p)) for p, _, _ in pending}:
+                    _fsync_dir(d)
+        except BaseException:
+            self._discard(pending)
+            raise
+        finally:
+            self._pool.shutdown()
+
+    def abort(self):
+        pending, self._pending = self._pending, []
+        self._pool.shutdown(cancel_futures=True)
+        self._discard(pending)
+
+    def _discard(self, pending):
+        for _, tmp, fut in pending:
+            if not fut.cancelled():
+                fut.exception()  # wait so the temp file is complete before removal
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    def summary(self):
+        return (f"{self.files} files, {self.bytes / 1024:.1f} KB in "
+                f"{time.perf_counter() - self._t0:.2f}s")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
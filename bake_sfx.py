@@ -0,0 +1,136 @@
+"""Offline SFX baker for Korean Fantasy TD.
+Renders the tone specs in scripts/AudioManager.gd (const SFX_TONES) to
+16-bit mono .wav files in assets/sfx/ (plus the Godot .import sidecar a
+new file needs to be exported), using the same synthesis as
+AudioManager._make_sound: squared linear-decay envelope, noise tones mixed
+60/40 with a sine at their freq. AudioManager loads the baked files and only
+synthesises sounds that are missing, so adding sounds costs no startup time.
+
+Samples are rendered a block at a time into an array('h'). Noise is seeded
+per sound name, so re-baking is reproducible. A manifest records each
+sound's spec hash and unchanged sounds are skipped. Uses only Python
+built-ins.
+
+Run: python bake_sfx.py [name ...] [--force]
+"""
+import argparse, array, hashlib, json, math, os, random, sys, wave
+
+from asset_writer import write_import
+from gd_constants import load_constants
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+AUDIO_GD = os.path.join(ROOT, "scripts", "AudioManager.gd")
+SFX_DIR = os.path.join(ROOT, "assets", "sfx")
+MANIFEST = os.path.join(SFX_DIR, "sfx_manifest.json")
+BLOCK = 1024
+TAU = 2.0 * math.pi
+
+# ── Synthesis ──
+
+def render_tone(tone, rate, rng):
+    """Float samples for one tone, rendered in BLOCK-sized chunks."""
+    n = int(tone["duration"] * rate)
+    vol = tone["volume"]
+    step = tone["freq"] * TAU / rate
+    noise = tone["type"] == "noise"
+    out = []
+    for b0 in range(0, n, BLOCK):
+        idx = range(b0, min(b0 + BLOCK, n))
+        env = [(1.0 - i / n) ** 2 * vol for i in idx]
+        sine = [math.sin(i * step) for i in idx]
+        if noise:
+            out.extend((rng.random() * 2.0 - 1.0) * e * 0.6 + s * e * 0.4 for e, s in zip(env, sine))
+        else:
+            out.extend(s * e for e, s in zip(env, sine))
+    return out
+
+def render_sound(name, tones, rate):
+    """16-bit PCM for a whole sound, laid out exactly like _make_sound's buffer."""
+    rng = random.Random(name)
+    total = int(sum(t["duration"] for t in tones) * rate)
+    pcm = array.array("h", bytes(total * 2))
+    offset = 0
+    for tone in tones:
+        samples = render_tone(tone, rate, rng)
+        # Tone lengths are truncated separately, so they can overrun `total`
+        samples = samples[:max(0, total - offset)]
+        pcm[offset:offset + len(samples)] = array.array(
+            "h", (int(max(-1.0, min(1.0, s)) * 32767) for s in samples))
+        offset += len(samples)
+    return pcm
+
+def write_wav(path, pcm, rate):
+    if sys.byteorder == "big":
+        pcm = array.array("h", pcm)
+        pcm.byteswap()
+    tmp = path + ".tmp"
+    with wave.open(tmp, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(pcm.tobytes())
+    os.replace(tmp, path)
+
+# ── Bake ──
+
+def spec_hash(tones, rate):
+    key = json.dumps([tones, rate], sort_keys=True).encode()
+    return hashlib.sha256(key).hexdigest()[:16]
+
+def load_manifest():
+    if not os.path.exists(MANIFEST):
+        return {"sounds": {}}
+    with open(MANIFEST) as f:
+        return json.load(f)
+
+def bake(names=None, force=False):
+    """Bake the named sounds (default all); returns the names actually rendered."""
+    consts = load_constants(AUDIO_GD)
+    specs, rate = consts["SFX_TONES"], consts["SAMPLE_RATE"]
+    for name in names or []:
+        if name not in specs:
+            raise ValueError(f"Unknown sound: {name}")
+    os.makedirs(SFX_DIR, exist_ok=True)
+    manifest = load_manifest()
+    entries = manifest["sounds"]
+    baked = []
+    for name, tones in specs.items():
+        if names and name not in names:
+            continue
+        digest = spec_hash(tones, rate)
+        path = os.path.join(SFX_DIR, name + ".wav")
+        if not force and entries.get(name, {}).get("hash") == digest and os.path.exists(path):
+            continue
+        pcm = render_sound(name, tones, rate)
+        write_wav(path, pcm, rate)
+        write_import(path)  # exported builds only ship imported sounds
+        entries[name] = {"file": f"assets/sfx/{name}.wav", "samples": len(pcm),
+                         "seconds": round(len(pcm) / rate, 4), "hash": digest}
+        baked.append(name)
+    for name in list(entries):
+        if name not in specs:
+            stale = os.path.join(ROOT, entries.pop(name)["file"])
+            for p in (stale, stale + ".import"):
+                if os.path.exists(p):
+                    os.remove(p)
+    manifest = {"sample_rate": rate, "source": "scripts/AudioManager.gd",
+                "sounds": dict(sorted(entries.items()))}
+    tmp = MANIFEST + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(manifest, f, indent=2)
+        f.write("\n")
+    os.replace(tmp, MANIFEST)
+    return baked
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Bake AudioManager SFX to assets/sfx/*.wav")
+    ap.add_argument("names", nargs="*", help="sounds to bake (default: all)")
+    ap.add_argument("--force", action="store_true", help="re-render even if unchanged")
+    args = ap.parse_args(argv)
+    baked = bake(args.names, args.force)
+    for name in baked:
+        print(f"  Baked assets/sfx/{name}.wav")
+    print(f"{len(baked)} baked, manifest: assets/sfx/sfx_manifest.json")
+
+if __name__ == "__main__":
+    main()
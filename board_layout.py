@@ -0,0 +1,135 @@
+"""Board layouts for the offline tools — which structures sit on which tiles.
+A layout is JSON, with grid coords as [x, y] and optional upgrade level:
+
+    {"walls": [[5, 3], [5, 4]], "rocks": [[8, 7]],
+     "towers": [[6, 5, 2]], "archers": [[9, 9]]}
+
+"spawns"/"goal" may override the map points from GridManager._ready().
+Uses only Python built-ins.
+"""
+import json
+from collections import deque
+
+from gd_constants import load_constants, get_upgrade_cost
+
+# layout key -> Constants.BuildItem member
+LAYOUT_ITEMS = {
+    "walls": "WALL",
+    "rocks": "ROCK",
+    "towers": "ARCHER_TOWER",
+    "archers": "GROUND_ARCHER",
+}
+
+def default_spawns(C):
+    # Mirrors GridManager._ready()
+    return [(0, 3), (0, 7), (0, 11)]
+
+def default_goal(C):
+    return (C["GRID_WIDTH"] - 1, C["GRID_HEIGHT"] // 2)
+
+def normalize_layout(raw, C=None):
+    """Fill defaults and turn every entry into tuples: structures are (x, y, level)."""
+    C = C or load_constants()
+    layout = {
+        "name": raw.get("name", ""),
+        "width": raw.get("width", C["GRID_WIDTH"]),
+        "height": raw.get("height", C["GRID_HEIGHT"]),
+        "spawns": [tuple(p) for p in raw.get("spawns", default_spawns(C))],
+        "goal": tuple(raw.get("goal", default_goal(C))),
+    }
+    for key in LAYOUT_ITEMS:
+        layout[key] = [(e[0], e[1], e[2] if len(e) > 2 else 1) for e in raw.get(key, [])]
+    return layout
+
+def load_layout(path, C=None, validate=True, budget=True):
+    """Read and normalize a layout; by default raise ValueError if it is not
+    legal in-game (see validate_layout)."""
+    with open(path) as f:
+        raw = json.load(f)
+    raw.setdefault("name", path)
+    layout = normalize_layout(raw, C)
+    if validate:
+        check_layout(layout, C, budget)
+    return layout
+
+def structures(layout, C=None):
+    """Yield (x, y, BuildItem value, level) for every structure in the layout."""
+    C = C or load_constants()
+    for key, member in LAYOUT_ITEMS.items():
+        item = C["BuildItem"][member]
+        for x, y, level in layout[key]:
+            yield x, y, item, level
+
+def blocked_cells(layout, C=None):
+    """Set of (x, y) occupied by blocking structures (BUILD_DATA "blocking")."""
+    C = C or load_constants()
+    return {(x, y) for x, y, item, _ in structures(layout, C) if C["BUILD_DATA"][item]["blocking"]}
+
+def layout_cost(layout, C=None):
+    """Gold to build the layout from scratch, upgrades included."""
+    C = C or load_constants()
+    total = 0
+    for _, _, item, level in structures(layout, C):
+        total += C["BUILD_DATA"][item]["cost"]
+        for lv in range(1, level):
+            total += get_upgrade_cost(C, item, lv)
+    return total
+
+def goal_distances(width, height, blocked, goal):
+    """BFS steps to goal over the 4-connected grid; -1 = unreachable."""
+    dist = [[-1] * width for _ in range(height)]
+    gx, gy = goal
+    if goal in blocked:
+        return dist
+    dist[gy][gx] = 0
+    q = deque([goal])
+    while q:
+        x, y = q.popleft()
+        d = dist[y][x] + 1
+        for nx, ny in ((x+1, y), (x, y+1), (x-1, y), (x, y-1)):
+            if 0 <= nx < width and 0 <= ny < height and dist[ny][nx] < 0 and (nx, ny) not in blocked:
+                dist[ny][nx] = d
+                q.append((nx, ny))
+    return dist
+
+def starting_budget(C):
+    """Gold to build with before wave 1: starting gold plus one plan phase."""
+    return C["STARTING_GOLD"] + int(C["GOLD_PER_SECOND"] * C["PLAN_PHASE_DURATION"])
+
+def validate_layout(layout, C=None, budget=True):
+    """List of problems (empty if the layout is legal in-game). budget=False
+    skips the affordability check, for tools that only draw the board."""
+    C = C or load_constants()
+    problems = []
+    seen = set()
+    special = set(layout["spawns"]) | {layout["goal"]}
+    W, H = layout["width"], layout["height"]
+    for x, y in special:
+        if not (0 <= x < W and 0 <= y < H):
+            problems.append(f"spawn/goal ({x},{y}) is outside the grid")
+    if problems:
+        return problems
+    for x, y, item, level in structures(layout, C):
+        if not (0 <= x < W and 0 <= y < H):
+            problems.append(f"({x},{y}) is outside the grid")
+        if (x, y) in seen:
+            problems.append(f"({x},{y}) is occupied twice")
+        if (x, y) in special:
+            problems.append(f"({x},{y}) is a spawn/goal tile")
+        if not 1 <= level <= C["MAX_UPGRADE_LEVEL"]:
+            problems.append(f"({x},{y}) has invalid level {level}")
+        seen.add((x, y))
+    dist = goal_distances(W, H, blocked_cells(layout, C), layout["goal"])
+    for sx, sy in layout["spawns"]:
+        if dist[sy][sx] < 0:
+            problems.append(f"spawn ({sx},{sy}) has no path to the goal")
+    if budget and not problems and layout_cost(layout, C) > starting_budget(C):
+        problems.append(f"costs {layout_cost(layout, C)}g, more than the {starting_budget(C)}g available by wave 1")
+    return problems
+
+def check_layout(layout, C=None, budget=True):
+    """Raise ValueError listing every validate_layout problem."""
+    problems = validate_layout(layout, C, budget)
+    if problems:
+        raise ValueError(f"{layout['name'] or 'layout'}: " + "; ".join(problems))
+    return layout
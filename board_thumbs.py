@@ -0,0 +1,131 @@
+"""Batch board thumbnails for level select, balance reviews and bug reports.
+Every layout is baked with map_bake.BoardBaker. Tiles and structures are
+placed with Constants.grid_to_world, and structures are depth-sorted by
+gx + gy like their z_index. The image is box-filtered down by --scale
+and written as <out>/<layout name>.png.
+
+Layouts are spread over a process pool. The baker (decoded sprite runs)
+is built before the pool forks, so workers share it copy-on-write and
+each one keeps its own per-board-shape tile cache. The downscale never
+loops over pixels in Python. Each row is widened to 16-bit lanes and
+read as one big int. k row ints are summed (vertical box), k pixel
+shifts are summed (horizontal box), then the result is shifted by
+log2(k*k) and masked back to bytes. Uses only Python built-ins.
+
+Run: python board_thumbs.py layouts/*.json [--out thumbs] [--scale 4] [--workers N]
+     python board_thumbs.py --random 2000 --scale 8     (throughput benchmark)
+"""
+import argparse, glob, os, random, sys, time
+from multiprocessing import Pool
+
+from asset_writer import write_atomic
+from board_layout import LAYOUT_ITEMS, load_layout, normalize_layout
+from gd_constants import load_constants
+from map_bake import BoardBaker
+
+SCALES = (1, 2, 4, 8, 16)
+
+# ── Downscale ──
+
+def downscale(width, height, rows, k):
+    """Box-filter RGBA byte rows by k (a power of two, at most 16; 1 = unchanged).
+    Edges that don't fill a k x k box are cropped."""
+    if k == 1:
+        return width, height, rows
+    ow, oh = width // k, height // k
+    n = ow * k * 4
+    shift = 2 * (k.bit_length() - 1)
+    mask = int.from_bytes(b"\x00\xff" * n, "big")
+    out = []
+    for oy in range(oh):
+        total = 0
+        for row in rows[oy * k:(oy + 1) * k]:
+            wide = bytearray(2 * n)
+            wide[1::2] = row[:n]
+            total += int.from_bytes(wide, "big")
+        box = total
+        for j in range(1, k):
+            box += total >> (64 * j)  # add the pixel j to the left
+        avg = ((box >> shift) & mask).to_bytes(2 * n, "big")[1::2]
+        o = bytearray(ow * 4)
+        for c in range(4):
+            o[c::4] = avg[(k - 1) * 4 + c::4 * k]
+        out.append(o)
+    return ow, oh, out
+
+# ── Workers ──
+
+_baker = None
+
+def _init():
+    global _baker
+    if _baker is None:
+        _baker = BoardBaker()
+
+def render_one(job):
+    """job = (layout, out path, scale) -> (path, w, h, seconds)."""
+    from generate_sprites_v2 import encode_png
+    layout, path, k = job
+    t0 = time.perf_counter()
+    w, h, rows = downscale(*_baker.bake(layout), k)
+    write_atomic(path, encode_png(w, h, rows))
+    return path, w, h, time.perf_counter() - t0
+
+def random_layouts(count, C, seed=1):
+    """Benchmark boards: random structures off the spawn/goal tiles."""
+    rng = random.Random(seed)
+    base = normalize_layout({}, C)
+    free = [(x, y) for x in range(base["width"]) for y in range(base["height"])
+            if (x, y) not in base["spawns"] and (x, y) != base["goal"]]
+    out = []
+    for i in range(count):
+        cells = rng.sample(free, rng.randrange(10, 60))
+        raw = {"name": f"random_{i:05d}"}
+        for key in LAYOUT_ITEMS:
+            raw[key] = []
+        for x, y in cells:
+            raw[rng.choice(list(LAYOUT_ITEMS))].append([x, y, rng.randint(1, C["MAX_UPGRADE_LEVEL"])])
+        out.append(normalize_layout(raw, C))
+    return out
+
+def _paths(patterns):
+    paths = []
+    for p in patterns:
+        if os.path.isdir(p):
+            paths += sorted(glob.glob(os.path.join(p, "*.json")))
+        else:
+            paths += sorted(glob.glob(p)) or [p]
+    return paths
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Render board layouts to thumbnails")
+    ap.add_argument("layouts", nargs="*", help="layout JSON files, globs or directories")
+    ap.add_argument("--out", default="thumbs")
+    ap.add_argument("--scale", type=int, default=4, choices=SCALES, help="downscale factor")
+    ap.add_argument("--workers", type=int, default=os.cpu_count())
+    ap.add_argument("--random", type=int, default=0, help="also render N random boards")
+    args = ap.parse_args(argv)
+    C = load_constants()
+    layouts = [load_layout(p, C, budget=False) for p in _paths(args.layouts)]
+    layouts += random_layouts(args.random, C)
+    if not layouts:
+        ap.error("no layouts given")
+    os.makedirs(args.out, exist_ok=True)
+    jobs = [(lay, os.path.join(args.out, os.path.splitext(os.path.basename(lay["name"]))[0] + ".png"),
+             args.scale) for lay in layouts]
+    t0 = time.perf_counter()
+    _init()  # built before forking: workers inherit the decoded sprites
+    if args.workers > 1:
+        with Pool(args.workers, initializer=_init) as pool:
+            results = list(pool.imap_unordered(render_one, jobs,
+                                               chunksize=max(1, len(jobs) // (args.workers * 8))))
+    else:
+        results = [render_one(j) for j in jobs]
+    elapsed = time.perf_counter() - t0
+    _, w, h, _ = results[0]
+    per = sum(r[3] for r in results) / len(results)
+    print(f"{len(results)} boards -> {args.out}/ ({w}x{h}) in {elapsed:.2f}s: "
+          f"{len(results) / elapsed * 60:,.0f}/min, {per * 1000:.1f} ms per board per worker")
+
+if __name__ == "__main__":
+    sys.exit(main())
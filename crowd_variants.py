@@ -0,0 +1,234 @@
+"""Batched crowd variants: thousands of seeded looks from one enemy base.
+A base frame (_orc_base / _demon_base) is turned into an index image once.
+Every colour gets a palette slot, and skin colours are repeated for each
+tint while armour colours are repeated for each metal and shade. A variant
+is then just a per-pixel index offset, applied to the whole image at once:
+the index image is a big int with one byte per pixel, and
+0/1 masks for skin and armour are big ints too, so
+
+    idx = horns[k] + skin * (tint * S) + armour * metal_off + (noise & armour) * A
+
+never carries between bytes. All N index images are stacked into one
+buffer, and bytes.translate maps the whole stack to R, G, B and A planes
+in four C-level calls. The planes are interleaved into RGBA and packed
+into a POT atlas with a JSON index (seed, region, tint, metal, horns).
+Variant k of a given seed is identical on every run; the global `random`
+state is not touched. Uses only Python built-ins.
+
+    stack, meta = render_variants("demon", range(4096))
+    lay, rows = pack_atlas(stack, len(meta))
+
+Run: python crowd_variants.py orc --count 4096 [--start 0] [--out crowd/orc.png]
+"""
+import argparse, colorsys, json, os, random, sys, time
+
+import generate_sprites_v2 as gen
+from asset_writer import AssetWriter
+from sprite_sheets import grid_layout
+
+TRANSPARENT = (0, 0, 0, 0)
+HUE_SPREAD = 0.16         # skin tints span +-8% of the hue circle
+NOISE_DENSITY = 0.3       # share of armour pixels shaded by noise
+SHADE = 0.78              # brightness of noise-shaded armour
+
+# Armour colour multipliers: iron, bronze, blackened steel, rust
+METALS = [(1.0, 1.0, 1.0), (1.3, 1.05, 0.7), (0.7, 0.75, 0.85), (1.2, 0.85, 0.65)]
+
+TUSK = (220, 210, 180, 255)
+HORN, HORN_TIP = (180, 160, 80, 255), (200, 180, 90, 255)
+
+# base: frame function, armour rect (x0, y0, x1, y1), colours never
+# recoloured, horn/tusk shape edits ({(x, y): colour, None = erase})
+BASES = {
+    "orc": {
+        "base": gen._orc_base,
+        "armour": (12, 16, 20, 20),
+        "fixed": {(0, 0, 0, 60), TUSK, (200, 50, 30, 255), (100, 70, 40, 255),
+                  (120, 85, 50, 255), (150, 150, 150, 255)},
+        "horns": [
+            {},
+            {(13, 15): TUSK, (19, 15): TUSK},                 # long tusks
+            {(13, 14): None, (19, 14): None},                 # stubs
+            {(13, 14): None, (19, 15): TUSK},                 # broken left
+        ],
+    },
+    "demon": {
+        "base": gen._demon_base,
+        "armour": (10, 16, 22, 22),
+        "fixed": {(0, 0, 0, 80), HORN, HORN_TIP, (255, 100, 0, 255), (255, 180, 0, 255),
+                  (255, 150, 0, 255), (255, 200, 0, 255), (255, 100, 0, 200)},
+        "horns": [
+            {},
+            {(8, 3): None, (24, 3): None},                    # short
+            {(8, 2): HORN_TIP, (24, 2): HORN_TIP},            # tall
+            {(7, 2): HORN_TIP, (25, 2): HORN_TIP},            # swept out
+            {(9, 2): HORN_TIP, (23, 2): HORN_TIP},            # curled in
+        ],
+    },
+}
+
+# ── Palette plan ──
+
+def _tint(c, k, count):
+    """Skin colour c under tint k of count: hue shift plus a small value step."""
+    h, s, v = colorsys.rgb_to_hsv(c[0] / 255, c[1] / 255, c[2] / 255)
+    h = (h + (k / max(1, count - 1) - 0.5) * HUE_SPREAD) % 1.0
+    v = min(1.0, v * (1 + ((k * 3) % 5 - 2) * 0.06))
+    r, g, b = colorsys.hsv_to_rgb(h, s, v)
+    return (round(r * 255), round(g * 255), round(b * 255), c[3])
+
+def _metal(c, m, shade):
+    f = SHADE if shade else 1.0
+    return tuple(min(255, round(ch * k * f)) for ch, k in zip(c[:3], METALS[m])) + (c[3],)
+
+class VariantPlan:
+    """Index images, masks and channel LUTs for one base; built once."""
+
+    def __init__(self, name):
+        d = BASES[name]
+        base = d["base"]()
+        self.name = name
+        self.height, self.width = len(base), len(base[0])
+        frames = []
+        for edits in d["horns"]:
+            rows = [list(base[y]) for y in range(self.height)]
+            for (x, y), c in edits.items():
+                rows[y][x] = c or TRANSPARENT
+            frames.append(rows)
+        x0, y0, x1, y1 = d["armour"]
+        fixed, armour, skin = [TRANSPARENT], [], []
+        kinds = []  # per horn variant: [(kind, colour)] per pixel
+        for rows in frames:
+            px = []
+            for y, row in enumerate(rows):
+                for x, c in enumerate(row):
+                    if c[3] == 0:
+                        c, kind = TRANSPARENT, fixed
+                    elif c in d["fixed"]:
+                        kind = fixed
+                    elif x0 <= x <= x1 and y0 <= y <= y1:
+                        kind = armour
+                    else:
+                        kind = skin
+                    if c not in kind:
+                        kind.append(c)
+                    px.append((kind, c))
+            kinds.append(px)
+        F, A, S = len(fixed), len(armour), len(skin)
+        self.armour_size = A
+        self.metal_step = 2 * A
+        self.skin_step = S
+        self.tints = (256 - F - len(METALS) * 2 * A) // S if S else 1
+        if self.tints < 2:
+            raise ValueError(f"{name}: {F + A + S} colours leave no room for tints")
+        # Slots: fixed | armour x (metal, shade) | skin x tint
+        palette = list(fixed)
+        for m in range(len(METALS)):
+            for shade in (0, 1):
+                palette += [_metal(c, m, shade) for c in armour]
+        for k in range(self.tints):
+            palette += [_tint(c, k, self.tints) for c in skin]
+        palette += [TRANSPARENT] * (256 - len(palette))
+        self.luts = [bytes(c[ch] for c in palette) for ch in range(4)]
+        slot = {id(fixed): 0, id(armour): F, id(skin): F + len(METALS) * 2 * A}
+        n = self.width * self.height
+        self.size = n
+        self.horns = []
+        for px in kinds:
+            idx = bytes(slot[id(kind)] + kind.index(c) for kind, c in px)
+            sk = bytes(1 if kind is skin else 0 for kind, _ in px)
+            ar = bytes(1 if kind is armour else 0 for kind, _ in px)
+            self.horns.append((int.from_bytes(idx, "big"), int.from_bytes(sk, "big"),
+                               int.from_bytes(ar, "big")))
+        self.noise_lut = bytes(1 if b < NOISE_DENSITY * 256 else 0 for b in range(256))
+
+    def index_image(self, seed):
+        """(index bytes, meta) for one seed."""
+        rng = random.Random(seed)
+        tint = rng.randrange(self.tints)
+        metal = rng.randrange(len(METALS))
+        horn = rng.randrange(len(self.horns))
+        noise = int.from_bytes(rng.randbytes(self.size).translate(self.noise_lut), "big")
+        idx, skin, armour = self.horns[horn]
+        idx += skin * (tint * self.skin_step) + armour * (metal * self.metal_step)
+        idx += (noise & armour) * self.armour_size
+        return idx.to_bytes(self.size, "big"), {"seed": seed, "tint": tint,
+                                                "metal": metal, "horns": horn}
+
+# ── Rendering ──
+
+_plans = {}
+
+def plan(name):
+    if name not in _plans:
+        _plans[name] = VariantPlan(name)
+    return _plans[name]
+
+def render_variants(name, seeds):
+    """(rgba, meta): all variants' RGBA stacked frame after frame, 4 bytes per pixel."""
+    p = plan(name)
+    images, meta = [], []
+    for s in seeds:
+        idx, m = p.index_image(s)
+        images.append(idx)
+        meta.append(m)
+    stack = b"".join(images)
+    rgba = bytearray(len(stack) * 4)
+    for ch, lut in enumerate(p.luts):
+        rgba[ch::4] = stack.translate(lut)
+    return rgba, meta
+
+def variant_grid(rgba, i, fw=32, fh=32):
+    """Variant i of a stack as a pixel grid (for tools that draw on it)."""
+    base = i * fw * fh * 4
+    return [[tuple(rgba[base + (y * fw + x) * 4:base + (y * fw + x) * 4 + 4]) for x in range(fw)]
+            for y in range(fh)]
+
+def pack_atlas(rgba, count, fw=32, fh=32, max_width=2048):
+    """(layout, byte rows) of a POT atlas holding count stacked variants."""
+    lay = grid_layout(count, fw, fh, pot=True, max_width=max_width)
+    cols, stride, frame = lay["cols"], fw * 4, fw * fh * 4
+    pad = bytes((lay["width"] - cols * fw) * 4)
+    rows = []
+    for r in range(lay["rows"]):
+        first = r * cols
+        n = min(cols, count - first)
+        tail = bytes((cols - n) * stride) + pad
+        for y in range(fh):
+            off = first * frame + y * stride
+            rows.append(b"".join(rgba[off + k * frame:off + k * frame + stride] for k in range(n)) + tail)
+    rows += [bytes(lay["width"] * 4)] * (lay["height"] - len(rows))
+    return lay, rows
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Render N seeded enemy variants into one atlas")
+    ap.add_argument("base", choices=sorted(BASES))
+    ap.add_argument("--count", type=int, default=1024)
+    ap.add_argument("--start", type=int, default=0, help="first seed")
+    ap.add_argument("--max-width", type=int, default=2048)
+    ap.add_argument("--out", help="atlas PNG (default crowd/<base>.png); index goes next to it as .json")
+    args = ap.parse_args(argv)
+    out = args.out or os.path.join("crowd", args.base + ".png")
+    plan(args.base)
+    t0 = time.perf_counter()
+    rgba, meta = render_variants(args.base, range(args.start, args.start + args.count))
+    t1 = time.perf_counter()
+    lay, rows = pack_atlas(rgba, len(meta), max_width=args.max_width)
+    t2 = time.perf_counter()
+    p = plan(args.base)
+    for m, region in zip(meta, lay.pop("regions")):
+        m["region"] = region
+    index = {"base": args.base, "tints": p.tints, "metals": len(METALS),
+             "horn_shapes": len(p.horns), **lay, "variants": meta}
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with AssetWriter() as w:
+        w.write(out, gen.encode_png(lay["width"], lay["height"], rows))
+        w.write(os.path.splitext(out)[0] + ".json", json.dumps(index, separators=(",", ":")).encode())
+    t3 = time.perf_counter()
+    print(f"{args.count} {args.base} variants: render {(t1 - t0) * 1000:.1f} ms "
+          f"({args.count / max(t1 - t0, 1e-9):,.0f}/s), atlas {(t2 - t1) * 1000:.1f} ms, "
+          f"encode+write {(t3 - t2) * 1000:.0f} ms -> {out} {lay['width']}x{lay['height']}")
+    print(f"looks: {p.tints} tints x {len(METALS)} metals x {len(p.horns)} horn shapes x armour noise")
+
+if __name__ == "__main__":
+    sys.exit(main())
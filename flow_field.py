@@ -0,0 +1,231 @@
+"""Flow-field export: one BFS from the goal serves every enemy.
+GridManager rebuilds its AStar2D on every placement, and then each live
+Enemy runs its own get_path_to_goal() A*. A flow field turns that around.
+One breadth-first search from the goal over the same 4-connected grid
+gives every cell its step count to the goal and the direction of a
+neighbour one step closer. An enemy then only reads its cell's direction.
+Blocked cells point to their nearest open neighbour, so an enemy caught by
+a new wall walks off it, as get_closest_point() does for A*. Uses only
+Python built-ins.
+
+File format (little-endian, loads straight into a PackedByteArray):
+    0  "FLOW"      magic
+    4  u8          version (2)
+    5  u8 x 3      reserved
+    8  u16 u16     width, height
+   12  u16 u16     goal x, goal y
+   16  u16[w*h]    distance to goal per cell (row-major), 0xFFFF = no path
+    .  u8[w*h]     direction: 0 right, 1 down, 2 left, 3 up, 4 goal,
+                   5 blocked with no open neighbour, 255 open but no path
+
+A cell is blocked when its distance is 0xFFFF and its direction is not 255.
+
+    var dist := bytes.decode_u16(16 + 2 * (gy * w + gx))
+    var dir := bytes[16 + 2 * w * h + gy * w + gx]
+
+Run: python flow_field.py layouts/serpentine.json [-o serpentine.flow] [--show]
+     python flow_field.py layouts/open_field.json --bench [--agents 40] [--placements 30]
+"""
+import argparse, heapq, os, random, struct, sys, time
+from collections import deque
+
+from asset_writer import write_atomic
+from board_layout import blocked_cells, load_layout
+from gd_constants import load_constants
+from path_oracle import RebuildReference
+
+MAGIC = b"FLOW"
+VERSION = 2
+HEADER = struct.Struct("<4sB3xHHHH")
+NO_PATH = 0xFFFF
+DIRS = [(1, 0), (0, 1), (-1, 0), (0, -1)]  # same neighbour order as goal_distances()
+GOAL, BLOCKED, NONE = 4, 5, 255
+ARROWS = ">v<^*"
+
+class FlowField:
+    """Distance-to-goal and next-step direction for every cell of a grid."""
+
+    def __init__(self, width, height, goal, blocked=()):
+        self.w, self.h = width, height
+        self.goal = tuple(goal)
+        self.blocked = set(blocked)
+        self.update()
+
+    def update(self, blocked=None):
+        """Recompute after the blocked set changed (one BFS, O(cells))."""
+        if blocked is not None:
+            self.blocked = set(blocked)
+        w, h = self.w, self.h
+        dist = [NO_PATH] * (w * h)
+        dirs = bytearray([NONE]) * (w * h)
+        gx, gy = self.goal
+        if self.goal not in self.blocked:
+            open_ = [True] * (w * h)
+            for x, y in self.blocked:
+                open_[y * w + x] = False
+            g = gy * w + gx
+            dist[g], dirs[g] = 0, GOAL
+            q = deque([(gx, gy)])
+            while q:
+                x, y = q.popleft()
+                d = dist[y * w + x] + 1
+                for k, (dx, dy) in enumerate(DIRS):
+                    nx, ny = x + dx, y + dy
+                    if 0 <= nx < w and 0 <= ny < h:
+                        i = ny * w + nx
+                        if open_[i] and dist[i] == NO_PATH:
+                            dist[i] = d
+                            dirs[i] = k ^ 2  # the step back towards (x, y)
+                            q.append((nx, ny))
+        for x, y in self.blocked:
+            dirs[y * w + x] = BLOCKED
+            best = NO_PATH
+            for k, (dx, dy) in enumerate(DIRS):
+                nx, ny = x + dx, y + dy
+                if 0 <= nx < w and 0 <= ny < h and (nx, ny) not in self.blocked:
+                    if dist[ny * w + nx] < best:
+                        best, dirs[y * w + x] = dist[ny * w + nx], k
+        self.dist, self.dirs = dist, dirs
+
+    def distance(self, x, y):
+        d = self.dist[y * self.w + x]
+        return -1 if d == NO_PATH else d
+
+    def step(self, x, y):
+        """Next cell from (x, y), or None at the goal / with no way out."""
+        k = self.dirs[y * self.w + x]
+        if k >= GOAL:
+            return None
+        return x + DIRS[k][0], y + DIRS[k][1]
+
+    def path(self, x, y):
+        """Cells from (x, y) to the goal by following the field."""
+        out = [(x, y)]
+        while True:
+            nxt = self.step(*out[-1])
+            if nxt is None:
+                return out if out[-1] == self.goal else []
+            out.append(nxt)
+
+    def to_bytes(self):
+        return (HEADER.pack(MAGIC, VERSION, self.w, self.h, *self.goal)
+                + struct.pack(f"<{len(self.dist)}H", *self.dist) + bytes(self.dirs))
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, version, w, h, gx, gy = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"not a version {VERSION} flow field")
+        n = w * h
+        ff = cls.__new__(cls)
+        ff.w, ff.h, ff.goal = w, h, (gx, gy)
+        ff.dist = list(struct.unpack_from(f"<{n}H", data, HEADER.size))
+        ff.dirs = bytearray(data[HEADER.size + 2 * n:HEADER.size + 3 * n])
+        ff.blocked = {(i % w, i // w) for i in range(n) if ff.dist[i] == NO_PATH and ff.dirs[i] != NONE}
+        return ff
+
+    def render(self):
+        """ASCII map: arrows, * = goal, # = blocked, . = no path."""
+        lines = []
+        for y in range(self.h):
+            row = []
+            for x in range(self.w):
+                k = self.dirs[y * self.w + x]
+                if (x, y) in self.blocked:
+                    row.append("#")
+                else:
+                    row.append(ARROWS[k] if k != NONE else ".")
+            lines.append("".join(row))
+        return "\n".join(lines)
+
+# ── Reference: GridManager rebuild + one A* per enemy ──
+
+class AStarReference(RebuildReference):
+    """RebuildReference with get_path_to_goal(): full A* path per call."""
+
+    def path_len(self, start):
+        """Steps on the A* path from start (x, y), or -1."""
+        s, goal = start[1] * self.w + start[0], self.goal[1] * self.w + self.goal[0]
+        if goal in self.disabled:
+            return -1
+        gx, gy = self.goal
+        best = {s: 0}
+        heap = [(0, s)]
+        while heap:
+            _, v = heapq.heappop(heap)
+            if v == goal:
+                return best[v]
+            for u in self.edges[v]:
+                if u in self.disabled:
+                    continue
+                g = best[v] + 1
+                if g < best.get(u, 1 << 60):
+                    best[u] = g
+                    ux, uy = self.points[u]
+                    heapq.heappush(heap, (g + abs(ux - gx) + abs(uy - gy), u))
+        return -1
+
+def bench(layout, C, agents, placements, seed):
+    """Place walls one at a time; after each, every agent needs a fresh route.
+    Returns (astar seconds, flow seconds, mismatches)."""
+    w, h = layout["width"], layout["height"]
+    blocked = set(blocked_cells(layout, C))
+    special = set(layout["spawns"]) | {layout["goal"]}
+    rng = random.Random(seed)
+    ref = AStarReference(w, h, layout["spawns"], layout["goal"], blocked)
+    ff = FlowField(w, h, layout["goal"], blocked)
+    open_cells = [(x, y) for x in range(w) for y in range(h) if (x, y) not in blocked]
+    pos = [rng.choice(open_cells) for _ in range(agents)]
+    t_astar = t_flow = 0.0
+    bad = 0
+    for _ in range(placements):
+        c = (rng.randrange(w), rng.randrange(h))
+        if c in special or c in blocked or c in pos:
+            continue
+        trial = blocked | {c}
+        ff.update(trial)
+        if any(ff.distance(*s) < 0 for s in layout["spawns"]):
+            ff.update(blocked)  # would block a spawn: the game refuses it
+            continue
+        blocked = trial
+        t0 = time.perf_counter()
+        ref.place(*c)  # _rebuild_astar()
+        lens = [ref.path_len(p) for p in pos]  # grid_changed -> get_path_to_goal per enemy
+        t1 = time.perf_counter()
+        ff.update(blocked)
+        flows = [len(ff.path(*p)) - 1 for p in pos]
+        t2 = time.perf_counter()
+        t_astar += t1 - t0
+        t_flow += t2 - t1
+        bad += sum(1 for a, f in zip(lens, flows) if a != max(f, -1))
+    return t_astar, t_flow, bad
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Export a BFS flow field for a board layout")
+    ap.add_argument("layout", help="layout JSON (see layouts/)")
+    ap.add_argument("-o", "--out", help="output file (default: <layout name>.flow)")
+    ap.add_argument("--show", action="store_true", help="print the field as arrows")
+    ap.add_argument("--bench", action="store_true", help="compare with per-agent A* instead of exporting")
+    ap.add_argument("--agents", type=int, default=40)
+    ap.add_argument("--placements", type=int, default=30)
+    ap.add_argument("--seed", type=int, default=3)
+    args = ap.parse_args(argv)
+    C = load_constants()
+    layout = load_layout(args.layout, C, budget=False)
+    if args.bench:
+        ta, tf, bad = bench(layout, C, args.agents, args.placements, args.seed)
+        print(f"{args.agents} agents, {args.placements} placement attempts: "
+              f"rebuild + A* per agent {ta * 1e3:.1f} ms, one flow field {tf * 1e3:.1f} ms "
+              f"({ta / max(tf, 1e-9):.1f}x), path length mismatches: {bad}")
+        return
+    ff = FlowField(layout["width"], layout["height"], layout["goal"], blocked_cells(layout, C))
+    out = args.out or os.path.splitext(os.path.basename(args.layout))[0] + ".flow"
+    data = ff.to_bytes()
+    write_atomic(out, data)
+    if args.show:
+        print(ff.render())
+    steps = [ff.distance(*s) for s in layout["spawns"]]
+    print(f"Created {out} ({len(data)} bytes, {ff.w}x{ff.h}); spawn steps to goal: {steps}")
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+"""Raw RGBA frame pack: every generated frame in one mmap-able file.
+generate_sprites_v2 writes .sprite_cache/frames.pack next to the PNGs, so
+atlas packing, diffs, variants and upscalers read pixels straight from it.
+They never decode PNGs again. FramePack maps the file read-only and hands
+out memoryview slices of the mapping. Opening it reads only the index,
+nothing is copied, and every process reading the pack shares the same
+page-cache pages. Uses only Python built-ins.
+
+Layout (little-endian):
+    header   "SPK1", u16 version, u16 frame alignment, u32 entry count,
+             u64 index offset, u64 data offset        (padded to 64 bytes)
+    index    per frame: 48-byte UTF-8 name (NUL padded), u16 frame,
+             u16 frame count, u16 width, u16 height, u64 offset, u64 size
+    data     starts on a page boundary; each frame is w*h*4 RGBA bytes,
+             row-major, starting on an `alignment` boundary
+
+    with FramePack(".sprite_cache/frames.pack") as fp:
+        w, h, n = fp.info("orc_walk")
+        with fp.frame("orc_walk", 2) as view:   # memoryview, w*h*4 bytes
+            pixels = bytes(view)                 # copy what must outlive the pack
+
+A view still alive at close() keeps the mapping open until it is released
+or collected. The generator replaces the pack with os.replace, which
+Windows refuses while any process has the file mapped: close readers
+before regenerating there.
+
+Run: python frame_pack.py [PATH]          (list contents and open time)
+"""
+import itertools, mmap, os, struct, sys, time
+
+from sprite_frames import frame_rows
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+PACK_PATH = os.path.join(ROOT, ".sprite_cache", "frames.pack")
+MAGIC = b"SPK1"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIQQ")
+HEADER_SIZE = 64
+NAME_SIZE = 48
+ENTRY = struct.Struct(f"<{NAME_SIZE}sHHHHQQ")
+PAGE = mmap.PAGESIZE
+ALIGN = 64
+
+def _pad(n, align):
+    return -n % align
+
+# ── Writing ──
+
+def frame_bytes(frame):
+    return b"".join(bytes(itertools.chain.from_iterable(row)) for row in frame_rows(frame))
+
+def build_pack(assets, align=ALIGN):
+    """Pack bytes for [(name, [frames])]; frames are grids or DeltaFrames."""
+    entries, blobs = [], []
+    for name, frames in assets:
+        raw = name.encode()
+        if len(raw) > NAME_SIZE:
+            raise ValueError(f"asset name too long for the pack index: {name}")
+        for i, f in enumerate(frames):
+            rows = frame_rows(f)
+            entries.append([raw, i, len(frames), len(rows[0]), len(rows)])
+            blobs.append(frame_bytes(f))
+    index_off = HEADER_SIZE
+    data_off = index_off + len(entries) * ENTRY.size
+    data_off += _pad(data_off, PAGE)
+    out = bytearray(HEADER.pack(MAGIC, VERSION, align, len(entries), index_off, data_off))
+    out += bytes(HEADER_SIZE - len(out))
+    off = data_off
+    for e, blob in zip(entries, blobs):
+        out += ENTRY.pack(*e, off, len(blob))
+        off += len(blob) + _pad(len(blob), align)
+    out += bytes(data_off - len(out))
+    for blob in blobs:
+        out += blob
+        out += bytes(_pad(len(blob), align))
+    return bytes(out)
+
+# ── Reading ──
+
+class FramePack:
+    """Read-only mapping of a pack; frames come back as memoryview slices.
+    Views outliving close() keep the mapping alive until they go."""
+
+    def __init__(self, path=PACK_PATH):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mm)
+        magic, version, self.align, count, index_off, self.data_offset = HEADER.unpack_from(self._mm)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path}: not a version {VERSION} frame pack")
+        self._index = {}
+        for name, i, n, w, h, off, size in ENTRY.iter_unpack(self._view[index_off:index_off + count * ENTRY.size]):
+            key = name.rstrip(b"\0").decode()
+            frames = self._index.setdefault(key, [None] * n)
+            frames[i] = (w, h, off, size)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._view.release()
+        try:
+            self._mm.close()
+        except BufferError:
+            pass  # frame views are still alive; the mapping is freed with them
+
+    def names(self):
+        return list(self._index)
+
+    def info(self, name):
+        """(width, height, frame count) of an asset."""
+        w, h, _, _ = self._index[name][0]
+        return w, h, len(self._index[name])
+
+    def frame(self, name, i=0):
+        """memoryview of frame i's RGBA bytes (no copy)."""
+        _, _, off, size = self._index[name][i]
+        return self._view[off:off + size]
+
+    def frames(self, name):
+        return [self.frame(name, i) for i in range(len(self._index[name]))]
+
+    def rows(self, name, i=0):
+        """Frame i as one memoryview per row (no copy)."""
+        w, h, off, _ = self._index[name][i]
+        stride = w * 4
+        return [self._view[off + y * stride:off + (y + 1) * stride] for y in range(h)]
+
+    def grid(self, name, i=0):
+        """Frame i decoded to a pixel grid (copies; for code that draws on it)."""
+        return [list(struct.iter_unpack("4B", row)) for row in self.rows(name, i)]
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    path = argv[0] if argv else PACK_PATH
+    t0 = time.perf_counter()
+    with FramePack(path) as fp:
+        ms = (time.perf_counter() - t0) * 1000
+        total = 0
+        for name in fp.names():
+            w, h, n = fp.info(name)
+            total += n
+            print(f"  {name:<24} {w:>3}x{h:<3} x{n}")
+        print(f"{path}: {len(fp.names())} assets, {total} frames, "
+              f"{os.path.getsize(path) // 1024} KB; opened in {ms:.2f} ms")
+
+if __name__ == "__main__":
+    sys.exit(main())
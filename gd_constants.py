@@ -0,0 +1,180 @@
+"""Read scripts/Constants.gd from Python so offline tools use live balance data.
+Parses `const` declarations (numbers, strings, bools, arrays, dictionaries,
+Color/Vector2 constructors, enum members) and mirrors the small static
+helpers in Constants.gd. Uses only Python built-ins.
+
+    C = load_constants()
+    C["GRID_WIDTH"], C["WAVE_CONFIGS"][0]["count"], C["BuildItem"]["WALL"]
+
+Run: python gd_constants.py   (dumps the parsed constants as JSON)
+"""
+import json, os, re
+
+CONSTANTS_GD = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts", "Constants.gd")
+
+_TOKEN = re.compile(r'''
+    (?P<num>-?\d+\.\d*|-?\.\d+|-?\d+)
+  | (?P<str>"(?:[^"\\]|\\.)*")
+  | (?P<name>[A-Za-z_][A-Za-z0-9_]*(?:\.[A-Za-z_][A-Za-z0-9_]*)*)
+  | (?P<punct>[\[\]{}(),:])
+  | (?P<ws>\s+)
+''', re.VERBOSE)
+
+_cache = {}
+
+def _strip_comments(src):
+    out = []
+    for line in src.splitlines():
+        in_str = False
+        for i, ch in enumerate(line):
+            if ch == '"' and (i == 0 or line[i-1] != "\\"):
+                in_str = not in_str
+            elif ch == "#" and not in_str:
+                line = line[:i]
+                break
+        out.append(line)
+    return "\n".join(out)
+
+def _tokenize(expr):
+    pos = 0
+    toks = []
+    while pos < len(expr):
+        m = _TOKEN.match(expr, pos)
+        if not m:
+            raise ValueError(f"Cannot parse GDScript expression near: {expr[pos:pos+30]!r}")
+        pos = m.end()
+        kind = m.lastgroup
+        if kind != "ws":
+            toks.append((kind, m.group(kind)))
+    return toks
+
+class _Parser:
+    def __init__(self, toks, scope):
+        self.toks = toks
+        self.i = 0
+        self.scope = scope
+
+    def peek(self):
+        return self.toks[self.i] if self.i < len(self.toks) else (None, None)
+
+    def take(self, value=None):
+        tok = self.peek()
+        if value is not None and tok[1] != value:
+            raise ValueError(f"Expected {value!r}, got {tok[1]!r}")
+        self.i += 1
+        return tok
+
+    def _seq(self, close):
+        items = []
+        while self.peek()[1] != close:
+            items.append(self.value())
+            if self.peek()[1] == ",":
+                self.take(",")
+        self.take(close)
+        return items
+
+    def value(self):
+        kind, text = self.take()
+        if kind == "num":
+            return float(text) if "." in text else int(text)
+        if kind == "str":
+            return json.loads(text)
+        if text == "[":
+            return self._seq("]")
+        if text == "{":
+            d = {}
+            while self.peek()[1] != "}":
+                k = self.value()
+                self.take(":")
+                d[k] = self.value()
+                if self.peek()[1] == ",":
+                    self.take(",")
+            self.take("}")
+            return d
+        if kind == "name":
+            if text in ("true", "false"):
+                return text == "true"
+            if text == "null":
+                return None
+            if self.peek()[1] == "(":
+                # Color(...), Vector2(...), Vector2i(...) -> tuple
+                self.take("(")
+                return tuple(self._seq(")"))
+            return self._resolve(text)
+        raise ValueError(f"Unexpected token {text!r}")
+
+    def _resolve(self, dotted):
+        node = self.scope
+        for part in dotted.split("."):
+            if part not in node:
+                raise ValueError(f"Unknown GDScript name: {dotted}")
+            node = node[part]
+        return node
+
+def parse_constants(src):
+    """Parse Constants.gd source into {name: value}; enums become {member: int} dicts."""
+    src = _strip_comments(src)
+    scope = {}
+    for m in re.finditer(r"^enum\s+(\w+)\s*\{([^}]*)\}", src, re.M):
+        members = [s.strip() for s in m.group(2).split(",") if s.strip()]
+        scope[m.group(1)] = {name: i for i, name in enumerate(members)}
+    decl = re.compile(r"^const\s+(\w+)\s*(?::\s*\w+)?\s*:?=\s*", re.M)
+    for m in decl.finditer(src):
+        # Expression runs until brackets balance at a line end
+        depth, j = 0, m.end()
+        while j < len(src):
+            ch = src[j]
+            if ch in "[{(":
+                depth += 1
+            elif ch in "]})":
+                depth -= 1
+            elif ch == "\n" and depth == 0:
+                break
+            j += 1
+        scope[m.group(1)] = _Parser(_tokenize(src[m.end():j]), scope).value()
+    return scope
+
+def load_constants(path=CONSTANTS_GD):
+    """Parsed constants for `path`, re-read only when the file changes."""
+    mtime = os.path.getmtime(path)
+    hit = _cache.get(path)
+    if hit and hit[0] == mtime:
+        return hit[1]
+    with open(path, encoding="utf-8") as f:
+        consts = parse_constants(f.read())
+    _cache[path] = (mtime, consts)
+    return consts
+
+# ── Mirrors of the static helpers in Constants.gd ──
+
+def get_wave_config(C, wave):
+    configs = C["WAVE_CONFIGS"]
+    if wave <= len(configs):
+        return configs[wave - 1]
+    return {
+        "count": configs[-1]["count"] + (wave - len(configs)) * 5,
+        "types": ["orc", "swift", "demon", "demon"],
+    }
+
+def get_upgrade_cost(C, item_type, current_level):
+    if current_level >= C["MAX_UPGRADE_LEVEL"] or item_type not in C["BUILD_DATA"]:
+        return 0
+    return int(C["BUILD_DATA"][item_type]["cost"] * C["UPGRADE_COST_RATIO"][current_level])
+
+def grid_to_world(C, gx, gy):
+    ox, oy = C["GRID_ORIGIN"]
+    return (ox + (gx - gy) * (C["TILE_WIDTH"] * 0.5), oy + (gx + gy) * (C["TILE_HEIGHT"] * 0.5))
+
+def world_to_grid(C, wx, wy):
+    ox, oy = C["GRID_ORIGIN"]
+    rx, ry = wx - ox, wy - oy
+    hw, hh = C["TILE_WIDTH"] * 0.5, C["TILE_HEIGHT"] * 0.5
+    # GDScript roundi() rounds half away from zero
+    rnd = lambda v: int(v + 0.5) if v >= 0 else -int(-v + 0.5)
+    return (rnd((rx / hw + ry / hh) * 0.5), rnd((ry / hh - rx / hw) * 0.5))
+
+def is_in_grid(C, gx, gy):
+    return 0 <= gx < C["GRID_WIDTH"] and 0 <= gy < C["GRID_HEIGHT"]
+
+if __name__ == "__main__":
+    print(json.dumps(load_constants(), indent=2, default=str))
@@ -2,34 +2,50 @@
 Produces animated sprite sheets (horizontal strips), textured tiles, and
 improved static sprites. Uses only Python built-ins (struct, zlib).
 
-Run: python generate_sprites_v2.py
+Animation parameters are keyframed curves (sprite_curves), so every sheet
+can be rendered at any frame count; base layers are rasterised once and
+shared by all frames of all variants. Generator output is memoised on disk
+(sprite_memo), so warm runs only re-rasterise what changed.
+
+Run: python generate_sprites_v2.py [--frames 8,12] [--atlas anims.png]
+     (--frames also writes <sheet>_<n>f.png variants next to the defaults;
+      --atlas packs all animations into one sheet + region JSON)
 """
-import struct, zlib, os, math, random
-
-random.seed(42)  # Deterministic output
+import argparse, functools, itertools, json, struct, zlib, os, math, random
+
+from asset_writer import AssetWriter, write_atomic
+from frame_pack import PACK_PATH, build_pack
+from png_deflate import deflate
+from sprite_curves import Curve, sample_curves
+from sprite_defs import render_base, render_frames
+from sprite_frames import DeltaFrame
+from sprite_gradient import radial_gradient
+import sprite_memo
+from sprite_memo import disk_memo
+from sprite_postfx import apply_post
+from sprite_raster import arc_spans, composite, disc_spans
+from sprite_sheets import assemble, assemble_rows, grid_layout, rows_layout
+from sprite_vector import VectorCanvas
 
 ASSETS = os.path.join(os.path.dirname(__file__), "assets")
-os.makedirs(ASSETS, exist_ok=True)
 
 # ── PNG writer (from generate_sprites.py) ──
 
-def write_png(path, width, height, pixels):
-    """Write RGBA PNG. pixels = list of rows, each row = list of (R,G,B,A) tuples."""
+def encode_png(width, height, pixels):
+    """RGBA PNG file contents as bytes. pixels = list of rows of (R,G,B,A) tuples
+    (or ready-made 4*width byte rows)."""
     def chunk(ctype, data):
         c = ctype + data
         return struct.pack(">I", len(data)) + c + struct.pack(">I", zlib.crc32(c) & 0xFFFFFFFF)
-    raw = b""
-    for row in pixels:
-        raw += b"\x00"
-        for r, g, b, a in row:
-            raw += struct.pack("BBBB", r, g, b, a)
+    raw = b"".join(b"\x00" + (row if isinstance(row, (bytes, bytearray))
+                               else bytes(itertools.chain.from_iterable(row))) for row in pixels)
     ihdr = struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)
-    idat = zlib.compress(raw)
-    with open(path, "wb") as f:
-        f.write(b"\x89PNG\r\n\x1a\n")
-        f.write(chunk(b"IHDR", ihdr))
-        f.write(chunk(b"IDAT", idat))
-        f.write(chunk(b"IEND", b""))
+    idat = deflate(raw)  # parallel only for multi-MiB images
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", ihdr) + chunk(b"IDAT", idat) + chunk(b"IEND", b"")
+
+def write_png(path, width, height, pixels):
+    """Write RGBA PNG (atomically). pixels = list of rows, each row = list of (R,G,B,A) tuples."""
+    write_atomic(path, encode_png(width, height, pixels))
     print(f"  Created {path}")
 
 # ── Drawing helpers ──
@@ -38,13 +54,18 @@ def make_grid(w, h, fill=(0,0,0,0)):
     return [[fill for _ in range(w)] for _ in range(h)]
 
 def get_px(grid, x, y):
-    if 0 <= y < len(grid) and 0 <= x < len(grid[0]):
-        return grid[y][x]
+    if 0 <= y < len(grid):
+        row = grid[y]
+        if 0 <= x < len(row):
+            return row[x]
     return (0, 0, 0, 0)
 
 def set_px(grid, x, y, color):
-    if 0 <= y < len(grid) and 0 <= x < len(grid[0]):
-        grid[y][x] = color
+    # Only row y is touched, so DeltaFrames copy just the rows drawn into
+    if 0 <= y < len(grid):
+        row = grid[y]
+        if 0 <= x < len(row):
+            row[x] = color
 
 def clamp(v, lo, hi):
     return max(lo, min(hi, v))
@@ -68,8 +89,10 @@ def blend_px(base, overlay):
     return (clamp(r,0,255), clamp(g,0,255), clamp(b,0,255), clamp(int(out_a*255),0,255))
 
 def set_px_blend(grid, x, y, color):
-    if 0 <= y < len(grid) and 0 <= x < len(grid[0]):
-        grid[y][x] = blend_px(grid[y][x], color)
+    if 0 <= y < len(grid):
+        row = grid[y]
+        if 0 <= x < len(row):
+            row[x] = blend_px(row[x], color)
 
 def fill_rect(grid, x1, y1, x2, y2, color):
     for y in range(y1, y2+1):
@@ -143,20 +166,11 @@ def shift_color(color, dr=0, dg=0, db=0, da=0):
     r, g, b, a = color
     return (clamp(r+dr,0,255), clamp(g+dg,0,255), clamp(b+db,0,255), clamp(a+da,0,255))
 
-def make_spritesheet(frames, fw, fh):
-    """Stitch list of frame grids (each fw x fh) into horizontal strip."""
-    n = len(frames)
-    sheet = make_grid(fw * n, fh)
-    for fi, frame in enumerate(frames):
-        ox = fi * fw
-        for y in range(fh):
-            for x in range(fw):
-                sheet[y][ox + x] = frame[y][x]
-    return sheet
-
-def copy_frame(src):
-    """Deep copy a pixel grid."""
-    return [row[:] for row in src]
+def make_spritesheet(frames, fw, fh, **layout):
+    """Stitch list of frame grids / DeltaFrames (each fw x fh) into a sheet:
+    a horizontal strip by default, or a sprite_sheets.grid_layout (cols, pot, max_width)."""
+    lay = grid_layout(len(frames), fw, fh, **layout)
+    return assemble(lay["regions"], frames, lay["width"], lay["height"])
 
 # ── Colors ──
 T = (0, 0, 0, 0)
@@ -198,9 +212,6 @@ ARROW_SHAFT = (160, 120, 60, 255)
 ORC_GREEN = (60, 110, 50, 255)
 ORC_GREEN_LIGHT = (80, 140, 65, 255)
 ORC_GREEN_DARK = (40, 75, 35, 255)
-SWIFT_PURPLE = (100, 50, 140, 255)
-SWIFT_PURPLE_LIGHT = (130, 70, 170, 255)
-SWIFT_PURPLE_DARK = (80, 40, 120, 255)
 DEMON_RED = (120, 25, 25, 255)
 DEMON_RED_LIGHT = (160, 35, 35, 255)
 DEMON_RED_DARK = (90, 15, 15, 255)
@@ -209,6 +220,8 @@ DEMON_RED_DARK = (90, 15, 15, 255)
 # HERO SPRITE SHEETS
 # ═══════════════════════════════════════════════════════════════════
 
+@functools.lru_cache(maxsize=None)
+@disk_memo
 def _hero_base():
     """Base hero frame — returns 32x32 grid."""
     g = make_grid(32, 32)
@@ -238,37 +251,49 @@ def _hero_base():
     set_px(g, 9, 18, HERO_GOLD)
     return g
 
-def gen_hero_idle():
-    """4-frame idle: subtle breathing (body shifts 1px) + cloak flutter."""
-    frames = []
+HERO_IDLE_CURVES = {
+    "dy": Curve.table([0, 0, -1, 0], "step", loop=True),               # body y-shift
+    "cloak": Curve.table([200, 180, 160, 180], "linear", loop=True),   # cloak edge alpha
+    "shimmer": Curve.table([0, 1, 0, 1], "step", loop=True),           # chest highlight on/off
+}
+
+@disk_memo
+def gen_hero_idle(frames=4):
+    """Idle loop: subtle breathing (body shifts 1px) + cloak flutter."""
+    out = []
     base = _hero_base()
-    offsets = [0, 0, -1, 0]  # body y-shift per frame
-    cloak_alphas = [200, 180, 160, 180]
-    for fi in range(4):
-        f = copy_frame(base)
-        dy = offsets[fi]
+    for p in sample_curves(HERO_IDLE_CURVES, frames):
+        f = DeltaFrame(base)
+        dy = p["dy"]
         # Shift body slightly by modifying shadow
         if dy != 0:
             fill_diamond(f, 16, 28+dy, 8, 3, (0,0,0,60))
         # Cloak flutter — vary a pixel on the cloak edge
-        ca = cloak_alphas[fi]
+        ca = p["cloak"]
         set_px(f, 7, 22, (HERO_BLUE_DARK[0], HERO_BLUE_DARK[1], HERO_BLUE_DARK[2], ca))
         set_px(f, 21, 22, (HERO_BLUE_DARK[0], HERO_BLUE_DARK[1], HERO_BLUE_DARK[2], ca))
         # Subtle chest highlight shimmer
-        if fi in [1, 3]:
+        if p["shimmer"]:
             set_px(f, 16, 17, shift_color(HERO_BLUE_LIGHT, 15, 15, 15))
-        frames.append(f)
-    return frames
-
-def gen_hero_walk():
-    """4-frame walk cycle: leg movement + arm/body bob."""
-    frames = []
-    leg_offsets = [(0, 0), (1, -1), (0, 0), (-1, 1)]  # (left_leg_dy, right_leg_dy)
-    body_bob = [0, -1, 0, -1]
-    for fi in range(4):
-        f = _hero_base()
-        bob = body_bob[fi]
-        ll, rl = leg_offsets[fi]
+        out.append(f)
+    return out
+
+HERO_WALK_CURVES = {
+    "ll": Curve.table([0, 1, 0, -1], "step", loop=True),    # left leg dy
+    "rl": Curve.table([0, -1, 0, 1], "step", loop=True),    # right leg dy
+    "bob": Curve.table([0, -1, 0, -1], "step", loop=True),  # helmet spike bob
+    "arm": Curve.table([0, 1, 0, 1], "step", loop=True),    # sword raised 1px
+}
+
+@disk_memo
+def gen_hero_walk(frames=4):
+    """Walk cycle: leg movement + arm/body bob."""
+    out = []
+    base = _hero_base()
+    for p in sample_curves(HERO_WALK_CURVES, frames):
+        f = DeltaFrame(base)
+        bob = p["bob"]
+        ll, rl = p["ll"], p["rl"]
         # Left leg
         set_px(f, 14, 26+ll, HERO_BLUE_DARK)
         set_px(f, 14, 27+ll, HERO_BLUE_DARK)
@@ -280,19 +305,23 @@ def gen_hero_walk():
             set_px(f, 16, 4, T)
             set_px(f, 16, 4+bob, HERO_GOLD)
         # Arm swing — move sword slightly
-        if fi in [1, 3]:
+        if p["arm"]:
             set_px(f, 24, 12, T)
             set_px(f, 25, 12, T)
             set_px(f, 24, 11, HERO_SWORD)
             set_px(f, 25, 11, HERO_SWORD_EDGE)
-        frames.append(f)
-    return frames
-
-def gen_hero_attack():
-    """3-frame attack: sword swing arc."""
-    frames = []
-    for fi in range(3):
-        f = _hero_base()
+        out.append(f)
+    return out
+
+HERO_ATTACK_POSE = Curve.table([0, 1, 2], "step")  # wind-up, mid-swing, follow-through
+
+@disk_memo
+def gen_hero_attack(frames=3):
+    """Attack: sword swing arc."""
+    out = []
+    base = _hero_base()
+    for pose in HERO_ATTACK_POSE.sample(frames):
+        f = DeltaFrame(base)
         # Clear default sword position
         for i in range(8):
             set_px(f, 24, 12+i, T)
@@ -300,13 +329,13 @@ def gen_hero_attack():
         fill_rect(f, 23, 19, 26, 19, T)
         set_px(f, 24, 20, T)
         set_px(f, 24, 21, T)
-        if fi == 0:
+        if pose == 0:
             # Wind-up: sword raised high
             for i in range(6):
                 set_px(f, 22+i, 6, HERO_SWORD)
                 set_px(f, 22+i, 7, HERO_SWORD_EDGE if i < 4 else HERO_SWORD)
             set_px(f, 21, 7, HERO_GOLD)
-        elif fi == 1:
+        elif pose == 1:
             # Mid-swing: sword diagonal
             for i in range(7):
                 set_px(f, 20+i, 10+i, HERO_SWORD_EDGE)
@@ -318,13 +347,15 @@ def gen_hero_attack():
                 set_px(f, 22+i, 22, HERO_SWORD)
                 set_px(f, 22+i, 21, HERO_SWORD_EDGE if i < 4 else HERO_SWORD)
             set_px(f, 21, 22, HERO_GOLD)
-        frames.append(f)
-    return frames
+        out.append(f)
+    return out
 
 # ═══════════════════════════════════════════════════════════════════
 # ENEMY SPRITE SHEETS
 # ═══════════════════════════════════════════════════════════════════
 
+@functools.lru_cache(maxsize=None)
+@disk_memo
 def _goblin_base():
     """Base goblin frame."""
     g = make_grid(32, 32)
@@ -351,31 +382,39 @@ def _goblin_base():
     set_px(g, 24, 19, ENEMY_RED_DARK)
     return g
 
-def gen_goblin_walk():
-    """4-frame bouncing walk."""
-    frames = []
-    bob = [0, -1, 0, -1]
-    arm_swing = [(8, 24), (7, 25), (8, 24), (9, 23)]
-    for fi in range(4):
-        f = _goblin_base()
-        by = bob[fi]
+GOBLIN_WALK_CURVES = {
+    "bob": Curve.table([0, -1, 0, -1], "step", loop=True),
+    "stride": Curve.table([0, 1, 0, 1], "step", loop=True),   # which leg is down
+    "arm_l": Curve.table([8, 7, 8, 9], "step", loop=True),
+    "arm_r": Curve.table([24, 25, 24, 23], "step", loop=True),
+}
+
+@disk_memo
+def gen_goblin_walk(frames=4):
+    """Bouncing walk."""
+    out = []
+    base = _goblin_base()
+    for p in sample_curves(GOBLIN_WALK_CURVES, frames):
+        f = DeltaFrame(base)
+        by = p["bob"]
         # Leg animation
-        if fi % 2 == 0:
+        if p["stride"] == 0:
             set_px(f, 14, 27, ENEMY_RED_DARK)
             set_px(f, 18, 26, ENEMY_RED_DARK)
         else:
             set_px(f, 14, 26, ENEMY_RED_DARK)
             set_px(f, 18, 27, ENEMY_RED_DARK)
         # Arm swing
-        lx, rx = arm_swing[fi]
-        set_px(f, lx, 19+by, ENEMY_RED_DARK)
-        set_px(f, rx, 18+by, ENEMY_RED_DARK)
+        set_px(f, p["arm_l"], 19+by, ENEMY_RED_DARK)
+        set_px(f, p["arm_r"], 18+by, ENEMY_RED_DARK)
         # Body bob on shadow
         if by != 0:
             fill_diamond(f, 16, 28+by, 7, 3, (0,0,0,60))
-        frames.append(f)
-    return frames
+        out.append(f)
+    return out
 
+@functools.lru_cache(maxsize=None)
+@disk_memo
 def _orc_base():
     """Base orc frame."""
     g = make_grid(32, 32)
@@ -402,85 +441,41 @@ def _orc_base():
     set_px(g, 28, 11, (150, 150, 150, 255))
     return g
 
-def gen_orc_walk():
-    """4-frame heavy stomp walk."""
-    frames = []
-    body_bob = [0, -1, 0, 1]
-    for fi in range(4):
-        f = _orc_base()
-        by = body_bob[fi]
+ORC_WALK_CURVES = {
+    "bob": Curve.table([0, -1, 0, 1], "step", loop=True),
+    "stride": Curve.table([0, 1, 0, 1], "step", loop=True),
+    "club": Curve.table([0, 1, 0, -1], "step", loop=True),  # 1 = raised, -1 = lowered
+}
+
+@disk_memo
+def gen_orc_walk(frames=4):
+    """Heavy stomp walk."""
+    out = []
+    base = _orc_base()
+    for p in sample_curves(ORC_WALK_CURVES, frames):
+        f = DeltaFrame(base)
+        by = p["bob"]
         # Stomp legs — alternating
-        if fi % 2 == 0:
+        if p["stride"] == 0:
             fill_rect(f, 12, 27, 14, 28, ORC_GREEN_DARK)
             fill_rect(f, 18, 26, 20, 27, ORC_GREEN_DARK)
         else:
             fill_rect(f, 12, 26, 14, 27, ORC_GREEN_DARK)
             fill_rect(f, 18, 27, 20, 28, ORC_GREEN_DARK)
         # Club swing
-        if fi == 1:
+        if p["club"] == 1:
             set_px(f, 24, 11, T)
             fill_rect(f, 23, 9, 27, 11, (120, 85, 50, 255))
-        elif fi == 3:
+        elif p["club"] == -1:
             fill_rect(f, 24, 13, 26, 23, (100, 70, 40, 255))
         # Shadow adjust
         if by != 0:
             fill_diamond(f, 16, 29+by, 9, 3, (0,0,0,60))
-        frames.append(f)
-    return frames
-
-def _swift_base():
-    """Base swift frame."""
-    g = make_grid(32, 32)
-    fill_diamond(g, 16, 28, 6, 2, (0,0,0,50))
-    fill_diamond(g, 16, 21, 5, 7, SWIFT_PURPLE)
-    fill_diamond(g, 16, 20, 4, 5, SWIFT_PURPLE_LIGHT)
-    set_px(g, 10, 18, (80, 40, 120, 200))
-    set_px(g, 9, 19, (80, 40, 120, 180))
-    set_px(g, 8, 20, (80, 40, 120, 140))
-    set_px(g, 22, 18, (80, 40, 120, 200))
-    set_px(g, 23, 19, (80, 40, 120, 180))
-    set_px(g, 24, 20, (80, 40, 120, 140))
-    fill_circle(g, 16, 11, 3, SWIFT_PURPLE)
-    fill_circle(g, 16, 11, 2, SWIFT_PURPLE_LIGHT)
-    set_px(g, 16, 7, (90, 45, 130, 255))
-    set_px(g, 15, 8, (90, 45, 130, 255))
-    set_px(g, 17, 8, (90, 45, 130, 255))
-    set_px(g, 14, 11, (200, 100, 255, 255))
-    set_px(g, 18, 11, (200, 100, 255, 255))
-    set_px(g, 22, 15, (180, 180, 200, 255))
-    set_px(g, 23, 14, (200, 200, 220, 255))
-    set_px(g, 10, 15, (180, 180, 200, 255))
-    set_px(g, 9, 14, (200, 200, 220, 255))
-    return g
-
-def gen_swift_walk():
-    """4-frame lean-forward sprint."""
-    frames = []
-    lean = [0, 1, 0, -1]
-    for fi in range(4):
-        f = _swift_base()
-        lx = lean[fi]
-        # Speed trail varies per frame
-        trail_alpha = [80, 50, 40, 60]
-        for i in range(3):
-            a1 = max(0, trail_alpha[fi] - i * 15)
-            a2 = max(0, trail_alpha[fi] - i * 15)
-            set_px(f, 5-i+lx, 15+i, (130, 70, 170, a1))
-            set_px(f, 5-i+lx, 20+i, (130, 70, 170, a2))
-        # Legs — fast alternation
-        if fi % 2 == 0:
-            set_px(f, 14, 26, SWIFT_PURPLE_DARK)
-            set_px(f, 18, 27, SWIFT_PURPLE_DARK)
-        else:
-            set_px(f, 14, 27, SWIFT_PURPLE_DARK)
-            set_px(f, 18, 26, SWIFT_PURPLE_DARK)
-        # Scarf flutter
-        ca = [200, 160, 140, 180][fi]
-        set_px(f, 8+lx, 20, (80, 40, 120, ca))
-        set_px(f, 24-lx, 20, (80, 40, 120, ca))
-        frames.append(f)
-    return frames
+        out.append(f)
+    return out
 
+@functools.lru_cache(maxsize=None)
+@disk_memo
 def _demon_base():
     """Base demon frame."""
     g = make_grid(32, 32)
@@ -525,15 +520,23 @@ def _demon_base():
     set_px(g, 19, 31, (120, 30, 30, 120))
     return g
 
-def gen_demon_walk():
-    """4-frame ominous glide."""
-    frames = []
-    hover = [0, -1, -1, 0]
-    wing_spread = [0, 1, 2, 1]
-    for fi in range(4):
-        f = _demon_base()
-        by = hover[fi]
-        ws = wing_spread[fi]
+DEMON_WALK_CURVES = {
+    "hover": Curve.table([0, -1, -1, 0], "step", loop=True),
+    "wings": Curve.table([0, 1, 2, 1], "step", loop=True),
+    "flame": Curve.table([(255,150,0,255), (255,200,0,255), (255,120,0,255), (255,180,0,255)],
+                         "linear", loop=True),  # mouth flame flicker
+    "tail_x": Curve.table([16, 17, 18, 17], "step", loop=True),
+}
+
+@disk_memo
+def gen_demon_walk(frames=4):
+    """Ominous glide."""
+    out = []
+    base = _demon_base()
+    for p in sample_curves(DEMON_WALK_CURVES, frames):
+        f = DeltaFrame(base)
+        by = p["hover"]
+        ws = p["wings"]
         # Glide bob
         if by != 0:
             fill_diamond(f, 16, 29+by, 10, 3, (0,0,0,80))
@@ -543,116 +546,117 @@ def gen_demon_walk():
             set_px(f, 5-i-ws, 12+i, (100, 20, 20, a))
             set_px(f, 27+i+ws, 12+i, (100, 20, 20, a))
         # Mouth flame flicker
-        flame_colors = [(255,150,0,255), (255,200,0,255), (255,120,0,255), (255,180,0,255)]
-        set_px(f, 16, 12, flame_colors[fi])
+        set_px(f, 16, 12, p["flame"])
         # Tail sway
-        tail_x = [16, 17, 18, 17]
-        set_px(f, tail_x[fi], 29, (100, 20, 20, 200))
-        frames.append(f)
-    return frames
+        set_px(f, p["tail_x"], 29, (100, 20, 20, 200))
+        out.append(f)
+    return out
 
 # ═══════════════════════════════════════════════════════════════════
 # FIREBALL SPRITE SHEETS
 # ═══════════════════════════════════════════════════════════════════
 
-def gen_fireball_fly():
-    """3-frame cycling flame shapes (32x32 each)."""
-    frames = []
-    for fi in range(3):
+FIREBALL_FLY_CURVES = {
+    "shape": Curve.table([0, 1, 2], "step", loop=True),                     # flame body variant
+    "spark": Curve.table([(-6, -2), (-7, 1), (-5, 3)], "step", loop=True),  # trailing spark offset
+}
+
+# Glow stops per flame shape: hot core -> body -> outer glow fading out
+FIREBALL_FLY_STOPS = [
+    [(0.0, (255, 255, 200, 255)), (0.15, (255, 230, 120, 245)), (0.4, (255, 200, 50, 240)),
+     (0.65, (255, 120, 20, 200)), (0.75, (255, 100, 0, 90)), (1.0, (255, 100, 0, 20))],
+    [(0.0, (255, 240, 100, 255)), (0.25, (255, 210, 60, 240)), (0.45, (255, 180, 30, 230)),
+     (0.75, (255, 100, 10, 180)), (0.85, (255, 100, 0, 80)), (1.0, (255, 100, 0, 20))],
+    [(0.0, (255, 255, 200, 255)), (0.2, (255, 220, 80, 250)), (0.5, (255, 160, 40, 220)),
+     (0.65, (255, 130, 30, 190)), (0.75, (255, 100, 0, 90)), (1.0, (255, 100, 0, 20))],
+]
+
+@disk_memo
+def gen_fireball_fly(frames=3):
+    """Cycling flame shapes (32x32 each), one radial gradient pass per frame."""
+    cx, cy = 16, 16
+    out = []
+    for p in sample_curves(FIREBALL_FLY_CURVES, frames):
         f = make_grid(32, 32)
-        cx, cy = 16, 16
-        # Outer glow
-        fill_circle(f, cx, cy, 8, (255, 100, 0, 60))
-        # Main flame body — varies per frame
-        if fi == 0:
-            fill_circle(f, cx, cy, 5, (255, 120, 20, 200))
-            fill_circle(f, cx, cy, 3, (255, 200, 50, 240))
-            fill_circle(f, cx-1, cy-1, 1, (255, 255, 200, 255))
-        elif fi == 1:
-            fill_circle(f, cx, cy, 6, (255, 100, 10, 180))
-            fill_circle(f, cx+1, cy, 3, (255, 180, 30, 230))
-            fill_circle(f, cx, cy, 2, (255, 240, 100, 255))
-        else:
-            fill_circle(f, cx, cy, 5, (255, 130, 30, 190))
-            fill_circle(f, cx-1, cy+1, 4, (255, 160, 40, 220))
-            fill_circle(f, cx, cy, 2, (255, 220, 80, 250))
-            fill_circle(f, cx, cy-1, 1, (255, 255, 200, 255))
+        # Hot spot jitters a pixel between shapes
+        ox, oy = ((0, 0), (1, 0), (-1, 1))[p["shape"]]
+        radial_gradient(f, cx + ox + 0.5, cy + oy + 0.5, 8.5, FIREBALL_FLY_STOPS[p["shape"]])
         # Trailing sparks
-        spark_offsets = [(-6,-2), (-7, 1), (-5, 3)]
-        sx, sy = spark_offsets[fi]
+        sx, sy = p["spark"]
         set_px(f, cx+sx, cy+sy, (255, 200, 50, 180))
         set_px(f, cx+sx-1, cy+sy+1, (255, 150, 0, 120))
-        frames.append(f)
-    return frames
-
-def gen_fireball_explode():
-    """4-frame blast expansion (48x48 each)."""
-    frames = []
-    sizes = [8, 16, 20, 22]
-    alphas = [255, 220, 160, 80]
-    for fi in range(4):
+        out.append(f)
+    return out
+
+FIREBALL_EXPLODE_CURVES = {
+    "r": Curve.table([8, 16, 20, 22], "linear"),
+    "alpha": Curve.table([255, 220, 160, 80], "linear"),
+    "debris": Curve.table([0, 1, 1, 1], "step"),
+    "spin": Curve.table([fi * 0.3 for fi in range(4)], "linear"),  # debris angle offset
+}
+
+def draw_fireball_explode(vc, p):
+    """One explosion frame in unit space (radii were tuned on the 48px frame)."""
+    r = p["r"] / 48
+    a = p["alpha"]
+    # Blast: white-hot core -> orange -> faint outer edge, one pass
+    vc.radial_gradient(0.5, 0.5, r, [(0.0, (255, 255, 200, a)), (0.15, (255, 240, 150, int(a*0.9))),
+                                     (0.35, (255, 220, 80, int(a*0.8))), (0.7, (255, 150, 30, int(a*0.5))),
+                                     (1.0, (255, 100, 0, int(a*0.2)))])
+    # Debris sparks
+    if p["debris"]:
+        for angle_i in range(6):
+            angle = angle_i * (math.pi * 2 / 6) + p["spin"]
+            dist = r * 0.8
+            vc.circle(0.5 + math.cos(angle) * dist, 0.5 + math.sin(angle) * dist, 0.7 / 48,
+                      (255, 200, 50, int(a*0.7)))
+
+@disk_memo
+def gen_fireball_explode(frames=4):
+    """Blast expansion (48x48 each), anti-aliased via sprite_vector."""
+    out = []
+    for p in sample_curves(FIREBALL_EXPLODE_CURVES, frames):
         f = make_grid(48, 48)
-        cx, cy = 24, 24
-        r = sizes[fi]
-        a = alphas[fi]
-        # Outer blast
-        fill_circle(f, cx, cy, r, (255, 100, 0, int(a*0.3)))
-        # Mid ring
-        fill_circle(f, cx, cy, int(r*0.7), (255, 150, 30, int(a*0.5)))
-        # Inner bright core
-        fill_circle(f, cx, cy, int(r*0.35), (255, 220, 80, int(a*0.8)))
-        fill_circle(f, cx, cy, int(r*0.15), (255, 255, 200, a))
-        # Debris sparks
-        if fi >= 1:
-            for angle_i in range(6):
-                angle = angle_i * (math.pi * 2 / 6) + fi * 0.3
-                dist = r * 0.8
-                sx = int(cx + math.cos(angle) * dist)
-                sy = int(cy + math.sin(angle) * dist)
-                set_px(f, sx, sy, (255, 200, 50, int(a*0.7)))
-        frames.append(f)
-    return frames
+        draw_fireball_explode(VectorCanvas(f), p)
+        out.append(f)
+    return out
 
 # ═══════════════════════════════════════════════════════════════════
 # SLASH EFFECT SPRITE SHEET
 # ═══════════════════════════════════════════════════════════════════
 
-def gen_slash_effect():
-    """3-frame crescent arc sweep (64x64 each)."""
-    frames = []
-    for fi in range(3):
+SLASH_CURVES = {
+    "sweep": Curve.table([(fi + 1) / 3.0 for fi in range(3)], "linear"),  # 0.33, 0.67, 1.0
+    "fade": Curve.table([1.0 - fi * 0.25 for fi in range(3)], "linear"),
+    "outer_r": Curve.table([24, 26, 28], "linear"),
+    "inner_r": Curve.table([16, 18, 20], "linear"),
+}
+
+@disk_memo
+def gen_slash_effect(frames=3):
+    """Crescent arc sweep (64x64 each). Streaks are analytic arc spans
+    (sprite_raster): every pixel is drawn once, with no gaps along the arc."""
+    out = []
+    for p in sample_curves(SLASH_CURVES, frames):
         f = make_grid(64, 64)
         cx, cy = 32, 32
-        # Draw crescent arc at different sweep angles
-        sweep_progress = (fi + 1) / 3.0  # 0.33, 0.67, 1.0
-        alpha = int(255 * (1.0 - fi * 0.25))
+        alpha = int(255 * p["fade"])
         arc_start = -math.pi * 0.5
-        arc_end = arc_start + math.pi * 1.2 * sweep_progress
-        outer_r = 24 + fi * 2
-        inner_r = 16 + fi * 2
-        for angle_step in range(60):
-            angle = arc_start + (arc_end - arc_start) * angle_step / 59.0
-            # Outer edge — bright
-            ox = int(cx + math.cos(angle) * outer_r)
-            oy = int(cy + math.sin(angle) * outer_r)
-            set_px_blend(f, ox, oy, (255, 255, 220, alpha))
-            set_px_blend(f, ox+1, oy, (255, 255, 220, int(alpha*0.5)))
-            # Mid
-            mr = (outer_r + inner_r) // 2
-            mx = int(cx + math.cos(angle) * mr)
-            my = int(cy + math.sin(angle) * mr)
-            set_px_blend(f, mx, my, (255, 240, 180, int(alpha*0.7)))
-            # Inner edge — dimmer
-            ix = int(cx + math.cos(angle) * inner_r)
-            iy = int(cy + math.sin(angle) * inner_r)
-            set_px_blend(f, ix, iy, (255, 220, 130, int(alpha*0.4)))
+        arc_end = arc_start + math.pi * 1.2 * p["sweep"]
+        outer_r = p["outer_r"]
+        inner_r = p["inner_r"]
+        mr = (outer_r + inner_r) / 2
+        # Three streaks: bright outer edge, mid, dimmer inner edge
+        for r, half, color in ((outer_r, 1.0, (255, 255, 220, alpha)),
+                               (mr, 0.6, (255, 240, 180, int(alpha*0.7))),
+                               (inner_r, 0.6, (255, 220, 130, int(alpha*0.4)))):
+            composite(f, arc_spans(cx, cy, r - half, r + half, arc_start, arc_end), color)
         # Leading tip — extra bright
-        tip_angle = arc_end
-        tx = int(cx + math.cos(tip_angle) * outer_r)
-        ty = int(cy + math.sin(tip_angle) * outer_r)
-        fill_circle(f, tx, ty, 2, (255, 255, 255, alpha))
-        frames.append(f)
-    return frames
+        tx = cx + math.cos(arc_end) * outer_r
+        ty = cy + math.sin(arc_end) * outer_r
+        composite(f, disc_spans(tx, ty, 2.5), (255, 255, 255, alpha))
+        out.append(f)
+    return out
 
 # ═══════════════════════════════════════════════════════════════════
 # TILE TEXTURES
@@ -669,6 +673,7 @@ def _iso_tile_mask(w, h):
             mask.add((x, y))
     return mask
 
+@disk_memo(rng=True)
 def gen_tile_grass_1():
     """64x32 dark green isometric tile with grass tufts."""
     w, h = 64, 32
@@ -686,11 +691,9 @@ def gen_tile_grass_1():
             set_px(g, tx, ty, (70, 110, 50, 220))
             if (tx-1, ty-1) in mask:
                 set_px(g, tx-1, ty-1, (65, 100, 45, 200))
-    # Border
-    hw, hh = w // 2, h // 2
-    outline_diamond(g, hw, hh, hw-1, hh-1, (40, 55, 30, 140))
     return g
 
+@disk_memo(rng=True)
 def gen_tile_grass_2():
     """64x32 slightly different green (checkerboard partner)."""
     w, h = 64, 32
@@ -708,9 +711,9 @@ def gen_tile_grass_2():
             set_px(g, tx, ty, (80, 120, 55, 220))
             if (tx+1, ty-1) in mask:
                 set_px(g, tx+1, ty-1, (75, 115, 50, 200))
-    outline_diamond(g, w//2, h//2, w//2-1, h//2-1, (45, 60, 35, 140))
     return g
 
+@disk_memo(rng=True)
 def gen_tile_spawn():
     """64x32 reddish earth with cracks."""
     w, h = 64, 32
@@ -735,9 +738,9 @@ def gen_tile_spawn():
     for tx, ty in [(28, 14), (38, 18)]:
         if (tx, ty) in mask:
             set_px(g, tx, ty, (180, 50, 30, 180))
-    outline_diamond(g, w//2, h//2, w//2-1, h//2-1, (100, 40, 30, 160))
     return g
 
+@disk_memo(rng=True)
 def gen_tile_goal():
     """64x32 golden paved stone."""
     w, h = 64, 32
@@ -761,18 +764,16 @@ def gen_tile_goal():
     for tx, ty in [(22, 8), (42, 12), (30, 24)]:
         if (tx, ty) in mask:
             set_px(g, tx, ty, (230, 210, 100, 240))
-    outline_diamond(g, w//2, h//2, w//2-1, h//2-1, (160, 140, 50, 180))
     return g
 
 # ═══════════════════════════════════════════════════════════════════
 # IMPROVED STATIC SPRITES (overwrite existing)
 # ═══════════════════════════════════════════════════════════════════
 
+@disk_memo(rng=True)
 def gen_archer_tower_v2():
     """32x48 improved tower with more detail and shading."""
     g = make_grid(32, 48)
-    # Shadow
-    fill_diamond(g, 16, 44, 10, 3, (0,0,0,60))
     # Base platform with noise
     noise_fill_diamond(g, 16, 40, 12, 5, TOWER_STONE_DARK, 8)
     noise_fill_diamond(g, 16, 39, 11, 4, TOWER_STONE, 6)
@@ -808,10 +809,10 @@ def gen_archer_tower_v2():
     set_px(g, 14, 7, ARCHER_GREEN_LIGHT)  # highlight
     return g
 
+@disk_memo(rng=True)
 def gen_ground_archer_v2():
     """32x32 improved archer with detail."""
     g = make_grid(32, 32)
-    fill_diamond(g, 16, 28, 7, 3, (0,0,0,60))
     # Body with noise for cloth texture
     noise_fill_diamond(g, 16, 21, 6, 7, ARCHER_GREEN, 8)
     noise_fill_diamond(g, 16, 20, 5, 5, ARCHER_GREEN_LIGHT, 6)
@@ -845,6 +846,7 @@ def gen_ground_archer_v2():
     set_px(g, 16, 21, HERO_GOLD)  # belt buckle
     return g
 
+@disk_memo(rng=True)
 def gen_wall_v2():
     """32x24 improved wall with more brick detail."""
     g = make_grid(32, 24)
@@ -874,10 +876,10 @@ def gen_wall_v2():
     fill_rect(g, 7, 18, 25, 18, shift_color(WALL_BROWN_DARK, -10, -10, -10))
     return g
 
+@disk_memo(rng=True)
 def gen_rock_v2():
     """32x24 improved rock with more texture."""
     g = make_grid(32, 24)
-    fill_diamond(g, 16, 20, 12, 3, (0,0,0,50))
     # Main rock with noise
     for y in range(3, 24):
         for x in range(6, 27):
@@ -903,12 +905,13 @@ def gen_rock_v2():
     set_px(g, 9, 16, (50, 90, 40, 200))
     return g
 
+@disk_memo
 def gen_arrow_v2():
     """16x16 improved arrow with trail."""
     g = make_grid(16, 16)
     # Glow
-    fill_circle(g, 8, 8, 5, (255, 200, 50, 40))
-    fill_circle(g, 8, 8, 3, (255, 220, 100, 80))
+    radial_gradient(g, 8.5, 8.5, 5.5, [(0.0, (255, 220, 100, 90)), (0.5, (255, 210, 80, 60)),
+                                       (1.0, (255, 200, 50, 10))])
     # Arrow body — thicker
     for x in range(5, 11):
         set_px(g, x, 8, ARROW_SHAFT)
@@ -937,63 +940,157 @@ def gen_arrow_v2():
 # GENERATE ALL
 # ═══════════════════════════════════════════════════════════════════
 
-print("=" * 50)
-print("Korean Fantasy TD — Sprite Generator V2")
-print("=" * 50)
-
-# ── Hero sprite sheets ──
-print("\n[Hero Sprite Sheets]")
-hero_idle = gen_hero_idle()
-write_png(os.path.join(ASSETS, "hero_idle.png"), 128, 32, make_spritesheet(hero_idle, 32, 32))
-
-hero_walk = gen_hero_walk()
-write_png(os.path.join(ASSETS, "hero_walk.png"), 128, 32, make_spritesheet(hero_walk, 32, 32))
-
-hero_attack = gen_hero_attack()
-write_png(os.path.join(ASSETS, "hero_attack.png"), 96, 32, make_spritesheet(hero_attack, 32, 32))
-
-# ── Enemy sprite sheets ──
-print("\n[Enemy Sprite Sheets]")
-goblin_walk = gen_goblin_walk()
-write_png(os.path.join(ASSETS, "goblin_walk.png"), 128, 32, make_spritesheet(goblin_walk, 32, 32))
-
-orc_walk = gen_orc_walk()
-write_png(os.path.join(ASSETS, "orc_walk.png"), 128, 32, make_spritesheet(orc_walk, 32, 32))
-
-swift_walk = gen_swift_walk()
-write_png(os.path.join(ASSETS, "swift_walk.png"), 128, 32, make_spritesheet(swift_walk, 32, 32))
-
-demon_walk = gen_demon_walk()
-write_png(os.path.join(ASSETS, "demon_walk.png"), 128, 32, make_spritesheet(demon_walk, 32, 32))
-
-# ── Fireball sprite sheets ──
-print("\n[Fireball Sprite Sheets]")
-fb_fly = gen_fireball_fly()
-write_png(os.path.join(ASSETS, "fireball_fly.png"), 96, 32, make_spritesheet(fb_fly, 32, 32))
-
-fb_explode = gen_fireball_explode()
-write_png(os.path.join(ASSETS, "fireball_explode.png"), 192, 48, make_spritesheet(fb_explode, 48, 48))
-
-# ── Slash effect ──
-print("\n[Slash Effect]")
-slash = gen_slash_effect()
-write_png(os.path.join(ASSETS, "slash_effect.png"), 192, 64, make_spritesheet(slash, 64, 64))
-
-# ── Tile textures ──
-print("\n[Tile Textures]")
-write_png(os.path.join(ASSETS, "tile_grass_1.png"), 64, 32, gen_tile_grass_1())
-write_png(os.path.join(ASSETS, "tile_grass_2.png"), 64, 32, gen_tile_grass_2())
-write_png(os.path.join(ASSETS, "tile_spawn.png"), 64, 32, gen_tile_spawn())
-write_png(os.path.join(ASSETS, "tile_goal.png"), 64, 32, gen_tile_goal())
-
-# ── Improved static sprites (overwrite existing) ──
-print("\n[Improved Static Sprites]")
-write_png(os.path.join(ASSETS, "archer_tower.png"), 32, 48, gen_archer_tower_v2())
-write_png(os.path.join(ASSETS, "ground_archer.png"), 32, 32, gen_ground_archer_v2())
-write_png(os.path.join(ASSETS, "wall.png"), 32, 24, gen_wall_v2())
-write_png(os.path.join(ASSETS, "rock.png"), 32, 24, gen_rock_v2())
-write_png(os.path.join(ASSETS, "arrow.png"), 16, 16, gen_arrow_v2())
-
-print("\n" + "=" * 50)
-print("Done! All V2 sprites saved to assets/")
-print("=" * 50)
+# Each asset: output file, generator (or "def" = sprite_defs/<name>.json),
+# frame size (None = single image) and optional "post" steps from
+# sprite_postfx, run on every frame before the sheet is stitched.
+# Order matters: the tile/static generators draw from the seeded RNG.
+# Noise-textured tiles are reduced to a small palette so they compress like
+# the flat-colour sprites; "colors" is the quality knob
+TILE_QUANT = [{"op": "quantize", "colors": 8, "dither": "bayer4"}]
+
+def tile_post(border):
+    """Tile steps: the diamond border in `border`, then the palette reduction."""
+    return [{"op": "tile_border", "color": border}] + TILE_QUANT
+
+def ground_shadow(cx, cy, hw, hh, alpha=60):
+    return {"op": "ground_shadow", "cx": cx, "cy": cy, "hw": hw, "hh": hh, "color": (0, 0, 0, alpha)}
+
+ASSET_TABLE = [
+    ("Hero Sprite Sheets", [
+        {"file": "hero_idle.png", "gen": gen_hero_idle, "frame": (32, 32)},
+        {"file": "hero_walk.png", "gen": gen_hero_walk, "frame": (32, 32)},
+        {"file": "hero_attack.png", "gen": gen_hero_attack, "frame": (32, 32)},
+    ]),
+    ("Enemy Sprite Sheets", [
+        {"file": "goblin_walk.png", "gen": gen_goblin_walk, "frame": (32, 32)},
+        {"file": "orc_walk.png", "gen": gen_orc_walk, "frame": (32, 32)},
+        {"file": "swift_walk.png", "def": "swift_walk", "frame": (32, 32)},
+        {"file": "demon_walk.png", "gen": gen_demon_walk, "frame": (32, 32)},
+    ]),
+    ("Fireball Sprite Sheets", [
+        {"file": "fireball_fly.png", "gen": gen_fireball_fly, "frame": (32, 32)},
+        {"file": "fireball_explode.png", "gen": gen_fireball_explode, "frame": (48, 48)},
+    ]),
+    ("Slash Effect", [
+        {"file": "slash_effect.png", "gen": gen_slash_effect, "frame": (64, 64)},
+    ]),
+    ("Tile Textures", [
+        {"file": "tile_grass_1.png", "gen": gen_tile_grass_1, "post": tile_post((40, 55, 30, 140))},
+        {"file": "tile_grass_2.png", "gen": gen_tile_grass_2, "post": tile_post((45, 60, 35, 140))},
+        {"file": "tile_spawn.png", "gen": gen_tile_spawn, "post": tile_post((100, 40, 30, 160))},
+        {"file": "tile_goal.png", "gen": gen_tile_goal, "post": tile_post((160, 140, 50, 180))},
+    ]),
+    ("Improved Static Sprites", [
+        {"file": "archer_tower.png", "gen": gen_archer_tower_v2, "post": [ground_shadow(16, 44, 10, 3)]},
+        {"file": "ground_archer.png", "gen": gen_ground_archer_v2, "post": [ground_shadow(16, 28, 7, 3)]},
+        {"file": "wall.png", "gen": gen_wall_v2},
+        {"file": "rock.png", "gen": gen_rock_v2,
+         "post": [ground_shadow(16, 20, 12, 3, 50), {"op": "quantize", "colors": 12}]},
+        {"file": "arrow.png", "gen": gen_arrow_v2},
+    ]),
+]
+
+@disk_memo(rng=True)
+def _gen_post(gen, post, animated, *args):
+    """gen(*args) with post steps applied, memoised as one unit — steps like
+    quantize cost more than the drawing they follow."""
+    out = gen(*args)
+    return [apply_post(f, post) for f in out] if animated else apply_post(out, post)
+
+def render_frames_of(spec, frames=None):
+    """Generator output + post steps as a list of frames (animated specs only)."""
+    args = (frames,) if frames else ()
+    post = spec.get("post")
+    if "def" in spec:
+        out = render_frames(spec["def"], *args)
+        return [apply_post(f, post) for f in out] if post else out
+    return _gen_post(spec["gen"], post, True, *args) if post else spec["gen"](*args)
+
+def sheet_of(spec, out):
+    """(width, height, grid) of an animated spec's frames laid out as its sheet;
+    a spec's "layout" (sprite_sheets.grid_layout options) arranges it."""
+    fw, fh = spec["frame"]
+    lay = grid_layout(len(out), fw, fh, **spec.get("layout", {}))
+    return lay["width"], lay["height"], assemble(lay["regions"], out, lay["width"], lay["height"])
+
+def render_asset(spec, frames=None):
+    """Run an asset's generator + post steps. Returns (width, height, grid).
+    `frames` resamples an animated sheet to that many frames."""
+    if spec.get("frame"):
+        return sheet_of(spec, render_frames_of(spec, frames))
+    post = spec.get("post")
+    if "def" in spec:
+        out = apply_post(render_base(spec["def"]), post)
+    else:
+        out = _gen_post(spec["gen"], post, False) if post else spec["gen"]()
+    return len(out[0]), len(out), out
+
+def render_atlas(specs, frames=None, pot=True):
+    """Combined sheet of animated specs, one row per animation.
+    Returns (width, height, grid, layout) with regions keyed by sheet stem."""
+    anims, by_name = [], {}
+    for spec in specs:
+        fw, fh = spec["frame"]
+        stem = spec["file"][:-4]
+        by_name[stem] = render_frames_of(spec, frames)
+        anims.append((stem, fw, fh, len(by_name[stem])))
+    lay = rows_layout(anims, pot)
+    return lay["width"], lay["height"], assemble_rows(lay, by_name), lay
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Regenerate all V2 sprites into assets/")
+    ap.add_argument("--frames", default="", help="extra frame counts for animated sheets, e.g. 8,12")
+    ap.add_argument("--atlas", help="also write every animated sheet into one POT sheet here "
+                                    "(one row per animation; regions in <atlas>.json)")
+    ap.add_argument("--pack", default=PACK_PATH, help="raw RGBA frame pack for tools ('' to skip)")
+    ap.add_argument("--no-cache", action="store_true", help="ignore the .sprite_cache/memo/ generator cache")
+    ap.add_argument("--fsync", action="store_true", help="make the batch durable (one sync before renaming)")
+    ap.add_argument("-v", "--verbose", action="store_true", help="list every file written")
+    args = ap.parse_args(argv)
+    variants = [int(n) for n in args.frames.split(",") if n]
+    if args.no_cache:
+        sprite_memo.ENABLED = False
+
+    os.makedirs(ASSETS, exist_ok=True)
+    random.seed(42)  # Deterministic output
+
+    print("=" * 50)
+    print("Korean Fantasy TD — Sprite Generator V2")
+    print("=" * 50)
+
+    # Files are written on the writer's I/O threads while the next asset renders
+    packed = []
+    with AssetWriter(fsync=args.fsync) as out:
+        for title, specs in ASSET_TABLE:
+            print(f"[{title}] {len(specs)} assets")
+            for spec in specs:
+                if spec.get("frame"):
+                    frames = render_frames_of(spec)
+                    w, h, grid = sheet_of(spec, frames)
+                else:
+                    w, h, grid = render_asset(spec)
+                    frames = [grid]
+                packed.append((spec["file"][:-4], frames))
+                out.write_png(os.path.join(ASSETS, spec["file"]), w, h, grid)
+                if spec.get("frame"):
+                    stem = spec["file"][:-4]
+                    for n in variants:
+                        w, h, grid = render_asset(spec, n)
+                        out.write_png(os.path.join(ASSETS, f"{stem}_{n}f.png"), w, h, grid)
+        if args.atlas:
+            w, h, grid, lay = render_atlas([s for _, specs in ASSET_TABLE for s in specs if s.get("frame")])
+            out.write_png(args.atlas, w, h, grid)
+            lay["file"] = os.path.basename(args.atlas)
+            out.write(os.path.splitext(args.atlas)[0] + ".json", json.dumps(lay).encode())
+        if args.pack:
+            os.makedirs(os.path.dirname(os.path.abspath(args.pack)), exist_ok=True)
+            out.write(args.pack, build_pack(packed))
+    if args.verbose:
+        print("\n".join("  " + line for line in out.log))
+
+    print("=" * 50)
+    print(f"Done! {out.summary()} saved to assets/")
+    print("=" * 50)
+
+if __name__ == "__main__":
+    main()
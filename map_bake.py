@@ -0,0 +1,172 @@
+"""Bake a board layout into one PNG, composited the way the game draws it.
+Tiles are placed like GridManager._draw() (tile_goal / tile_spawn /
+checkerboard grass, top-left at centre - half a tile), structures like
+BuildManager / ArcherTower / GroundArcher (sprite centred on the tile plus
+its offset) and depth-sorted by gx + gy, as their z_index is. The image
+covers the board plus headroom for the tallest structure. Uses only
+Python built-ins.
+
+Rows are RGBA bytearrays and sprites are precomputed runs of visible
+pixels: a run that is opaque or lands on empty canvas is one slice
+assignment, only overlaps are blended. The tile layer is cached per board
+shape, so baking another layout only blits its structures.
+
+Run: python map_bake.py layouts/serpentine.json [-o board.png]
+"""
+import argparse, itertools, os, sys
+
+from board_layout import LAYOUT_ITEMS, load_layout
+from gd_constants import grid_to_world, load_constants
+from sprite_postfx import over
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+ASSETS = os.path.join(ROOT, "assets")
+
+# layout key -> (texture, Sprite2D offset); mirrors the scripts that spawn them
+STRUCTURE_SPRITES = {
+    "walls": ("wall.png", (0, -12)),
+    "rocks": ("rock.png", (0, -12)),
+    "towers": ("archer_tower.png", (0, -24)),
+    "archers": ("ground_archer.png", (0, -16)),
+}
+
+def world_px(C, gx, gy):
+    """gd_constants.grid_to_world rounded to whole pixels for blitting."""
+    x, y = grid_to_world(C, gx, gy)
+    return round(x), round(y)
+
+def tile_texture(layout, gx, gy):
+    # Same choice as GridManager._draw()
+    if (gx, gy) == layout["goal"]:
+        return "tile_goal.png"
+    if (gx, gy) in layout["spawns"]:
+        return "tile_spawn.png"
+    return "tile_grass_1.png" if (gx + gy) % 2 == 0 else "tile_grass_2.png"
+
+def load_asset_grid(name):
+    """Grid of RGBA tuples decoded from assets/<name>."""
+    from texture_budget import read_png
+    w, h, rgba = read_png(os.path.join(ASSETS, name))
+    px = list(zip(rgba[0::4], rgba[1::4], rgba[2::4], rgba[3::4]))
+    return [px[y * w:(y + 1) * w] for y in range(h)]
+
+def sprite_runs(grid):
+    """[(y, x0, pixels, packed, opaque)] for each horizontal run of visible pixels."""
+    runs = []
+    for y, row in enumerate(grid):
+        x, w = 0, len(row)
+        while x < w:
+            if not row[x][3]:
+                x += 1
+                continue
+            x0 = x
+            while x < w and row[x][3]:
+                x += 1
+            seg = row[x0:x]
+            runs.append((y, x0, seg, bytes(itertools.chain.from_iterable(seg)),
+                         all(c[3] == 255 for c in seg)))
+    return runs
+
+def blit(canvas, runs, ox, oy):
+    """Composite sprite runs onto RGBA byte rows at (ox, oy); the sprite must lie inside."""
+    for y, x0, seg, packed, opaque in runs:
+        row = canvas[oy + y]
+        i0, i1 = (x0 + ox) * 4, (x0 + ox) * 4 + len(packed)
+        if opaque or not any(row[i0:i1]):
+            row[i0:i1] = packed
+        else:
+            for i, c in zip(range(i0, i1, 4), seg):
+                row[i:i+4] = bytes(over(tuple(row[i:i+4]), c))
+
+class BoardBaker:
+    """Composites layouts from a sprite source. Sprite runs and the tile layer
+    of each board shape are kept, so a new layout only blits its structures.
+    `sprites(name)` returns a pixel grid; default: decode assets/<name>."""
+
+    def __init__(self, sprites=None, C=None):
+        self.C = C or load_constants()
+        self.sprites = sprites or load_asset_grid
+        self._runs = {}
+        self._bases = {}
+
+    def runs(self, name):
+        r = self._runs.get(name)
+        if r is None:
+            g = self.sprites(name)
+            r = self._runs[name] = (len(g[0]), len(g), sprite_runs(g))
+        return r
+
+    def invalidate(self):
+        self._runs.clear()
+        self._bases.clear()
+
+    def bounds(self, layout):
+        """(left, top, width, height) in world pixels: every tile, plus headroom
+        above for the tallest structure, so one board shape has one image size."""
+        C = self.C
+        hw, hh = C["TILE_WIDTH"] // 2, C["TILE_HEIGHT"] // 2
+        W, H = layout["width"], layout["height"]
+        left = world_px(C, 0, H - 1)[0] - hw
+        right = world_px(C, W - 1, 0)[0] + hw
+        top = world_px(C, 0, 0)[1] - hh
+        bottom = world_px(C, W - 1, H - 1)[1] + hh
+        over_top = max(self.runs(name)[1] // 2 - dy - hh for name, (_, dy) in STRUCTURE_SPRITES.values())
+        top -= max(0, over_top)
+        return left, top, right - left, bottom - top
+
+    def tiles(self, layout):
+        """[(name, left, top)] for the ground tiles, world coordinates."""
+        C = self.C
+        hw, hh = C["TILE_WIDTH"] // 2, C["TILE_HEIGHT"] // 2
+        items = []
+        for gx in range(layout["width"]):
+            for gy in range(layout["height"]):
+                cx, cy = world_px(C, gx, gy)
+                items.append((tile_texture(layout, gx, gy), cx - hw, cy - hh))
+        return items
+
+    def structures(self, layout):
+        """[(name, left, top)] for the structures in depth order, world coordinates."""
+        placed = []
+        for key in LAYOUT_ITEMS:
+            name, (dx, dy) = STRUCTURE_SPRITES[key]
+            for gx, gy, _ in layout[key]:
+                placed.append((gx + gy, gx, name, world_px(self.C, gx, gy), dx, dy))
+        placed.sort(key=lambda p: p[:2])
+        items = []
+        for _, _, name, (cx, cy), dx, dy in placed:
+            w, h, _ = self.runs(name)
+            items.append((name, cx + dx - w // 2, cy + dy - h // 2))
+        return items
+
+    def _draw(self, canvas, items, left, top):
+        for name, x, y in items:
+            blit(canvas, self.runs(name)[2], x - left, y - top)
+
+    def bake(self, layout):
+        """(width, height, rows) of the composited board; rows are RGBA bytearrays."""
+        left, top, width, height = self.bounds(layout)
+        key = (layout["width"], layout["height"], tuple(layout["spawns"]), layout["goal"])
+        base = self._bases.get(key)
+        if base is None:
+            base = [bytearray(width * 4) for _ in range(height)]
+            self._draw(base, self.tiles(layout), left, top)
+            self._bases[key] = base
+        canvas = [bytearray(row) for row in base]
+        self._draw(canvas, self.structures(layout), left, top)
+        return width, height, canvas
+
+def main(argv=None):
+    from generate_sprites_v2 import write_png
+    ap = argparse.ArgumentParser(description="Bake a board layout to a PNG")
+    ap.add_argument("layout", help="layout JSON (see layouts/)")
+    ap.add_argument("-o", "--out", help="output PNG (default: <layout name>_board.png)")
+    args = ap.parse_args(argv)
+    C = load_constants()
+    layout = load_layout(args.layout, C, budget=False)
+    out = args.out or os.path.splitext(os.path.basename(args.layout))[0] + "_board.png"
+    w, h, grid = BoardBaker(C=C).bake(layout)
+    write_png(out, w, h, grid)
+
+if __name__ == "__main__":
+    sys.exit(main())
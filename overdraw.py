@@ -0,0 +1,132 @@
+"""Overdraw heatmaps for the sprite generators.
+Re-runs ASSET_TABLE (same order and seed as generate_sprites_v2, so the
+images are identical) with make_grid swapped for rows that count every
+pixel write, including slice writes and rows copied by DeltaFrame. For each
+asset it reports total writes against pixels drawn, ranked by the ratio,
+and writes a heatmap PNG per asset. Only generator drawing is counted;
+"post" steps run separately, and sprite_defs assets are compiled to
+non-overlapping spans, so they are listed as skipped. Uses only Python
+built-ins.
+
+Heatmap: transparent = never written, blue = 1 write, then green, yellow,
+orange, red = 5+ writes.
+
+Run: python overdraw.py [--out overdraw/] [--scale 4]
+"""
+import argparse, contextlib, os, random, sys
+
+import generate_sprites_v2 as gen
+import sprite_memo
+from sprite_frames import frame_rows
+
+HEAT = [(0, 0, 0, 0), (40, 80, 220, 255), (40, 200, 80, 255), (240, 220, 40, 255),
+        (250, 140, 30, 255), (230, 40, 40, 255)]
+
+class CountingRow(list):
+    """Pixel row that counts writes per index; slices copy their counts."""
+    __slots__ = ("counts",)
+
+    def __init__(self, pixels=(), counts=None):
+        super().__init__(pixels)
+        self.counts = counts if counts is not None else [0] * len(self)
+
+    def __setitem__(self, i, v):
+        list.__setitem__(self, i, v)
+        if isinstance(i, slice):
+            for k in range(*i.indices(len(self))):
+                self.counts[k] += 1
+        else:
+            self.counts[i] += 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return CountingRow(list.__getitem__(self, i), self.counts[i])
+        return list.__getitem__(self, i)
+
+def counting_grid(w, h, fill=(0, 0, 0, 0)):
+    return [CountingRow([fill] * w) for _ in range(h)]
+
+def _clear_base_caches():
+    for v in vars(gen).values():
+        if hasattr(v, "cache_clear"):
+            v.cache_clear()
+
+@contextlib.contextmanager
+def instrumented():
+    """Generators draw into counting grids while active (cached bases are re-rendered)."""
+    real, memo = gen.make_grid, sprite_memo.ENABLED
+    gen.make_grid = counting_grid
+    sprite_memo.ENABLED = False  # cached results would skip the drawing being counted
+    _clear_base_caches()
+    try:
+        yield
+    finally:
+        gen.make_grid, sprite_memo.ENABLED = real, memo
+        _clear_base_caches()
+
+def _row_counts(row):
+    # Rows rebuilt as plain lists lost their history: count them as one write
+    return row.counts if isinstance(row, CountingRow) else [1 if c[3] else 0 for c in row]
+
+def measure(spec):
+    """(counts grid, pixel grid) for one spec's generator output, frames side by side."""
+    out = spec["gen"]()
+    frames = out if spec.get("frame") else [out]
+    counts, pixels = [], []
+    for f in frames:
+        rows = frame_rows(f)
+        for y, row in enumerate(rows):
+            if y == len(counts):
+                counts.append([])
+                pixels.append([])
+            counts[y].extend(_row_counts(row))
+            pixels[y].extend(row)
+    return counts, pixels
+
+def analyse():
+    """[{file, writes, drawn, visible, ratio, max, counts}] for every generator asset."""
+    results, skipped = [], []
+    random.seed(42)  # table order + seed as generate_sprites_v2.main()
+    with instrumented():
+        for _, specs in gen.ASSET_TABLE:
+            for spec in specs:
+                if "gen" not in spec:
+                    skipped.append(spec["file"])
+                    continue
+                counts, pixels = measure(spec)
+                flat = [n for row in counts for n in row]
+                drawn = sum(1 for n in flat if n)
+                results.append({"file": spec["file"], "writes": sum(flat), "drawn": drawn,
+                                "visible": sum(1 for row in pixels for c in row if c[3]),
+                                "ratio": sum(flat) / drawn if drawn else 0.0,
+                                "max": max(flat), "counts": counts})
+    results.sort(key=lambda r: (-r["ratio"], r["file"]))
+    return results, skipped
+
+def heatmap(counts, scale=1):
+    return [[HEAT[min(n, len(HEAT) - 1)] for n in row for _ in range(scale)]
+            for row in counts for _ in range(scale)]
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Per-asset overdraw report + heatmaps for the sprite generators")
+    ap.add_argument("--out", default="overdraw", help="directory for <asset>_overdraw.png heatmaps")
+    ap.add_argument("--scale", type=int, default=4, help="heatmap pixel scale")
+    args = ap.parse_args(argv)
+    results, skipped = analyse()
+    os.makedirs(args.out, exist_ok=True)
+    print(f"{'#':>3} {'asset':<24} {'writes':>8} {'drawn':>7} {'visible':>8} {'ratio':>6} {'max':>4}")
+    for i, r in enumerate(results, 1):
+        print(f"{i:>3} {r['file']:<24} {r['writes']:>8} {r['drawn']:>7} {r['visible']:>8} "
+              f"{r['ratio']:>6.2f} {r['max']:>4}")
+        grid = heatmap(r["counts"], args.scale)
+        gen.write_atomic(os.path.join(args.out, r["file"][:-4] + "_overdraw.png"),
+                         gen.encode_png(len(grid[0]), len(grid), grid))
+    writes = sum(r["writes"] for r in results)
+    drawn = sum(r["drawn"] for r in results)
+    print(f"\n{len(results)} assets: {writes} writes for {drawn} drawn pixels "
+          f"({writes / drawn:.2f}x); heatmaps in {args.out}/")
+    if skipped:
+        print(f"skipped (sprite_defs spans, no overdraw): {', '.join(skipped)}")
+
+if __name__ == "__main__":
+    sys.exit(main())
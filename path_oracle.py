@@ -0,0 +1,316 @@
+"""Bitboard path-connectivity oracle mirroring GridManager pathfinding.
+The grid is one Python int (bit y*W+x set = walkable), so spawn->goal
+reachability is a bit-parallel flood fill: each step grows the reached set
+by one tile in all 4 directions with a few shifts and masks.
+
+"Would blocking this tile cut a spawn off?" only needs real work for tiles
+on the current routes: after each edit one flood from the goal is walked
+back into a single shortest route per spawn, and any tile off that mask is
+answered by a bit test. On-route tiles cost one more flood, memoised until
+the next edit. critical_cells() gives the full articulation set (Tarjan,
+rooted at the goal) for overlays; once built, queries are set lookups.
+Uses only Python built-ins.
+
+Run: python path_oracle.py            (benchmark vs rebuild-per-placement)
+     python path_oracle.py --sizes 20x14,64x64 --attempts 300
+"""
+import argparse, heapq, random, time
+
+class PathOracle:
+    """Grid connectivity with cheap would-block queries."""
+
+    def __init__(self, width, height, spawns, goal, blocked=()):
+        self.w, self.h = width, height
+        self.spawns = [tuple(s) for s in spawns]
+        self.goal = tuple(goal)
+        self.full = (1 << (width * height)) - 1
+        col0 = 0
+        for y in range(height):
+            col0 |= 1 << (y * width)
+        self.not_first_col = self.full & ~col0
+        self.not_last_col = self.full & ~(col0 << (width - 1))
+        self.free = self.full
+        for x, y in blocked:
+            self.free &= ~(1 << self.bit(x, y))
+        self._invalidate()
+
+    def bit(self, x, y):
+        return y * self.w + x
+
+    def _invalidate(self):
+        self._on_path = None   # bitboard: one current route per spawn
+        self._answers = {}     # bit -> would_block, valid until the next edit
+        self._critical = None
+
+    # ── Edits ──
+
+    def place(self, x, y):
+        self.free &= ~(1 << self.bit(x, y))
+        self._invalidate()
+
+    def remove(self, x, y):
+        self.free |= 1 << self.bit(x, y)
+        self._invalidate()
+
+    def is_free(self, x, y):
+        return bool(self.free >> self.bit(x, y) & 1)
+
+    # ── Bit-parallel flood fill ──
+
+    def _grow(self, reach):
+        """Reach plus its 4-neighbours (unmasked by walkability)."""
+        return (reach
+                | ((reach << 1) & self.not_first_col)
+                | ((reach >> 1) & self.not_last_col)
+                | (reach << self.w)
+                | (reach >> self.w)) & self.full
+
+    def flood_layers(self, x, y, free=None):
+        """BFS rings from (x, y) as bitboards: layers[k] = tiles exactly k steps away."""
+        free = self.free if free is None else free
+        start = 1 << self.bit(x, y)
+        if not free & start:
+            return []
+        layers = [start]
+        reach = start
+        while True:
+            grown = self._grow(reach) & free
+            ring = grown & ~reach
+            if not ring:
+                return layers
+            layers.append(ring)
+            reach = grown
+
+    def reach_from(self, x, y, free=None):
+        """Bitboard of tiles reachable from (x, y) through `free` tiles."""
+        free = self.free if free is None else free
+        start = 1 << self.bit(x, y)
+        if not free & start:
+            return 0
+        reach = start
+        while True:
+            grown = self._grow(reach) & free
+            if grown == reach:
+                return reach
+            reach = grown
+
+    def has_path(self, free=None):
+        """True if every spawn can reach the goal (GridManager.has_path_from_spawns)."""
+        reach = self.reach_from(*self.goal, free=free)
+        return all(reach >> self.bit(sx, sy) & 1 for sx, sy in self.spawns)
+
+    def would_block_flood(self, x, y):
+        """Exact would-block check by flood fill, ignoring all caches."""
+        return not self.has_path(self.free & ~(1 << self.bit(x, y)))
+
+    # ── Queries ──
+
+    def _routes(self):
+        """Union of one shortest route per spawn, walked back through the BFS rings.
+        Blocking a tile off this mask can never cut a spawn off."""
+        if self._on_path is not None:
+            return self._on_path
+        layers = self.flood_layers(*self.goal)
+        on_path = 0
+        for sx, sy in self.spawns:
+            cur = 1 << self.bit(sx, sy)
+            k = next((i for i, ring in enumerate(layers) if ring & cur), -1)
+            if k < 0:
+                on_path = -1  # some spawn is already cut off
+                break
+            on_path |= cur
+            for i in range(k - 1, -1, -1):
+                step = self._grow(cur) & layers[i]
+                cur = step & -step  # lowest set bit: deterministic choice
+                on_path |= cur
+        self._on_path = on_path
+        return on_path
+
+    def would_block(self, x, y):
+        """GridManager.would_block_path. Off-route tiles are a mask lookup; on-route
+        tiles cost one flood fill, remembered until the next edit."""
+        b = self.bit(x, y)
+        if self._critical is not None:
+            return b in self._critical
+        on_path = self._routes()
+        if on_path == -1:
+            return True
+        if not on_path >> b & 1:
+            return False
+        if b not in self._answers:
+            self._answers[b] = self.would_block_flood(x, y)
+        return self._answers[b]
+
+    # ── Articulation cells ──
+
+    def critical_cells(self):
+        """Set of bit indices whose blocking disconnects some spawn from the goal
+        (articulation points separating the goal from a spawn). Once built,
+        would_block() answers from it until the next edit."""
+        if self._critical is not None:
+            return self._critical
+        w, h, free = self.w, self.h, self.free
+        n = w * h
+        goal = self.bit(*self.goal)
+        spawn_bits = {self.bit(x, y) for x, y in self.spawns}
+        if not self.has_path():
+            self._critical = set(range(n))  # already blocked: everything "blocks"
+            return self._critical
+        disc = [-1] * n
+        low = [0] * n
+        spawns_below = [0] * n
+        critical = {goal} | spawn_bits
+
+        # Iterative DFS (grids up to 256x256 are far too deep to recurse)
+        counter = 0
+        disc[goal] = low[goal] = counter
+        spawns_below[goal] = 1 if goal in spawn_bits else 0
+        stack = [(goal, -1, 0)]
+        while stack:
+            v, parent, k = stack[-1]
+            x = v % w
+            nbrs = (v + 1 if x + 1 < w else -1, v - 1 if x > 0 else -1,
+                    v + w if v + w < n else -1, v - w)
+            advanced = False
+            while k < 4:
+                u = nbrs[k]
+                k += 1
+                if u < 0 or not free >> u & 1:
+                    continue
+                if disc[u] < 0:
+                    counter += 1
+                    disc[u] = low[u] = counter
+                    spawns_below[u] = 1 if u in spawn_bits else 0
+                    stack[-1] = (v, parent, k)
+                    stack.append((u, v, 0))
+                    advanced = True
+                    break
+                if u != parent:
+                    low[v] = min(low[v], disc[u])
+            if advanced:
+                continue
+            stack.pop()
+            if parent >= 0:
+                low[parent] = min(low[parent], low[v])
+                spawns_below[parent] += spawns_below[v]
+                # parent separates v's subtree (holding a spawn) from the goal
+                if low[v] >= disc[parent] and spawns_below[v]:
+                    critical.add(parent)
+        self._critical = critical
+        return critical
+
+# ── Reference: GridManager-style rebuild + A* per spawn ──
+
+class RebuildReference:
+    """Mirrors GridManager: rebuild the whole point graph on every blocking
+    placement, and answer would_block by disabling one point and running a
+    full A* from every spawn."""
+
+    def __init__(self, width, height, spawns, goal, blocked=()):
+        self.w, self.h = width, height
+        self.spawns, self.goal = list(spawns), tuple(goal)
+        self.blocked = set(blocked)
+        self.rebuild()
+
+    def rebuild(self):
+        # _rebuild_astar(): add all points, disable blocked, connect right/down
+        self.points = {}
+        self.disabled = set()
+        for x in range(self.w):
+            for y in range(self.h):
+                pid = y * self.w + x
+                self.points[pid] = (x, y)
+                if (x, y) in self.blocked:
+                    self.disabled.add(pid)
+        self.edges = {pid: [] for pid in self.points}
+        for x in range(self.w):
+            for y in range(self.h):
+                pid = y * self.w + x
+                if x + 1 < self.w:
+                    self.edges[pid].append(pid + 1)
+                    self.edges[pid + 1].append(pid)
+                if y + 1 < self.h:
+                    self.edges[pid].append(pid + self.w)
+                    self.edges[pid + self.w].append(pid)
+
+    def place(self, x, y):
+        self.blocked.add((x, y))
+        self.rebuild()
+
+    def _astar(self, start, goal):
+        if start in self.disabled or goal in self.disabled:
+            return False
+        gx, gy = self.points[goal]
+        best = {start: 0}
+        heap = [(0, start)]
+        while heap:
+            _, v = heapq.heappop(heap)
+            if v == goal:
+                return True
+            for u in self.edges[v]:
+                if u in self.disabled:
+                    continue
+                g = best[v] + 1
+                if g < best.get(u, 1 << 60):
+                    best[u] = g
+                    ux, uy = self.points[u]
+                    heapq.heappush(heap, (g + abs(ux - gx) + abs(uy - gy), u))
+        return False
+
+    def would_block(self, x, y):
+        pid = y * self.w + x
+        was = pid in self.disabled
+        self.disabled.add(pid)
+        goal = self.goal[1] * self.w + self.goal[0]
+        ok = all(self._astar(sy * self.w + sx, goal) for sx, sy in self.spawns)
+        if not was:
+            self.disabled.discard(pid)
+        return not ok
+
+# ── Benchmark ──
+
+def default_map(w, h):
+    """Spawns on the left edge, goal mid right edge — the in-game arrangement, scaled."""
+    return [(0, h // 4), (0, h // 2), (0, (3 * h) // 4)], (w - 1, h // 2)
+
+def bench_size(w, h, attempts, seed):
+    """Random placement session: each attempt asks would_block, places if allowed."""
+    spawns, goal = default_map(w, h)
+    special = set(spawns) | {goal}
+    rng = random.Random(seed)
+    cells = [(rng.randrange(w), rng.randrange(h)) for _ in range(attempts)]
+    results = {}
+    for name, cls in (("oracle", PathOracle), ("rebuild", RebuildReference)):
+        eng = cls(w, h, spawns, goal)
+        answers = []
+        occupied = set()
+        t0 = time.perf_counter()
+        for c in cells:
+            if c in special or c in occupied:
+                answers.append(None)
+                continue
+            blocks = eng.would_block(*c)
+            answers.append(blocks)
+            if not blocks:
+                eng.place(*c)
+                occupied.add(c)
+        results[name] = (time.perf_counter() - t0, answers, len(occupied))
+    return results
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark the bitboard oracle against rebuild-per-placement")
+    ap.add_argument("--sizes", default="20x14,64x64,128x128,256x256")
+    ap.add_argument("--attempts", type=int, default=0, help="placements per size (default scales with size)")
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args(argv)
+    print(f"{'grid':>9} {'tries':>6} {'placed':>6} {'oracle ms':>10} {'rebuild ms':>11} {'speedup':>8}  agree")
+    for size in args.sizes.split(","):
+        w, h = (int(v) for v in size.split("x"))
+        attempts = args.attempts or max(20, min(600, 120000 // (w * h) * 10))
+        res = bench_size(w, h, attempts, args.seed)
+        (to, ao, placed), (tr, ar, _) = res["oracle"], res["rebuild"]
+        print(f"{size:>9} {attempts:>6} {placed:>6} {to*1e3:>10.1f} {tr*1e3:>11.1f} "
+              f"{tr / max(to, 1e-9):>7.1f}x  {'yes' if ao == ar else 'NO'}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""Multi-threaded DEFLATE for large PNG IDAT streams.
+The filtered scanlines are cut into independent chunks and compressed on a
+thread pool (zlib releases the GIL while it works). Every chunk but the
+last ends with a sync (or full) flush, so the raw deflate pieces are
+byte-aligned and concatenate into one stream; each chunk is primed with the
+previous 32 KiB as a preset dictionary, so matches still reach across
+boundaries. Per-chunk Adler-32s are combined into the single zlib trailer.
+Inputs smaller than two chunks go through plain zlib.compress and come out
+byte-identical to it. Uses only Python built-ins.
+
+    idat = deflate(raw)                         # drop-in for zlib.compress(raw)
+
+    pd = ParallelDeflate()                      # streaming: feed rows, collect output
+    out = [pd.feed(rows_bytes) for rows_bytes in bands] + [pd.finish()]
+
+Run: python png_deflate.py [--mb 64]   (benchmark vs zlib.compress)
+"""
+import argparse, os, random, time, zlib
+from concurrent.futures import ThreadPoolExecutor
+
+CHUNK = 1 << 20       # uncompressed bytes per chunk
+WINDOW = 1 << 15      # deflate history = preset dictionary size
+ADLER_BASE = 65521
+FLUSH_MODES = {"sync": zlib.Z_SYNC_FLUSH, "full": zlib.Z_FULL_FLUSH}
+
+def zlib_header(level):
+    """CMF/FLG bytes zlib itself writes for `level` (window 32K, no dict)."""
+    flevel = {-1: 2, 0: 0, 1: 0}.get(level, 1 if level < 6 else 2 if level == 6 else 3)
+    cmf = 0x78
+    flg = flevel << 6
+    flg += 31 - (cmf * 256 + flg) % 31
+    return bytes((cmf, flg))
+
+def adler32_combine(adler1, adler2, len2):
+    """Adler-32 of A+B from adler32(A), adler32(B) and len(B) (zlib's adler32_combine)."""
+    rem = len2 % ADLER_BASE
+    sum1 = adler1 & 0xFFFF
+    sum2 = rem * sum1 % ADLER_BASE
+    sum1 += (adler2 & 0xFFFF) + ADLER_BASE - 1
+    sum2 += (adler1 >> 16) + (adler2 >> 16) + ADLER_BASE - rem
+    sum1 %= ADLER_BASE
+    sum2 %= ADLER_BASE
+    return (sum2 << 16) | sum1
+
+def _deflate_chunk(data, zdict, level, flush):
+    """Raw deflate one chunk. Returns (compressed, adler32(data))."""
+    if zdict:
+        z = zlib.compressobj(level, zlib.DEFLATED, -15, zdict=zdict)
+    else:
+        z = zlib.compressobj(level, zlib.DEFLATED, -15)
+    return z.compress(data) + z.flush(flush), zlib.adler32(data)
+
+class ParallelDeflate:
+    """Incremental zlib stream built from chunks compressed on worker threads.
+    feed() returns whatever compressed bytes are ready (in order), finish()
+    the rest plus the Adler-32 trailer. At most 2 x workers chunks are in
+    flight, so memory stays bounded for streamed outputs."""
+
+    def __init__(self, level=-1, workers=None, chunk=CHUNK, flush="sync"):
+        self.level, self.chunk = level, chunk
+        self.flush_mode = FLUSH_MODES[flush]
+        self.workers = workers or os.cpu_count() or 1
+        self._pool = ThreadPoolExecutor(self.workers)
+        self._buf = bytearray()
+        self._tail = b""          # last WINDOW bytes already submitted
+        self._inflight = []       # futures, in stream order
+        self._adler = 1
+        self._started = False
+
+    def _submit(self, data, last):
+        flush = zlib.Z_FINISH if last else self.flush_mode
+        fut = self._pool.submit(_deflate_chunk, data, self._tail, self.level, flush)
+        self._inflight.append((fut, len(data)))
+        self._tail = (self._tail + data)[-WINDOW:]
+
+    def _collect(self, block):
+        out = []
+        if not self._started:
+            out.append(zlib_header(self.level))
+            self._started = True
+        while self._inflight and (block or len(self._inflight) > 2 * self.workers
+                                  or self._inflight[0][0].done()):
+            fut, n = self._inflight.pop(0)
+            data, adler = fut.result()
+            self._adler = adler32_combine(self._adler, adler, n)
+            out.append(data)
+        return b"".join(out)
+
+    def feed(self, data):
+        self._buf += data
+        while len(self._buf) > self.chunk:
+            self._submit(bytes(self._buf[:self.chunk]), last=False)
+            del self._buf[:self.chunk]
+        return self._collect(block=False)
+
+    def finish(self):
+        self._submit(bytes(self._buf), last=True)
+        self._buf = bytearray()
+        out = self._collect(block=True) + self._adler.to_bytes(4, "big")
+        self._pool.shutdown()
+        return out
+
+    # zlib.compressobj-compatible names, so either can drive a stream writer
+    compress = feed
+    flush = finish
+
+def deflate(raw, level=-1, workers=None, chunk=CHUNK, flush="sync"):
+    """zlib-format compression of `raw`, parallel when it spans at least two chunks."""
+    if len(raw) < 2 * chunk or (workers or os.cpu_count() or 1) < 2:
+        return zlib.compress(raw, level)
+    pd = ParallelDeflate(level, workers, chunk, flush)
+    return pd.feed(raw) + pd.finish()
+
+# ── Benchmark ──
+
+def _sample_scanlines(size):
+    """Tile-like RGBA rows (filter byte + pixels) with some noise, ~size bytes."""
+    rng = random.Random(3)
+    w = 2048
+    rows = []
+    palette = [bytes((60 + rng.randrange(30), 120 + rng.randrange(30), 50, 255)) for _ in range(16)]
+    while len(rows) * (w * 4 + 1) < size:
+        y = len(rows)
+        rows.append(b"\x00" + b"".join(palette[((x // 32) + (y // 16) + rng.randrange(2)) % 16]
+                                       for x in range(w)))
+    return b"".join(rows)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark parallel DEFLATE against zlib.compress")
+    ap.add_argument("--mb", type=int, default=64, help="input size in MiB")
+    ap.add_argument("--workers", type=int, default=os.cpu_count())
+    args = ap.parse_args(argv)
+    raw = _sample_scanlines(args.mb << 20)
+    t0 = time.perf_counter()
+    ref = zlib.compress(raw)
+    t1 = time.perf_counter()
+    par = deflate(raw, workers=args.workers)
+    t2 = time.perf_counter()
+    assert zlib.decompress(par) == raw
+    print(f"{len(raw) / 2**20:.0f} MiB: zlib {t1 - t0:.2f}s ({len(ref)} B), "
+          f"{args.workers} threads {t2 - t1:.2f}s ({len(par)} B), {(t1 - t0) / (t2 - t1):.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""Bounded-memory PNG output for very large renders (atlases, baked maps).
+The image is produced one horizontal band at a time: primitives are
+clipped to the band, its rows are filtered and fed to a running deflate
+stream, and finished IDAT chunks go straight to disk before the next band
+is rendered. Peak memory is O(width x band), so 8192x8192 outputs fit on
+small build machines. Uses only Python built-ins.
+
+    with PNGStreamWriter("map.png", 8192, 8192) as png:
+        png.write_rows(rows)             # any number of rows at a time
+
+    render_layers_banded("map.png", 8192, 8192, layers, palette)   # sprite_defs layers
+    render_banded("map.png", w, h, draw)  # draw(band, y0, y1) with the usual set_px helpers
+
+Run: python png_stream.py [--size 8192] [--band 64] [out.png]
+     (renders an isometric checkerboard map and reports peak memory)
+"""
+import argparse, itertools, os, struct, sys, time, tracemalloc, zlib
+
+from png_deflate import ParallelDeflate
+from sprite_defs import _color, layer_spans
+from sprite_postfx import over
+
+T = (0, 0, 0, 0)
+IDAT_SIZE = 1 << 16  # flush compressed output to disk in chunks of this size
+
+def _chunk(ctype, data):
+    c = ctype + data
+    return struct.pack(">I", len(data)) + c + struct.pack(">I", zlib.crc32(c) & 0xFFFFFFFF)
+
+class PNGStreamWriter:
+    """RGBA PNG written row by row through one deflate stream. Rows are lists
+    of (R,G,B,A) tuples or ready-made 4*width byte strings. The file appears
+    atomically (temp file + os.replace) when the writer is closed."""
+
+    def __init__(self, path, width, height, level=-1, workers=0):
+        self.path, self.width, self.height = path, width, height
+        self.rows_written = 0
+        self._tmp = path + ".tmp"
+        self._f = open(self._tmp, "wb")
+        # workers > 1: deflate 1 MiB chunks on a thread pool (png_deflate)
+        self._z = ParallelDeflate(level, workers) if workers > 1 else zlib.compressobj(level)
+        self._pending = []
+        self._pending_len = 0
+        self._f.write(b"\x89PNG\r\n\x1a\n")
+        self._f.write(_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)))
+
+    def _emit(self, data, final=False):
+        if data:
+            self._pending.append(data)
+            self._pending_len += len(data)
+        if self._pending_len >= IDAT_SIZE or (final and self._pending):
+            self._f.write(_chunk(b"IDAT", b"".join(self._pending)))
+            self._pending, self._pending_len = [], 0
+
+    def write_rows(self, rows):
+        for row in rows:
+            if not isinstance(row, (bytes, bytearray)):
+                row = bytes(itertools.chain.from_iterable(row))
+            if len(row) != self.width * 4:
+                raise ValueError(f"Row {self.rows_written} has {len(row)} bytes, expected {self.width * 4}")
+            # Filter type 0 (None), as write_png does
+            self._emit(self._z.compress(b"\x00" + row))
+            self.rows_written += 1
+
+    def close(self):
+        if self._f is None:
+            return
+        try:
+            if self.rows_written != self.height:
+                raise ValueError(f"{self.path}: wrote {self.rows_written} of {self.height} rows")
+            self._emit(self._z.flush(), final=True)
+            self._f.write(_chunk(b"IEND", b""))
+            self._f.close()
+            os.replace(self._tmp, self.path)
+        except BaseException:
+            self.abort()
+            raise
+        self._f = None
+
+    def abort(self):
+        """Drop the partial file."""
+        if self._f is None:
+            return
+        self._f.close()
+        self._f = None
+        if os.path.exists(self._tmp):
+            os.remove(self._tmp)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+# ── Banded rendering ──
+
+class BandView:
+    """Grid interface over rows y0..y1-1 of a taller image. Row indices are
+    absolute, so the set_px/fill_* helpers draw unchanged; writes outside
+    the band land in a scratch row and are dropped."""
+    __slots__ = ("rows", "y0", "y1", "height", "_scratch")
+
+    def __init__(self, width, height, y0, y1, fill=T):
+        self.rows = [[fill] * width for _ in range(y1 - y0)]
+        self.y0, self.y1, self.height = y0, y1, height
+        self._scratch = [fill] * width
+
+    def __len__(self):
+        return self.height
+
+    def __getitem__(self, y):
+        if self.y0 <= y < self.y1:
+            return self.rows[y - self.y0]
+        return self._scratch
+
+def render_banded(path, width, height, draw, band=64, workers=0):
+    """Render `draw(view, y0, y1)` one band at a time into a streamed PNG.
+    draw may use any grid helper on `view`; it should skip work outside y0..y1."""
+    with PNGStreamWriter(path, width, height, workers=workers) as png:
+        for y0 in range(0, height, band):
+            y1 = min(y0 + band, height)
+            view = BandView(width, height, y0, y1)
+            draw(view, y0, y1)
+            png.write_rows(view.rows)
+
+def layer_yrange(layer):
+    """Inclusive (top, bottom) rows a sprite_defs layer can touch."""
+    op = layer["op"]
+    if op == "rect" or op == "line":
+        a, b = layer["from"][1], layer["to"][1]
+        return min(a, b), max(a, b)
+    if op == "circle":
+        return layer["at"][1] - layer["r"], layer["at"][1] + layer["r"]
+    if op in ("diamond", "diamond_outline"):
+        return layer["at"][1] - layer["hh"], layer["at"][1] + layer["hh"]
+    ys = [y for _, y in layer["points"]]
+    return min(ys), max(ys)
+
+def render_layers_banded(path, width, height, layers, palette=None, band=64, workers=0):
+    """Stream sprite_defs-style layers to a PNG, clipping each layer to the bands it overlaps."""
+    palette = {k: tuple(v) for k, v in (palette or {}).items()}
+    # Layers sorted by top row; each band pulls in the ones that start in it
+    # and drops the ones that ended above it
+    pending = sorted((layer_yrange(l), i) for i, l in enumerate(layers))
+    active = []
+    k = 0
+    with PNGStreamWriter(path, width, height, workers=workers) as png:
+        for y0 in range(0, height, band):
+            y1 = min(y0 + band, height)
+            while k < len(pending) and pending[k][0][0] < y1:
+                active.append((pending[k][1], pending[k][0][1]))
+                k += 1
+            active = sorted(a for a in active if a[1] >= y0)  # draw order = layer order
+            rows = [[T] * width for _ in range(y1 - y0)]
+            for i, _ in active:
+                layer = layers[i]
+                color = _color(layer["color"], palette)
+                blend = layer.get("blend", False)
+                for y, x0, x1 in layer_spans(layer):
+                    if not y0 <= y < y1:
+                        continue
+                    x0, x1 = max(x0, 0), min(x1, width - 1)
+                    if x0 > x1:
+                        continue
+                    row = rows[y - y0]
+                    if blend:
+                        for x in range(x0, x1+1):
+                            row[x] = over(row[x], color)
+                    else:
+                        row[x0:x1+1] = [color] * (x1 - x0 + 1)
+            png.write_rows(rows)
+
+# ── Demo ──
+
+def iso_map_layers(width, height, tile_w=64, tile_h=32):
+    """Checkerboard of isometric grass diamonds covering the whole image."""
+    layers = []
+    for ty in range(-1, height // (tile_h // 2) + 2):
+        for tx in range(-1, width // tile_w + 2):
+            cx = tx * tile_w + (tile_w // 2 if ty % 2 else 0)
+            cy = ty * (tile_h // 2)
+            layers.append({"op": "diamond", "at": [cx, cy], "hw": tile_w // 2, "hh": tile_h // 2,
+                           "color": "grass_a" if (tx + ty) % 2 else "grass_b"})
+    return layers
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Stream a large isometric map to PNG in bands")
+    ap.add_argument("out", nargs="?", default="iso_map.png")
+    ap.add_argument("--size", type=int, default=8192)
+    ap.add_argument("--band", type=int, default=64)
+    ap.add_argument("--workers", type=int, default=0, help="deflate threads (0 = single stream)")
+    args = ap.parse_args(argv)
+    palette = {"grass_a": [60, 120, 50, 255], "grass_b": [75, 140, 60, 255]}
+    layers = iso_map_layers(args.size, args.size)
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    render_layers_banded(args.out, args.size, args.size, layers, palette, args.band, args.workers)
+    _, peak = tracemalloc.get_traced_memory()
+    print(f"{args.out}: {args.size}x{args.size}, {len(layers)} layers, band {args.band} — "
+          f"{time.perf_counter() - t0:.1f}s, peak {peak / 2**20:.1f} MiB, "
+          f"{os.path.getsize(args.out) / 2**20:.1f} MiB on disk")
+
+if __name__ == "__main__":
+    sys.exit(main())
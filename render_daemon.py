@@ -0,0 +1,216 @@
+"""Long-lived render service for editor tooling and the level pipeline.
+Speaks JSON lines over stdin/stdout (default) or a Unix socket, so callers
+skip interpreter startup and re-rasterising. The first request renders the
+whole ASSET_TABLE once, in generator order with the generator's seed, so
+cached sprites are identical to the committed PNGs; after that requests are
+served from warm grid / PNG / board caches. Uses only Python built-ins.
+
+Requests (one JSON object per line; "id" is echoed back):
+    {"op": "render", "asset": "hero_walk.png", "frames": 8,
+     "post": [{"op": "outline"}], "out": "/tmp/hero.png"}
+    {"op": "map", "layout": "layouts/serpentine.json"}    # or an inline layout dict
+    {"op": "list"} {"op": "stats"} {"op": "invalidate"} {"op": "ping"} {"op": "shutdown"}
+Without "out" the PNG comes back base64-encoded in "png"; with it the file
+is written atomically (temp file + os.replace) and "path" is returned.
+Map layouts must pass board_layout.validate_layout (gold budget aside).
+Errors answer {"ok": false, "error": ...} and the service keeps running.
+
+Run: python render_daemon.py [--socket /tmp/ktd_render.sock]
+"""
+import argparse, base64, json, os, random, socket, socketserver, sys, time
+
+from asset_writer import write_atomic
+from board_layout import check_layout, load_layout, normalize_layout
+from gd_constants import load_constants
+from map_bake import BoardBaker
+from sprite_postfx import apply_post
+
+class RenderService:
+    """Request handler state: every cache lives here, for the life of the process."""
+
+    def __init__(self):
+        self.C = load_constants()
+        self.specs = None      # {file: ASSET_TABLE spec}
+        self.grids = {}        # (file, frames, post) -> (w, h, grid)
+        self.pngs = {}         # same key -> encoded PNG bytes
+        self.boards = {}       # normalised layout JSON -> PNG bytes
+        self.baker = BoardBaker(lambda name: self.grid(name)[2], self.C)
+        self.requests = 0
+
+    def warm(self):
+        """Render the default asset set exactly as generate_sprites_v2.main() does."""
+        import generate_sprites_v2 as gen
+        self._gen = gen
+        self.specs = {}
+        random.seed(42)  # tile/static generators draw from the seeded RNG in table order
+        for _, specs in gen.ASSET_TABLE:
+            for spec in specs:
+                self.specs[spec["file"]] = spec
+                self.grids[(spec["file"], None, None)] = gen.render_asset(spec)
+
+    def invalidate(self):
+        self.specs = None
+        self.grids.clear()
+        self.pngs.clear()
+        self.boards.clear()
+        self.baker.invalidate()
+
+    # ── Rendering ──
+
+    def grid(self, name, frames=None, post=None):
+        if self.specs is None:
+            self.warm()
+        if name not in self.specs:
+            raise KeyError(f"unknown asset: {name}")
+        key = (name, frames, json.dumps(post, sort_keys=True) if post else None)
+        hit = self.grids.get(key)
+        if hit is None:
+            spec = self.specs[name]
+            if frames and not spec.get("frame"):
+                raise ValueError(f"{name} is not an animated sheet")
+            w, h, g = self.grid(name, frames) if post else self._gen.render_asset(spec, frames)
+            if post:
+                # JSON colours arrive as lists; the kernels write tuples into the grid
+                steps = [{k: tuple(v) if isinstance(v, list) else v for k, v in s.items()} for s in post]
+                g = apply_post([list(row) for row in g], steps)
+            hit = self.grids[key] = (w, h, g)
+        return hit
+
+    def png(self, name, frames=None, post=None):
+        key = (name, frames, json.dumps(post, sort_keys=True) if post else None)
+        data = self.pngs.get(key)
+        if data is None:
+            w, h, g = self.grid(name, frames, post)
+            data = self.pngs[key] = self._gen.encode_png(w, h, g)
+        return data
+
+    def board(self, layout):
+        if self.specs is None:
+            self.warm()
+        if isinstance(layout, str):
+            layout = load_layout(layout, self.C, budget=False)
+        else:
+            layout = check_layout(normalize_layout(layout, self.C), self.C, budget=False)
+        key = json.dumps(layout, sort_keys=True)
+        data = self.boards.get(key)
+        if data is None:
+            w, h, g = self.baker.bake(layout)
+            data = self.boards[key] = self._gen.encode_png(w, h, g)
+        return data
+
+    # ── Protocol ──
+
+    def handle(self, req):
+        """One request dict -> one response dict."""
+        t0 = time.perf_counter()
+        self.requests += 1
+        if not isinstance(req, dict):
+            return {"id": None, "ok": False, "error": "request must be a JSON object", "ms": 0.0}
+        resp = {"id": req.get("id"), "ok": True}
+        try:
+            op = req.get("op")
+            if op == "render":
+                frames = req.get("frames")
+                if frames is not None and (type(frames) is not int or frames < 1):
+                    raise ValueError(f"frames must be a positive integer, got {frames!r}")
+                data = self.png(req["asset"], frames, req.get("post"))
+            elif op == "map":
+                data = self.board(req["layout"])
+            elif op == "list":
+                if self.specs is None:
+                    self.warm()
+                resp["assets"] = {f: bool(s.get("frame")) for f, s in self.specs.items()}
+                data = None
+            elif op == "stats":
+                resp.update(requests=self.requests, grids=len(self.grids),
+                            pngs=len(self.pngs), boards=len(self.boards))
+                data = None
+            elif op == "invalidate":
+                self.invalidate()
+                data = None
+            elif op in ("ping", "shutdown"):
+                data = None
+            else:
+                raise ValueError(f"unknown op: {op}")
+            if data is not None:
+                resp["bytes"] = len(data)
+                if req.get("out"):
+                    write_atomic(req["out"], data)
+                    resp["path"] = req["out"]
+                else:
+                    resp["png"] = base64.b64encode(data).decode("ascii")
+        except (KeyError, ValueError, TypeError, OSError) as e:
+            resp = {"id": req.get("id"), "ok": False, "error": f"{type(e).__name__}: {e}"}
+        except Exception as e:  # a bad request must never take the daemon down
+            resp = {"id": req.get("id"), "ok": False, "error": f"internal {type(e).__name__}: {e}"}
+        resp["ms"] = round((time.perf_counter() - t0) * 1000, 2)
+        return resp
+
+    def handle_line(self, line):
+        """Returns (response JSON line, keep running)."""
+        try:
+            req = json.loads(line)
+        except ValueError as e:
+            return json.dumps({"id": None, "ok": False, "error": f"bad JSON: {e}"}) + "\n", True
+        running = not (isinstance(req, dict) and req.get("op") == "shutdown")
+        return json.dumps(self.handle(req)) + "\n", running
+
+# ── Transports ──
+
+def serve_stdio(service, inp=sys.stdin, out=sys.stdout):
+    for line in inp:
+        if not line.strip():
+            continue
+        reply, running = service.handle_line(line)
+        out.write(reply)
+        out.flush()
+        if not running:
+            break
+
+def serve_socket(service, path):
+    """One connection at a time (the caches are not shared across threads)."""
+    state = {"running": True}
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for line in self.rfile:
+                if not line.strip():
+                    continue
+                reply, state["running"] = service.handle_line(line)
+                self.wfile.write(reply.encode())
+                if not state["running"]:
+                    break
+
+    if os.path.exists(path):
+        os.remove(path)
+    with socketserver.UnixStreamServer(path, Handler) as server:
+        print(f"render_daemon listening on {path}", file=sys.stderr)
+        try:
+            while state["running"]:
+                server.handle_request()
+        finally:
+            os.remove(path)
+
+def request(path, req):
+    """Client helper: send one request to a socket daemon, return the response."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        s.connect(path)
+        s.sendall(json.dumps(req).encode() + b"\n")
+        s.shutdown(socket.SHUT_WR)
+        return json.loads(s.makefile("rb").readline())
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Persistent sprite / board render service (JSON lines)")
+    ap.add_argument("--socket", help="listen on this Unix socket instead of stdin/stdout")
+    ap.add_argument("--warm", action="store_true", help="render the asset table before the first request")
+    args = ap.parse_args(argv)
+    service = RenderService()
+    if args.warm:
+        service.warm()
+    if args.socket:
+        serve_socket(service, args.socket)
+    else:
+        serve_stdio(service)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,94 +1,106 @@
 extends Node
 
-# Procedural audio system — generates all SFX at runtime using AudioStreamWAV
-# No external audio files needed
+# Procedural audio system — SFX are baked offline by bake_sfx.py into
+# assets/sfx/*.wav; anything not baked is synthesised at startup
 
 var _sounds := {}
 var _players: Array[AudioStreamPlayer] = []
 const MAX_CONCURRENT := 8
 const SAMPLE_RATE := 22050
+const SFX_DIR := "res://assets/sfx/"
 
-func _ready() -> void:
-	# Create a pool of AudioStreamPlayers
-	for i in MAX_CONCURRENT:
-		var p := AudioStreamPlayer.new()
-		p.bus = "Master"
-		add_child(p)
-		_players.append(p)
-
-	# Generate all sound effects
-	_sounds["sword_attack"] = _make_sound([
+# Tone specs per sound. bake_sfx.py renders these offline into
+# assets/sfx/<name>.wav; _make_sound is only the fallback for unbaked ones.
+const SFX_TONES := {
+	"sword_attack": [
 		{"type": "noise", "freq": 800.0, "duration": 0.08, "volume": 0.4},
 		{"type": "sine", "freq": 400.0, "duration": 0.1, "volume": 0.3},
-	])
-	_sounds["arrow_fire"] = _make_sound([
+	],
+	"arrow_fire": [
 		{"type": "noise", "freq": 2000.0, "duration": 0.05, "volume": 0.2},
 		{"type": "sine", "freq": 1200.0, "duration": 0.08, "volume": 0.2},
-	])
-	_sounds["enemy_hit"] = _make_sound([
+	],
+	"enemy_hit": [
 		{"type": "sine", "freq": 200.0, "duration": 0.1, "volume": 0.3},
-	])
-	_sounds["enemy_death"] = _make_sound([
+	],
+	"enemy_death": [
 		{"type": "sine", "freq": 300.0, "duration": 0.15, "volume": 0.4},
 		{"type": "sine", "freq": 150.0, "duration": 0.2, "volume": 0.3},
-	])
-	_sounds["build_place"] = _make_sound([
+	],
+	"build_place": [
 		{"type": "sine", "freq": 600.0, "duration": 0.05, "volume": 0.3},
 		{"type": "sine", "freq": 800.0, "duration": 0.08, "volume": 0.3},
-	])
-	_sounds["build_fail"] = _make_sound([
+	],
+	"build_fail": [
 		{"type": "sine", "freq": 200.0, "duration": 0.15, "volume": 0.4},
 		{"type": "sine", "freq": 150.0, "duration": 0.15, "volume": 0.3},
-	])
-	_sounds["build_remove"] = _make_sound([
+	],
+	"build_remove": [
 		{"type": "sine", "freq": 500.0, "duration": 0.06, "volume": 0.2},
 		{"type": "sine", "freq": 350.0, "duration": 0.08, "volume": 0.2},
-	])
-	_sounds["wave_start"] = _make_sound([
+	],
+	"wave_start": [
 		{"type": "sine", "freq": 400.0, "duration": 0.12, "volume": 0.4},
 		{"type": "sine", "freq": 500.0, "duration": 0.12, "volume": 0.4},
 		{"type": "sine", "freq": 650.0, "duration": 0.15, "volume": 0.5},
-	])
-	_sounds["wave_complete"] = _make_sound([
+	],
+	"wave_complete": [
 		{"type": "sine", "freq": 500.0, "duration": 0.1, "volume": 0.4},
 		{"type": "sine", "freq": 630.0, "duration": 0.1, "volume": 0.4},
 		{"type": "sine", "freq": 750.0, "duration": 0.1, "volume": 0.4},
 		{"type": "sine", "freq": 1000.0, "duration": 0.2, "volume": 0.5},
-	])
-	_sounds["game_over"] = _make_sound([
+	],
+	"game_over": [
 		{"type": "sine", "freq": 400.0, "duration": 0.2, "volume": 0.5},
 		{"type": "sine", "freq": 300.0, "duration": 0.2, "volume": 0.4},
 		{"type": "sine", "freq": 200.0, "duration": 0.3, "volume": 0.4},
 		{"type": "sine", "freq": 120.0, "duration": 0.4, "volume": 0.3},
-	])
-	_sounds["victory"] = _make_sound([
+	],
+	"victory": [
 		{"type": "sine", "freq": 520.0, "duration": 0.12, "volume": 0.4},
 		{"type": "sine", "freq": 650.0, "duration": 0.12, "volume": 0.4},
 		{"type": "sine", "freq": 780.0, "duration": 0.12, "volume": 0.5},
 		{"type": "sine", "freq": 1040.0, "duration": 0.25, "volume": 0.5},
-	])
-	_sounds["gold_earned"] = _make_sound([
+	],
+	"gold_earned": [
 		{"type": "sine", "freq": 1200.0, "duration": 0.04, "volume": 0.15},
 		{"type": "sine", "freq": 1600.0, "duration": 0.06, "volume": 0.15},
-	])
-	_sounds["select"] = _make_sound([
+	],
+	"select": [
 		{"type": "sine", "freq": 900.0, "duration": 0.04, "volume": 0.15},
-	])
-	_sounds["fireball_cast"] = _make_sound([
+	],
+	"fireball_cast": [
 		{"type": "noise", "freq": 600.0, "duration": 0.06, "volume": 0.3},
 		{"type": "sine", "freq": 350.0, "duration": 0.12, "volume": 0.4},
 		{"type": "sine", "freq": 250.0, "duration": 0.08, "volume": 0.3},
-	])
-	_sounds["fireball_explode"] = _make_sound([
+	],
+	"fireball_explode": [
 		{"type": "noise", "freq": 300.0, "duration": 0.15, "volume": 0.5},
 		{"type": "sine", "freq": 120.0, "duration": 0.2, "volume": 0.4},
 		{"type": "noise", "freq": 150.0, "duration": 0.15, "volume": 0.3},
-	])
-	_sounds["ice_blast"] = _make_sound([
+	],
+	"ice_blast": [
 		{"type": "noise", "freq": 2500.0, "duration": 0.08, "volume": 0.3},
 		{"type": "sine", "freq": 1800.0, "duration": 0.1, "volume": 0.3},
 		{"type": "sine", "freq": 1200.0, "duration": 0.15, "volume": 0.2},
-	])
+	],
+}
+
+func _ready() -> void:
+	# Create a pool of AudioStreamPlayers
+	for i in MAX_CONCURRENT:
+		var p := AudioStreamPlayer.new()
+		p.bus = "Master"
+		add_child(p)
+		_players.append(p)
+
+	# Load baked SFX, synthesising any that have not been baked yet
+	for sound_name in SFX_TONES:
+		var baked := SFX_DIR + sound_name + ".wav"
+		if ResourceLoader.exists(baked):
+			_sounds[sound_name] = load(baked)
+		else:
+			_sounds[sound_name] = _make_sound(SFX_TONES[sound_name])
 
 func play(sound_name: String) -> void:
 	if not _sounds.has(sound_name):
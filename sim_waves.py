@@ -0,0 +1,272 @@
+"""Headless wave-balance simulator for Korean Fantasy TD.
+Replays waves against a board layout using the live numbers in
+scripts/Constants.gd: spawns every ENEMY_SPAWN_INTERVAL, per-wave HP/speed
+scaling, path following, closest-enemy tower targeting and projectile
+travel, on a fixed timestep. The hero is not simulated, so results are a
+towers-only baseline. Uses only Python built-ins.
+
+Enemy, tower and projectile state is kept as struct-of-arrays (one list per
+field) and games run in parallel on a process pool.
+
+Run: python sim_waves.py layouts/*.json [--games 200] [--waves 10]
+                         [--workers N] [--dt 0.033] [--seed 1] [--json out.json]
+"""
+import argparse, json, math, os, random, sys, time
+from multiprocessing import Pool
+
+from board_layout import load_layout, blocked_cells, goal_distances, layout_cost, structures
+from gd_constants import load_constants, get_wave_config, grid_to_world
+
+REACH_DIST = 3.0      # Enemy.gd: waypoint reached
+HIT_DIST = 8.0        # Projectile.gd: hit radius
+MAX_FLIGHT = 1000.0   # Projectile.gd: self-destruct distance
+MUZZLE_Y = {"ARCHER_TOWER": -18.0, "GROUND_ARCHER": -10.0}
+
+# ── Setup ──
+
+def build_paths(C, layout):
+    """World-space waypoint list per spawn, following the BFS field downhill."""
+    w, h = layout["width"], layout["height"]
+    dist = goal_distances(w, h, blocked_cells(layout, C), layout["goal"])
+    paths = []
+    for sx, sy in layout["spawns"]:
+        if dist[sy][sx] < 0:
+            raise ValueError(f"{layout['name']}: spawn ({sx},{sy}) cannot reach the goal")
+        x, y = sx, sy
+        pts = [grid_to_world(C, x, y)]
+        while dist[y][x] > 0:
+            for nx, ny in ((x+1, y), (x, y+1), (x-1, y), (x, y-1)):
+                if 0 <= nx < w and 0 <= ny < h and dist[ny][nx] == dist[y][x] - 1:
+                    x, y = nx, ny
+                    break
+            pts.append(grid_to_world(C, x, y))
+        paths.append(pts)
+    return paths
+
+def build_towers(C, layout):
+    """Struct-of-arrays tower state for every shooting structure."""
+    T = {"x": [], "y": [], "range2": [], "rate": [], "damage": [], "pspeed": [], "muzzle": []}
+    stats_for = {C["BuildItem"]["ARCHER_TOWER"]: ("ARCHER_TOWER", C["ARCHER_TOWER_STATS"]),
+                 C["BuildItem"]["GROUND_ARCHER"]: ("GROUND_ARCHER", C["GROUND_ARCHER_STATS"])}
+    for x, y, item, level in structures(layout, C):
+        if item not in stats_for:
+            continue
+        kind, base = stats_for[item]
+        li = level - 1
+        wx, wy = grid_to_world(C, x, y)
+        rng = base["range"] * C["UPGRADE_RANGE_MULT"][li]
+        T["x"].append(wx)
+        T["y"].append(wy)
+        T["range2"].append(rng * rng)
+        T["rate"].append(base["fire_rate"] * C["UPGRADE_RATE_MULT"][li])
+        T["damage"].append(int(base["damage"] * C["UPGRADE_DAMAGE_MULT"][li]))
+        T["pspeed"].append(base["projectile_speed"])
+        T["muzzle"].append(MUZZLE_Y[kind])
+    return T
+
+# ── One wave ──
+
+def run_wave(C, wave, paths, T, rng, dt):
+    """Simulate one wave. Returns (kills, leaks, damage_to_base, gold_from_kills, seconds)."""
+    cfg = get_wave_config(C, wave)
+    count, types = cfg["count"], cfg["types"]
+    hp_scale = 1.0 + C["ENEMY_HP_SCALE_PER_WAVE"] * (wave - 1)
+    spd_scale = 1.0 + C["ENEMY_SPEED_SCALE_PER_WAVE"] * (wave - 1)
+    kill_gold = 5 + wave * 2
+
+    # Enemy struct-of-arrays
+    ex, ey, ehp, espd, epath, eidx, edmg, egold = [], [], [], [], [], [], [], []
+    alive = []  # indices of live enemies
+
+    # Projectile struct-of-arrays
+    px, py, psx, psy, ptgt, plx, ply, pspd, pdmg = [], [], [], [], [], [], [], [], []
+
+    n_towers = len(T["x"])
+    timers = [0.0] * n_towers
+    spawn_timer = 0.0
+    to_spawn = count
+    kills = leaks = base_dmg = gold = 0
+    t = 0.0
+
+    while to_spawn > 0 or alive or px:
+        t += dt
+        # Spawning (EnemyManager._process)
+        if to_spawn > 0:
+            spawn_timer -= dt
+            if spawn_timer <= 0:
+                etype = C["ENEMY_TYPES"][types[rng.randrange(len(types))]]
+                pi = rng.randrange(len(paths))
+                sx, sy = paths[pi][0]
+                ex.append(sx)
+                ey.append(sy)
+                ehp.append(int(C["ENEMY_BASE_HP"] * etype["hp_mult"] * hp_scale))
+                espd.append(C["ENEMY_BASE_SPEED"] * etype["speed_mult"] * spd_scale)
+                epath.append(paths[pi])
+                eidx.append(1)
+                edmg.append(etype["damage"])
+                egold.append(int(kill_gold * etype["gold_mult"]))
+                alive.append(len(ex) - 1)
+                spawn_timer = C["ENEMY_SPAWN_INTERVAL"]
+                to_spawn -= 1
+
+        # Movement (Enemy._process)
+        still = []
+        for i in alive:
+            path = epath[i]
+            k = eidx[i]
+            if k >= len(path):
+                leaks += 1
+                base_dmg += edmg[i]
+                ehp[i] = 0
+                continue
+            tx, ty = path[k]
+            dx, dy = tx - ex[i], ty - ey[i]
+            d = math.hypot(dx, dy)
+            if d < REACH_DIST:
+                eidx[i] = k + 1
+            else:
+                step = espd[i] * dt / d
+                ex[i] += dx * step
+                ey[i] += dy * step
+            still.append(i)
+        alive = still
+
+        # Targeting + firing (ArcherTower/GroundArcher._process)
+        for j in range(n_towers):
+            timers[j] -= dt
+            if timers[j] > 0 or not alive:
+                continue
+            tx, ty, best_d = T["x"][j], T["y"][j], T["range2"][j]
+            best = -1
+            for i in alive:
+                dx, dy = ex[i] - tx, ey[i] - ty
+                d2 = dx*dx + dy*dy
+                if d2 < best_d:
+                    best_d, best = d2, i
+            if best >= 0:
+                px.append(tx)
+                py.append(ty + T["muzzle"][j])
+                psx.append(tx)
+                psy.append(ty + T["muzzle"][j])
+                ptgt.append(best)
+                plx.append(ex[best])
+                ply.append(ey[best])
+                pspd.append(T["pspeed"][j])
+                pdmg.append(T["damage"][j])
+                timers[j] = 1.0 / T["rate"][j]
+
+        # Projectiles (Projectile._process)
+        keep = []
+        for p in range(len(px)):
+            i = ptgt[p]
+            if ehp[i] > 0:
+                plx[p], ply[p] = ex[i], ey[i]
+            dx, dy = plx[p] - px[p], ply[p] - py[p]
+            d = math.hypot(dx, dy)
+            if d < HIT_DIST:
+                if ehp[i] > 0:
+                    ehp[i] -= pdmg[p]
+                    if ehp[i] <= 0:
+                        kills += 1
+                        gold += egold[i]
+                continue
+            step = pspd[p] * dt / d
+            px[p] += dx * step
+            py[p] += dy * step
+            if math.hypot(px[p] - psx[p], py[p] - psy[p]) > MAX_FLIGHT:
+                continue
+            keep.append(p)
+        if len(keep) != len(px):
+            cols = (px, py, psx, psy, ptgt, plx, ply, pspd, pdmg)
+            px, py, psx, psy, ptgt, plx, ply, pspd, pdmg = ([c[p] for p in keep] for c in cols)
+        alive = [i for i in alive if ehp[i] > 0]
+    return kills, leaks, base_dmg, gold, t
+
+# ── One game ──
+
+def simulate_game(job):
+    """Play `waves` waves on one layout. job = (layout, waves, seed, dt)."""
+    layout, waves, seed, dt = job
+    C = load_constants()
+    rng = random.Random(seed)
+    paths = build_paths(C, layout)
+    T = build_towers(C, layout)
+    plan_gold = int(C["GOLD_PER_SECOND"] * C["PLAN_PHASE_DURATION"])
+    gold = C["STARTING_GOLD"]
+    base_hp = C["BASE_MAX_HP"]
+    result = {"waves": [], "survived": 0}
+    for wave in range(1, waves + 1):
+        gold += plan_gold
+        if wave == 1:
+            gold -= layout_cost(layout, C)  # built during the first plan phase
+        kills, leaks, dmg, kill_gold, secs = run_wave(C, wave, paths, T, rng, dt)
+        base_hp -= dmg
+        gold += kill_gold
+        if base_hp > 0:
+            gold += 50 + wave * 20
+        result["waves"].append({"wave": wave, "kills": kills, "leaks": leaks,
+                                "base_hp": max(base_hp, 0), "gold": gold, "seconds": round(secs, 2)})
+        if base_hp <= 0:
+            break
+        result["survived"] = wave
+    return result
+
+# ── Batch + report ──
+
+def summarize(layout, games, waves):
+    per_wave = []
+    for w in range(waves):
+        rows = [g["waves"][w] for g in games if len(g["waves"]) > w]
+        if not rows:
+            break
+        n = len(rows)
+        per_wave.append({
+            "wave": w + 1,
+            "reached": n / len(games),
+            "leaks": sum(r["leaks"] for r in rows) / n,
+            "base_hp": sum(r["base_hp"] for r in rows) / n,
+            "gold": sum(r["gold"] for r in rows) / n,
+        })
+    wins = sum(1 for g in games if g["survived"] >= waves)
+    return {"layout": layout["name"], "cost": layout_cost(layout), "games": len(games),
+            "win_rate": wins / len(games), "per_wave": per_wave}
+
+def print_report(summary):
+    print(f"\n[{summary['layout']}] cost {summary['cost']}g — "
+          f"survived all waves in {summary['win_rate']*100:.1f}% of {summary['games']} games")
+    print("  wave  reached  leaks  base_hp    gold")
+    for r in summary["per_wave"]:
+        print(f"  {r['wave']:>4}  {r['reached']*100:6.1f}%  {r['leaks']:5.2f}  {r['base_hp']:7.2f}  {r['gold']:6.0f}")
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("layouts", nargs="+", help="layout JSON files (see board_layout.py)")
+    ap.add_argument("--games", type=int, default=200, help="games per layout")
+    ap.add_argument("--waves", type=int, default=load_constants()["FINAL_WAVE"])
+    ap.add_argument("--workers", type=int, default=os.cpu_count())
+    ap.add_argument("--dt", type=float, default=1/30, help="fixed timestep in seconds")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--json", help="write summaries to this file")
+    args = ap.parse_args(argv)
+
+    layouts = [load_layout(p) for p in args.layouts]
+    jobs = [(lay, args.waves, args.seed * 100003 + g, args.dt)
+            for lay in layouts for g in range(args.games)]
+    t0 = time.perf_counter()
+    with Pool(args.workers) as pool:
+        results = pool.map(simulate_game, jobs, chunksize=max(1, len(jobs) // (args.workers * 8)))
+    elapsed = time.perf_counter() - t0
+
+    summaries = []
+    for li, lay in enumerate(layouts):
+        games = results[li * args.games:(li + 1) * args.games]
+        summaries.append(summarize(lay, games, args.waves))
+        print_report(summaries[-1])
+    print(f"\n{len(jobs)} games in {elapsed:.1f}s ({len(jobs) / elapsed * 60:.0f} games/min, "
+          f"{args.workers} workers)")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(summaries, f, indent=2)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,217 @@
+"""Spatial-hash tower targeting: a reference for replacing the O(towers x
+enemies) scans in ArcherTower / GroundArcher._find_closest_enemy().
+Enemies live in a uniform grid of world-space buckets, one per
+TILE_WIDTH x TILE_HEIGHT rectangle by default (--cell scales it). An
+enemy is moved to another bucket only when it crosses a cell edge, so the
+per-frame update is one key computation per enemy.
+
+Towers don't move. Each one precomputes the cells its range circle
+touches, sorted by their nearest point to the tower, with range =
+stats["range"] * UPGRADE_RANGE_MULT[level - 1] as in _apply_level_stats().
+A nearest query walks those cells in order and stops once a cell cannot
+hold anything closer. Results match the scan exactly: strictly inside
+range, and on a tie the earliest enemy in get_enemies() order wins.
+Uses only Python built-ins.
+
+Run: python spatial_hash.py [--towers 100] [--enemies 2000] [--frames 20] [--cell 1]
+"""
+import argparse, math, random, sys, time
+
+from gd_constants import grid_to_world, load_constants
+
+TOWER_STATS = {"ARCHER_TOWER": "ARCHER_TOWER_STATS", "GROUND_ARCHER": "GROUND_ARCHER_STATS"}
+
+class SpatialHash:
+    """Points bucketed by (x // cell_w, y // cell_h), with incremental moves."""
+
+    def __init__(self, cell_w, cell_h):
+        self.cw, self.ch = cell_w, cell_h
+        self.buckets = {}
+        self.pos = {}   # id -> (x, y)
+        self.key = {}   # id -> bucket key
+
+    def _key(self, x, y):
+        return (math.floor(x / self.cw), math.floor(y / self.ch))
+
+    def insert(self, i, x, y):
+        k = self._key(x, y)
+        self.buckets.setdefault(k, set()).add(i)
+        self.pos[i], self.key[i] = (x, y), k
+
+    def remove(self, i):
+        k = self.key.pop(i)
+        del self.pos[i]
+        b = self.buckets[k]
+        b.discard(i)
+        if not b:
+            del self.buckets[k]
+
+    def move(self, i, x, y):
+        """Update a position; True when the point changed bucket."""
+        self.pos[i] = (x, y)
+        k = self._key(x, y)
+        old = self.key[i]
+        if k == old:
+            return False
+        b = self.buckets[old]
+        b.discard(i)
+        if not b:
+            del self.buckets[old]
+        self.buckets.setdefault(k, set()).add(i)
+        self.key[i] = k
+        return True
+
+    def cells_in_circle(self, x, y, r):
+        """[(min squared distance, key)] for cells touching the circle, nearest first."""
+        out = []
+        r2 = r * r
+        for kx in range(math.floor((x - r) / self.cw), math.floor((x + r) / self.cw) + 1):
+            x0 = kx * self.cw
+            dx = max(x0 - x, 0.0, x - (x0 + self.cw))
+            for ky in range(math.floor((y - r) / self.ch), math.floor((y + r) / self.ch) + 1):
+                y0 = ky * self.ch
+                dy = max(y0 - y, 0.0, y - (y0 + self.ch))
+                d2 = dx * dx + dy * dy
+                if d2 < r2:
+                    out.append((d2, (kx, ky)))
+        out.sort()
+        return out
+
+    def nearest(self, x, y, r, cells=None):
+        """(id, squared distance) of the nearest point strictly within r, or None."""
+        best, best_i = r * r, None
+        buckets, pos = self.buckets, self.pos
+        for d2min, k in cells if cells is not None else self.cells_in_circle(x, y, r):
+            if d2min > best:
+                break
+            b = buckets.get(k)
+            if not b:
+                continue
+            for i in b:
+                px, py = pos[i]
+                d2 = (px - x) ** 2 + (py - y) ** 2
+                if d2 < best or (d2 == best and best_i is not None and i < best_i):
+                    best, best_i = d2, i
+        return None if best_i is None else (best_i, best)
+
+    def in_range(self, x, y, r, cells=None):
+        """Ids strictly within r (unordered)."""
+        r2 = r * r
+        out = []
+        for _, k in cells if cells is not None else self.cells_in_circle(x, y, r):
+            for i in self.buckets.get(k, ()):
+                px, py = self.pos[i]
+                if (px - x) ** 2 + (py - y) ** 2 < r2:
+                    out.append(i)
+        return out
+
+# ── Towers ──
+
+class Targeting:
+    """Towers over a SpatialHash of enemies; each tower keeps its cell list."""
+
+    def __init__(self, C, cell=1.0):
+        self.C = C
+        self.enemies = SpatialHash(C["TILE_WIDTH"] * cell, C["TILE_HEIGHT"] * cell)
+        self.towers = []
+
+    def tower_range(self, kind, level):
+        return self.C[TOWER_STATS[kind]]["range"] * self.C["UPGRADE_RANGE_MULT"][level - 1]
+
+    def add_tower(self, kind, gx, gy, level=1):
+        x, y = grid_to_world(self.C, gx, gy)
+        t = {"kind": kind, "x": x, "y": y}
+        self.towers.append(t)
+        self.set_level(len(self.towers) - 1, level)
+        return len(self.towers) - 1
+
+    def set_level(self, tid, level):
+        """Upgrade: new range, new cell list."""
+        t = self.towers[tid]
+        t["level"], t["range"] = level, self.tower_range(t["kind"], level)
+        t["cells"] = self.enemies.cells_in_circle(t["x"], t["y"], t["range"])
+
+    def nearest(self, tid):
+        t = self.towers[tid]
+        hit = self.enemies.nearest(t["x"], t["y"], t["range"], t["cells"])
+        return hit and hit[0]
+
+    def in_range(self, tid):
+        t = self.towers[tid]
+        return self.enemies.in_range(t["x"], t["y"], t["range"], t["cells"])
+
+# ── Benchmark ──
+
+def scan_nearest(tx, ty, rng, order, pos):
+    """_find_closest_enemy(): every enemy, strict d < range, first wins ties."""
+    best, best_i = rng, None
+    for i in order:
+        px, py = pos[i]
+        d = math.sqrt((px - tx) ** 2 + (py - ty) ** 2)
+        if d < best:
+            best, best_i = d, i
+    return best_i
+
+def bench(C, towers, enemies, frames, cell, seed):
+    rng = random.Random(seed)
+    W, H = C["GRID_WIDTH"], C["GRID_HEIGHT"]
+    tg = Targeting(C, cell)
+    tiles = rng.sample([(x, y) for x in range(W) for y in range(H)], min(towers, W * H))
+    for k in range(towers):
+        gx, gy = tiles[k % len(tiles)]
+        tg.add_tower(rng.choice(list(TOWER_STATS)), gx, gy, rng.randint(1, C["MAX_UPGRADE_LEVEL"]))
+    # Enemies wander over the board's world rectangle
+    xs = [grid_to_world(C, 0, H - 1)[0], grid_to_world(C, W - 1, 0)[0]]
+    ys = [grid_to_world(C, 0, 0)[1], grid_to_world(C, W - 1, H - 1)[1]]
+    dt = 1 / 60
+    pos, vel = {}, {}
+    for i in range(enemies):
+        pos[i] = (rng.uniform(*xs), rng.uniform(*ys))
+        a = rng.uniform(0, 2 * math.pi)
+        s = C["ENEMY_BASE_SPEED"] * rng.uniform(0.6, 1.8)
+        vel[i] = (math.cos(a) * s, math.sin(a) * s)
+        tg.enemies.insert(i, *pos[i])
+    order = sorted(pos)
+    t_scan = t_hash = 0.0
+    moved = bad = 0
+    for _ in range(frames):
+        for i in order:
+            (x, y), (vx, vy) = pos[i], vel[i]
+            x, y = x + vx * dt, y + vy * dt
+            if not xs[0] <= x <= xs[1]:
+                vx = -vx
+            if not ys[0] <= y <= ys[1]:
+                vy = -vy
+            pos[i], vel[i] = (x, y), (vx, vy)
+        t0 = time.perf_counter()
+        scan = [scan_nearest(t["x"], t["y"], t["range"], order, pos) for t in tg.towers]
+        t1 = time.perf_counter()
+        for i in order:
+            moved += tg.enemies.move(i, *pos[i])
+        hashed = [tg.nearest(tid) for tid in range(len(tg.towers))]
+        t2 = time.perf_counter()
+        t_scan += t1 - t0
+        t_hash += t2 - t1
+        bad += sum(1 for a, b in zip(scan, hashed) if a != b)
+    cells = sum(len(t["cells"]) for t in tg.towers) / len(tg.towers)
+    return t_scan, t_hash, bad, moved / (frames * enemies), cells
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark spatial-hash targeting against the per-tower scan")
+    ap.add_argument("--towers", type=int, default=100)
+    ap.add_argument("--enemies", type=int, default=2000)
+    ap.add_argument("--frames", type=int, default=20)
+    ap.add_argument("--cell", type=float, default=1.0, help="cell size in tiles")
+    ap.add_argument("--seed", type=int, default=5)
+    args = ap.parse_args(argv)
+    C = load_constants()
+    ts, th, bad, moved, cells = bench(C, args.towers, args.enemies, args.frames, args.cell, args.seed)
+    f = args.frames
+    print(f"{args.towers} towers x {args.enemies} enemies, {f} frames, cell {args.cell:g} tile "
+          f"({cells:.0f} cells per tower, {moved * 100:.1f}% bucket changes per frame)")
+    print(f"  scan: {ts / f * 1e3:8.2f} ms/frame")
+    print(f"  hash: {th / f * 1e3:8.2f} ms/frame (updates + queries)  {ts / max(th, 1e-9):.1f}x, "
+          f"target mismatches: {bad}")
+
+if __name__ == "__main__":
+    sys.exit(main())
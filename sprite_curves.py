@@ -0,0 +1,86 @@
+"""Keyframed animation curves for the sprite generators.
+An animation parameter (a y-offset, an alpha, a radius, a colour) is a
+Curve over normalised time t in [0, 1] that can be sampled at any frame
+count, so the same generator produces 4-, 8- or 12-frame sheets. Keys built
+with Curve.table() sit exactly on the frame times of the original table, so
+sampling at the table's own length returns the table unchanged. Uses only
+Python built-ins.
+
+    bob = Curve.table([0, -1, 0, -1], "step", loop=True)
+    bob.sample(4)   # [0, -1, 0, -1]
+    bob.sample(8)   # [0, 0, -1, -1, 0, 0, -1, -1]
+
+Modes: "step" holds each key until the next, "linear" interpolates, "smooth"
+eases in and out (smoothstep). Values are numbers or tuples (per-component);
+int keys give int samples. Looping curves wrap from the last key back to
+the first at t = 1.
+"""
+
+MODES = ("step", "linear", "smooth")
+
+def frame_time(i, n, loop):
+    """Normalised time of frame i of n. Looping cycles never reach t = 1."""
+    if loop:
+        return i / n
+    return i / (n - 1) if n > 1 else 0.0
+
+class Curve:
+    """Piecewise curve through (t, value) keys."""
+
+    def __init__(self, keys, mode="linear", loop=False):
+        if mode not in MODES:
+            raise ValueError(f"Unknown curve mode: {mode}")
+        if not keys:
+            raise ValueError("Curve needs at least one key")
+        self.keys = sorted(((float(t), v) for t, v in keys), key=lambda k: k[0])
+        self.mode = mode
+        self.loop = loop
+        first = self.keys[0][1]
+        self.is_int = all(isinstance(c, int) for c in (first if isinstance(first, tuple) else (first,)))
+
+    @classmethod
+    def table(cls, values, mode="linear", loop=False):
+        """Curve whose keys are a per-frame table, placed at that table's frame times."""
+        n = len(values)
+        return cls([(frame_time(i, n, loop), v) for i, v in enumerate(values)], mode, loop)
+
+    def _mix(self, a, b, u):
+        if self.mode == "smooth":
+            u = u * u * (3.0 - 2.0 * u)
+        if isinstance(a, tuple):
+            out = tuple(x + (y - x) * u for x, y in zip(a, b))
+            return tuple(round(c) for c in out) if self.is_int else out
+        v = a + (b - a) * u
+        return round(v) if self.is_int else v
+
+    def at(self, t):
+        keys = self.keys
+        if self.loop:
+            t %= 1.0
+        if t <= keys[0][0] and not self.loop:
+            return keys[0][1]
+        for k in range(len(keys)):
+            t0, v0 = keys[k]
+            if k + 1 < len(keys):
+                t1, v1 = keys[k + 1]
+            elif self.loop:
+                t1, v1 = keys[0][0] + 1.0, keys[0][1]
+            else:
+                return v0
+            if t0 <= t < t1:
+                if t == t0 or self.mode == "step":
+                    return v0
+                return self._mix(v0, v1, (t - t0) / (t1 - t0))
+        # Looping and t falls before the first key: wrap from the last one
+        t0, v0 = keys[-1][0] - 1.0, keys[-1][1]
+        if self.mode == "step":
+            return v0
+        return self._mix(v0, keys[0][1], (t - t0) / (keys[0][0] - t0))
+
+    def sample(self, n):
+        return [self.at(frame_time(i, n, self.loop)) for i in range(n)]
+
+def sample_curves(curves, n):
+    """Per-frame parameter dicts for a {name: Curve} table sampled at n frames."""
+    cols = {name: c.sample(n) for name, c in curves.items()}
+    return [{name: col[i] for name, col in cols.items()} for i in range(n)]
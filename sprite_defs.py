@@ -0,0 +1,229 @@
+"""Declarative sprite definitions for Korean Fantasy TD.
+Sprites live as JSON in sprite_defs/ — a palette, a list of primitive
+layers, and optional per-frame override layers for animations. Uses only
+Python built-ins.
+
+A definition is compiled once into flat row spans (y, x0, x1, color): the
+base image as run-length spans with all overdraw already resolved, and each
+frame as the spans where it differs from the base. Compiled output is cached
+in .sprite_cache/defs/ keyed by a hash of the definition, so rendering is
+just slice assignments.
+
+Layer ops (coordinates inclusive, same semantics as generate_sprites_v2):
+    {"op": "rect", "from": [x1,y1], "to": [x2,y2], "color": c}
+    {"op": "circle", "at": [cx,cy], "r": r, "color": c}
+    {"op": "diamond", "at": [cx,cy], "hw": hw, "hh": hh, "color": c}
+    {"op": "diamond_outline", "at": [cx,cy], "hw": hw, "hh": hh, "color": c}
+    {"op": "line", "from": [x0,y0], "to": [x1,y1], "color": c}
+    {"op": "px", "points": [[x,y], ...], "color": c}
+Colors are [r,g,b,a] or a palette name. Any layer may add "blend": true.
+
+Run: python sprite_defs.py [name ...]   (compiles and prints span counts)
+"""
+import hashlib, json, math, os, sys
+
+from asset_writer import write_atomic
+from sprite_curves import Curve
+from sprite_frames import DeltaFrame
+from sprite_postfx import over
+
+DEFS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sprite_defs")
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".sprite_cache", "defs")
+COMPILER_VERSION = 1
+
+T = (0, 0, 0, 0)
+
+_compiled = {}  # in-process memo: name -> compiled dict
+
+# ── Primitive -> spans ──
+
+def _color(c, palette):
+    if isinstance(c, str):
+        if c not in palette:
+            raise ValueError(f"Unknown palette color: {c}")
+        c = palette[c]
+    return tuple(c)
+
+def _bresenham(x0, y0, x1, y1):
+    dx = abs(x1 - x0)
+    dy = abs(y1 - y0)
+    sx = 1 if x0 < x1 else -1
+    sy = 1 if y0 < y1 else -1
+    err = dx - dy
+    while True:
+        yield x0, y0
+        if x0 == x1 and y0 == y1:
+            break
+        e2 = 2 * err
+        if e2 > -dy:
+            err -= dy
+            x0 += sx
+        if e2 < dx:
+            err += dx
+            y0 += sy
+
+def layer_spans(layer):
+    """Yield raw (y, x0, x1) spans for one layer, before clipping."""
+    op = layer["op"]
+    if op == "rect":
+        (x1, y1), (x2, y2) = layer["from"], layer["to"]
+        for y in range(y1, y2+1):
+            yield y, x1, x2
+    elif op == "circle":
+        (cx, cy), r = layer["at"], layer["r"]
+        for y in range(cy-r, cy+r+1):
+            k = math.isqrt(r*r - (y-cy)**2)
+            yield y, cx-k, cx+k
+    elif op in ("diamond", "diamond_outline"):
+        (cx, cy), hw, hh = layer["at"], layer["hw"], layer["hh"]
+        for y in range(cy-hh, cy+hh+1):
+            dy = abs(y - cy)
+            xspan = int(hw * (1.0 - dy / hh)) if hh > 0 else hw
+            if op == "diamond":
+                yield y, cx-xspan, cx+xspan
+            else:
+                yield y, cx-xspan, cx-xspan
+                yield y, cx+xspan, cx+xspan
+        if op == "diamond_outline":
+            for x in range(cx-hw, cx+hw+1):
+                dx = abs(x - cx)
+                yspan = int(hh * (1.0 - dx / hw)) if hw > 0 else hh
+                yield cy-yspan, x, x
+                yield cy+yspan, x, x
+    elif op == "line":
+        (x0, y0), (x1, y1) = layer["from"], layer["to"]
+        for x, y in _bresenham(x0, y0, x1, y1):
+            yield y, x, x
+    elif op == "px":
+        for x, y in layer["points"]:
+            yield y, x, x
+    else:
+        raise ValueError(f"Unknown sprite layer op: {op}")
+
+def _draw_layers(grid, layers, palette):
+    h, w = len(grid), len(grid[0])
+    for layer in layers:
+        color = _color(layer["color"], palette)
+        blend = layer.get("blend", False)
+        for y, x0, x1 in layer_spans(layer):
+            if not 0 <= y < h:
+                continue
+            x0, x1 = max(x0, 0), min(x1, w - 1)
+            if x0 > x1:
+                continue
+            row = grid[y]
+            if blend:
+                for x in range(x0, x1+1):
+                    row[x] = over(row[x], color)
+            else:
+                row[x0:x1+1] = [color] * (x1 - x0 + 1)
+
+def _runs(row, x_from=0, x_to=None, skip=T):
+    """Run-length encode row[x_from:x_to] into (x0, x1, color), dropping `skip`."""
+    out = []
+    x_to = len(row) if x_to is None else x_to
+    x = x_from
+    while x < x_to:
+        c = row[x]
+        x1 = x
+        while x1 + 1 < x_to and row[x1+1] == c:
+            x1 += 1
+        if c != skip:
+            out.append((x, x1, c))
+        x = x1 + 1
+    return out
+
+# ── Compile / cache ──
+
+def def_path(name):
+    return os.path.join(DEFS_DIR, name + ".json")
+
+def compile_def(defn):
+    """Compile a parsed definition into {"size", "base", "frames"} span lists."""
+    w, h = defn["size"]
+    palette = {k: tuple(v) for k, v in defn.get("palette", {}).items()}
+    base = [[T] * w for _ in range(h)]
+    _draw_layers(base, defn.get("layers", []), palette)
+    base_spans = [[y, x0, x1, list(c)] for y, row in enumerate(base) for x0, x1, c in _runs(row)]
+
+    frames = []
+    for frame in defn.get("frames", []):
+        g = [row[:] for row in base]
+        _draw_layers(g, frame.get("layers", []), palette)
+        spans = []
+        for y, (row, brow) in enumerate(zip(g, base)):
+            x = 0
+            while x < w:
+                if row[x] == brow[x]:
+                    x += 1
+                    continue
+                x1 = x
+                while x1 + 1 < w and row[x1+1] != brow[x1+1]:
+                    x1 += 1
+                spans.extend([y, a, b, list(c)] for a, b, c in _runs(row, x, x1+1, skip=None))
+                x = x1 + 1
+        frames.append(spans)
+    return {"size": [w, h], "base": base_spans, "frames": frames}
+
+def load_compiled(name):
+    """Compiled spans for sprite_defs/<name>.json, from memory, disk cache or a fresh compile."""
+    with open(def_path(name), "rb") as f:
+        src = f.read()
+    digest = hashlib.sha256(src + b"|v%d" % COMPILER_VERSION).hexdigest()[:16]
+    hit = _compiled.get(name)
+    if hit and hit["hash"] == digest:
+        return hit
+    cache_file = os.path.join(CACHE_DIR, f"{name}-{digest}.json")
+    if os.path.exists(cache_file):
+        with open(cache_file) as f:
+            compiled = json.load(f)
+    else:
+        compiled = compile_def(json.loads(src))
+        compiled["hash"] = digest
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        # pid-unique temp name: pool workers may compile the same def at once
+        write_atomic(cache_file, json.dumps(compiled, separators=(",", ":")).encode())
+    _compiled[name] = compiled
+    return compiled
+
+# ── Rendering ──
+
+def _replay(grid, spans):
+    for y, x0, x1, c in spans:
+        grid[y][x0:x1+1] = [tuple(c)] * (x1 - x0 + 1)
+
+def render_base(name):
+    """Render the base image of a definition as a fresh pixel grid."""
+    compiled = load_compiled(name)
+    w, h = compiled["size"]
+    grid = [[T] * w for _ in range(h)]
+    _replay(grid, compiled["base"])
+    return grid
+
+def render_frames(name, count=None):
+    """Render every frame as a DeltaFrame over the base (or just the base, if the def has no frames).
+    `count` resamples the animation loop, holding each keyframe (step curve)."""
+    compiled = load_compiled(name)
+    base = render_base(name)
+    if not compiled["frames"]:
+        return [base]
+    order = range(len(compiled["frames"]))
+    if count:
+        order = Curve.table(list(order), "step", loop=True).sample(count)
+    frames = []
+    for i in order:
+        f = DeltaFrame(base)
+        _replay(f, compiled["frames"][i])
+        frames.append(f)
+    return frames
+
+def list_defs():
+    return sorted(f[:-5] for f in os.listdir(DEFS_DIR) if f.endswith(".json"))
+
+if __name__ == "__main__":
+    for name in sys.argv[1:] or list_defs():
+        c = load_compiled(name)
+        n_frames = len(c["frames"])
+        delta = sum(len(s) for s in c["frames"])
+        print(f"  {name}: {c['size'][0]}x{c['size'][1]}, {len(c['base'])} base spans, "
+              f"{n_frames} frames / {delta} delta spans [{c['hash']}]")
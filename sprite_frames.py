@@ -0,0 +1,76 @@
+"""Copy-on-write animation frames for the sprite generators.
+A DeltaFrame shares every row with a base grid and only copies a row the
+first time a drawing helper touches it, so an N-frame animation costs one
+base render plus the rows each frame actually changes. Uses only Python
+built-ins.
+
+    base = _hero_base()
+    f = DeltaFrame(base)
+    set_px(f, 14, 26, HERO_BLUE_DARK)   # copies row 26 only
+    paste(sheet, f, 32, 0)              # row-slice copies into the sheet
+"""
+
+class DeltaFrame:
+    """Pixel grid view over `base`; rows are copied on first access."""
+    __slots__ = ("base", "_rows", "owned")
+
+    def __init__(self, base):
+        self.base = base
+        # Rows are fetched from base only when used, so a lazily decoded
+        # base (sprite_memo.BufferGrid) never decodes rows nobody reads
+        self._rows = [None] * len(base)
+        self.owned = set()
+
+    @property
+    def rows(self):
+        """Every row for reading; unwritten rows are shared with base."""
+        rows = self._rows
+        for y, row in enumerate(rows):
+            if row is None:
+                rows[y] = self.base[y]
+        return rows
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __getitem__(self, y):
+        # Drawing helpers only index a row to write into it, so any access
+        # through the grid interface takes ownership of that row.
+        if y < 0:
+            y += len(self._rows)
+        if y not in self.owned:
+            self._rows[y] = self.base[y][:]
+            self.owned.add(y)
+        return self._rows[y]
+
+    def __iter__(self):
+        for y in range(len(self._rows)):
+            yield self[y]
+
+    def patches(self):
+        """Dirty rectangles (x0, y0, x1, y1), inclusive, where this frame differs from base.
+        Consecutive changed rows with the same x-range are merged."""
+        rects = []
+        for y in sorted(self.owned):
+            row, brow = self._rows[y], self.base[y]
+            xs = [x for x in range(len(row)) if row[x] != brow[x]]
+            if not xs:
+                continue
+            x0, x1 = xs[0], xs[-1]
+            if rects and rects[-1][3] == y - 1 and rects[-1][0] == x0 and rects[-1][2] == x1:
+                rects[-1] = (x0, rects[-1][1], x1, y)
+            else:
+                rects.append((x0, y, x1, y))
+        return rects
+
+    def to_grid(self):
+        return [row[:] for row in self.rows]
+
+def frame_rows(frame):
+    """Rows of a grid or DeltaFrame for reading, without taking copies."""
+    return frame.rows if isinstance(frame, DeltaFrame) else frame
+
+def paste(dest, frame, ox, oy):
+    """Copy frame into dest at (ox, oy) one row slice at a time."""
+    for y, row in enumerate(frame_rows(frame)):
+        dest[oy + y][ox:ox + len(row)] = row
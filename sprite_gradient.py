@@ -0,0 +1,91 @@
+"""Single-pass multi-stop radial gradients for glows and blasts.
+Replaces stacks of shrinking fill_circle calls: every pixel of the disc is
+visited once, its ramp index and rim coverage come from a lookup table
+cached per (radius, sub-pixel centre phase), and its colour from a
+256-entry ramp cached per stop list, so the fill loop does no square roots. The rim gets analytic coverage, so edges are smooth
+at any radius. Uses only Python built-ins.
+
+    radial_gradient(g, 16.5, 16.5, 8, [(0.0, (255, 255, 200, 255)),
+                                       (0.4, (255, 160, 30, 220)),
+                                       (1.0, (255, 100, 0, 0))])
+
+Coordinates are pixel units with pixel (x, y) covering [x, x+1] x [y, y+1],
+so an integer-centred fill_circle(cx, cy) corresponds to (cx + 0.5, cy + 0.5).
+Modes: "replace" (default) sets the colour, lerping only on the rim, like
+the fill_circle stacks it replaces; "over" alpha-blends.
+"""
+import functools, math
+
+from sprite_postfx import over
+from sprite_vector import _lerp
+
+RAMP_SIZE = 256
+
+@functools.lru_cache(maxsize=256)
+def disc_lut(r, fx, fy):
+    """(x0, y0, rows): (ramp index, rim coverage) for each pixel centre in
+    the box that can reach radius r around a centre at sub-pixel phase
+    (fx, fy). Offsets x0, y0 are relative to the centre's pixel; None marks
+    pixels past the rim."""
+    reach = math.ceil(r + 1)
+    lim = (r + 0.5) ** 2
+    scale = (RAMP_SIZE - 1) / r
+    rows = []
+    for dy in range(-reach, reach + 1):
+        ey = (dy + 0.5 - fy) ** 2
+        row = []
+        for dx in range(-reach, reach + 1):
+            d2 = (dx + 0.5 - fx) ** 2 + ey
+            if d2 > lim:
+                row.append(None)
+            else:
+                d = math.sqrt(d2)
+                row.append((min(RAMP_SIZE - 1, int(d * scale)), r - d + 0.5))
+        rows.append(tuple(row))
+    return -reach, -reach, rows
+
+@functools.lru_cache(maxsize=64)
+def ramp(stops):
+    """RAMP_SIZE colours linearly interpolated between (t, rgba) stops, t in 0..1."""
+    stops = sorted(stops)
+    out = []
+    for i in range(RAMP_SIZE):
+        t = i / (RAMP_SIZE - 1)
+        k = 0
+        while k < len(stops) - 1 and stops[k + 1][0] < t:
+            k += 1
+        (t0, c0), (t1, c1) = stops[k], stops[min(k + 1, len(stops) - 1)]
+        u = 0.0 if t1 <= t0 else min(1.0, max(0.0, (t - t0) / (t1 - t0)))
+        out.append(tuple(int(a + (b - a) * u + 0.5) for a, b in zip(c0, c1)))
+    return tuple(out)
+
+def radial_gradient(grid, cx, cy, r, stops, mode="replace"):
+    """Fill the disc of radius r around (cx, cy) with the gradient; t = distance / r."""
+    if r <= 0:
+        return
+    table = ramp(tuple((t, tuple(c)) for t, c in stops))
+    ix, iy = math.floor(cx), math.floor(cy)
+    x0, y0, rows = disc_lut(r, round(cx - ix, 4), round(cy - iy, 4))
+    h = len(grid)
+    w = len(grid[0]) if h else 0
+    for j, lut in enumerate(rows):
+        y = iy + y0 + j
+        if not 0 <= y < h:
+            continue
+        row = grid[y]
+        for i, px in enumerate(lut):
+            if px is None:
+                continue
+            x = ix + x0 + i
+            if not 0 <= x < w:
+                continue
+            k, cov = px
+            c = table[k]
+            if mode == "over":
+                a = int(c[3] * min(cov, 1.0) + 0.5)
+                if a:
+                    row[x] = over(row[x], (c[0], c[1], c[2], a))
+            elif cov >= 1.0:
+                row[x] = c
+            else:
+                row[x] = _lerp(row[x], c, cov)
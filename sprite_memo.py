@@ -0,0 +1,241 @@
+"""Persistent on-disk memoisation for sprite generator functions.
+@disk_memo caches what a generator returns — one grid, or a list of frames
+— as raw RGBA in .sprite_cache/memo/, so warm runs skip rasterising.
+Uses only Python built-ins.
+
+The key hashes the function's code (bytecode and constants, so moving it
+in the file does not invalidate it) together with everything it reaches
+by name: helpers in this project (followed recursively, classes
+included), module-level constants such as palettes and curve tables, the
+call arguments and, for rng=True, the state of the global `random`
+generator.
+Editing a helper therefore invalidates every cached result that used it.
+An rng=True function also stores the generator state after the call, and
+a hit restores it, so later generators draw exactly the same numbers.
+
+On a hit the file is mmapped and each frame comes back as a BufferGrid.
+Rows are decoded from the mapped buffer the first time they are indexed,
+and nothing is copied before that. The cache is size-bounded: entries are
+touched on every hit, and the oldest are evicted once the directory
+exceeds MAX_BYTES. The directory may be shared by several processes, so
+entries that vanish mid-scan are skipped. Empty results are not cached.
+
+    @functools.lru_cache(maxsize=None)   # in-process
+    @disk_memo                            # across runs
+    def _hero_base(): ...
+
+    @disk_memo(rng=True)                  # draws from the seeded RNG
+    def gen_tile_grass_1(): ...
+"""
+import functools, hashlib, itertools, json, mmap, os, random, struct, sys, types
+
+from asset_writer import write_atomic
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+MEMO_DIR = os.path.join(ROOT, ".sprite_cache", "memo")
+MAX_BYTES = 32 << 20
+MAGIC = b"SPM1"
+HEADER = struct.Struct(">4sBIIII")  # magic, multi, frames, w, h, rng-state bytes
+ENABLED = os.environ.get("SPRITE_MEMO", "1") != "0"
+
+# ── Keys ──
+
+def _is_local(obj):
+    mod = sys.modules.get(getattr(obj, "__module__", None) or "")
+    path = getattr(mod, "__file__", None) or ""
+    return os.path.dirname(os.path.abspath(path)) == ROOT
+
+def _stable(v, seen):
+    """repr-like text for constants that is the same across runs (no addresses)."""
+    if isinstance(v, (int, float, str, bytes, bool, type(None))):
+        return repr(v)
+    if isinstance(v, (tuple, list)):
+        return "[" + ",".join(_stable(x, seen) for x in v) + "]"
+    if isinstance(v, (set, frozenset)):
+        return "{" + ",".join(sorted(_stable(x, seen) for x in v)) + "}"
+    if isinstance(v, dict):
+        return "{" + ",".join(f"{_stable(k, seen)}:{_stable(x, seen)}" for k, x in sorted(v.items(), key=repr)) + "}"
+    if isinstance(v, (types.FunctionType, type)) or hasattr(v, "__wrapped__"):
+        return _source(v, seen)
+    if isinstance(v, types.ModuleType):
+        return v.__name__
+    fields = getattr(v, "__dict__", None)
+    if fields is None:
+        fields = {s: getattr(v, s) for s in getattr(type(v), "__slots__", ()) if hasattr(v, s)}
+    return type(v).__name__ + _stable(fields, seen) + _source(type(v), seen)
+
+def _names(code):
+    names = set(code.co_names)
+    for c in code.co_consts:
+        if isinstance(c, types.CodeType):
+            names |= _names(c)
+    return names
+
+def _code_text(code):
+    """Bytecode, constants and names of a code object (line numbers left out)."""
+    consts = []
+    for c in code.co_consts:
+        if isinstance(c, types.CodeType):
+            consts.append(_code_text(c))
+        elif isinstance(c, frozenset):
+            consts.append(repr(sorted(map(repr, c))))
+        else:
+            consts.append(repr(c))
+    return repr((code.co_code, consts, code.co_names, code.co_varnames))
+
+def _source(obj, seen):
+    """Code of a local function/class plus everything it references by name."""
+    while hasattr(obj, "__wrapped__"):
+        obj = obj.__wrapped__
+    if not _is_local(obj):
+        return getattr(obj, "__qualname__", type(obj).__name__)
+    qual = f"{obj.__module__}.{obj.__qualname__}"
+    if qual in seen:
+        return qual
+    seen.add(qual)
+    if isinstance(obj, type):
+        funcs = [f for f in vars(obj).values() if isinstance(f, types.FunctionType)]
+        scope = sys.modules[obj.__module__].__dict__
+    else:
+        funcs, scope = [obj], obj.__globals__
+    parts = [qual] + [_code_text(f.__code__) + _stable(f.__defaults__, seen) for f in funcs]
+    for name in sorted(set().union(*(_names(f.__code__) for f in funcs))):
+        if name in scope:
+            parts.append(f"{name}={_stable(scope[name], seen)}")
+    return "\n".join(parts)
+
+@functools.lru_cache(maxsize=None)
+def source_hash(fn):
+    """Hash of fn's code closure; computed once per process."""
+    return hashlib.sha256(_source(fn, set()).encode()).hexdigest()
+
+def memo_key(fn, args, kwargs, rng):
+    h = hashlib.sha256(source_hash(fn).encode())
+    h.update(_stable((args, kwargs), set()).encode())  # functions in args hash by code
+    if rng:
+        h.update(repr(random.getstate()).encode())
+    return h.hexdigest()[:20]
+
+# ── Storage ──
+
+class BufferGrid:
+    """Read-mostly pixel grid over a w*h*4 RGBA buffer. A row is decoded to a
+    list of tuples on first access and kept, so drawing into it works."""
+    __slots__ = ("width", "height", "_buf", "_rows")
+
+    def __init__(self, buf, width, height):
+        self.width, self.height = width, height
+        self._buf = buf
+        self._rows = [None] * height
+
+    def __len__(self):
+        return self.height
+
+    def __getitem__(self, y):
+        if y < 0:
+            y += self.height
+        row = self._rows[y]
+        if row is None:
+            row = self._rows[y] = list(struct.iter_unpack(
+                "4B", self._buf[y * self.width * 4:(y + 1) * self.width * 4]))
+        return row
+
+    def __iter__(self):
+        for y in range(self.height):
+            yield self[y]
+
+def _encode(result, state):
+    from sprite_frames import frame_rows
+    multi = isinstance(result, list) and bool(result) and not isinstance(frame_rows(result[0])[0], tuple)
+    frames = list(result) if multi else [result]
+    rows0 = frame_rows(frames[0])
+    h, w = len(rows0), len(rows0[0])
+    st = json.dumps(state).encode() if state is not None else b""
+    body = bytearray(HEADER.pack(MAGIC, multi, len(frames), w, h, len(st)))
+    body += st
+    for f in frames:
+        for row in frame_rows(f):
+            body += bytes(itertools.chain.from_iterable(row))
+    return bytes(body)
+
+def _decode(path):
+    with open(path, "rb") as f:
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, multi, count, w, h, slen = HEADER.unpack_from(buf)
+    if magic != MAGIC:
+        raise ValueError(f"{path}: not a memo file")
+    off = HEADER.size
+    state = json.loads(bytes(buf[off:off + slen])) if slen else None
+    off += slen
+    view = memoryview(buf)
+    size = w * h * 4
+    frames = [BufferGrid(view[off + i * size:off + (i + 1) * size], w, h) for i in range(count)]
+    return (frames if multi else frames[0]), state
+
+def _set_state(state):
+    version, internal, gauss = state
+    random.setstate((version, tuple(internal), gauss))
+
+def evict(cache_dir=MEMO_DIR, max_bytes=MAX_BYTES):
+    """Delete least recently used entries until the directory fits in max_bytes."""
+    try:
+        entries = [os.path.join(cache_dir, n) for n in os.listdir(cache_dir) if n.endswith(".rgba")]
+    except FileNotFoundError:
+        return 0
+    stats = []
+    for p in entries:
+        try:
+            stats.append((os.stat(p), p))
+        except (FileNotFoundError, PermissionError):
+            continue  # another process evicted or is replacing it
+    stats.sort(key=lambda e: e[0].st_mtime)
+    total = sum(st.st_size for st, _ in stats)
+    removed = 0
+    for st, p in stats:
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(p)
+        except (FileNotFoundError, PermissionError):
+            continue
+        total -= st.st_size
+        removed += 1
+    return removed
+
+def disk_memo(fn=None, *, rng=False, cache_dir=MEMO_DIR, max_bytes=MAX_BYTES):
+    """Decorator: cache a grid / frame-list returning function on disk (see module doc)."""
+    if fn is None:
+        return functools.partial(disk_memo, rng=rng, cache_dir=cache_dir, max_bytes=max_bytes)
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if not ENABLED:
+            return fn(*args, **kwargs)
+        key = memo_key(fn, args, kwargs, rng)
+        path = os.path.join(cache_dir, f"{fn.__name__}-{key}.rgba")
+        if os.path.exists(path):
+            try:
+                result, state = _decode(path)
+            except (OSError, ValueError, struct.error):
+                try:
+                    os.remove(path)
+                except (FileNotFoundError, PermissionError):
+                    pass
+            else:
+                try:
+                    os.utime(path)  # LRU recency
+                except (FileNotFoundError, PermissionError):
+                    pass  # evicted by another process; the mapping stays valid
+                if rng:
+                    _set_state(state)
+                return result
+        result = fn(*args, **kwargs)
+        if not result:
+            return result  # no frames: nothing worth a file
+        os.makedirs(cache_dir, exist_ok=True)
+        write_atomic(path, _encode(result, random.getstate() if rng else None))
+        evict(cache_dir, max_bytes)
+        return result
+
+    wrapper.uncached = fn
+    return wrapper
@@ -0,0 +1,270 @@
+"""Post-process kernels for generated sprites — outlines, shadows, glows, tile borders.
+Works on the same pixel grids as generate_sprites_v2.py (list of rows of
+(R,G,B,A) tuples) and only uses Python built-ins.
+
+Masks are stored one Python int per row (bit x = pixel x), so dilation and
+erosion are a handful of shifts/ORs per row regardless of sprite width.
+Blurs are separable running-sum box filters, O(w*h) whatever the radius.
+
+Steps are applied declaratively, e.g. in the generator's asset table:
+    "post": [{"op": "outline", "color": (20,20,30,255)},
+             {"op": "drop_shadow", "dx": 1, "dy": 2, "blur": 1}]
+"""
+from sprite_quantize import quantize
+
+# ── Compositing ──
+
+def over(base, overlay):
+    """Alpha-blend overlay onto base (same maths as generate_sprites_v2.blend_px)."""
+    br, bg, bb, ba = base
+    or_, og, ob, oa = overlay
+    if oa == 0:
+        return base
+    if oa == 255 or ba == 0:
+        return overlay
+    af = oa / 255.0
+    bf = (ba / 255.0) * (1 - af)
+    out_a = af + bf
+    r = int((or_ * af + br * bf) / out_a)
+    g = int((og * af + bg * bf) / out_a)
+    b = int((ob * af + bb * bf) / out_a)
+    return (min(r,255), min(g,255), min(b,255), min(int(out_a*255),255))
+
+def composite_under(grid, plane, color):
+    """Draw `color` with per-pixel alpha `plane` (0-255 ints) underneath grid."""
+    cr, cg, cb, ca = color
+    for y, row in enumerate(grid):
+        prow = plane[y]
+        for x, a in enumerate(prow):
+            if a <= 0:
+                continue
+            a = min(255, a * ca // 255)
+            if a:
+                row[x] = over((cr, cg, cb, a), row[x])
+
+# ── Masks (one int per row) ──
+
+def alpha_mask(grid, threshold=1):
+    """Bit-row mask of pixels with alpha >= threshold."""
+    rows = []
+    for row in grid:
+        bits = 0
+        for x, px in enumerate(row):
+            if px[3] >= threshold:
+                bits |= 1 << x
+        rows.append(bits)
+    return rows
+
+def dilate(mask, width, radius=1, diagonal=False):
+    """Grow mask by `radius` px. 4-connected (diamond) unless diagonal=True (square)."""
+    full = (1 << width) - 1
+    h = len(mask)
+    for _ in range(radius):
+        horiz = [(r | (r << 1) | (r >> 1)) & full for r in mask]
+        vsrc = horiz if diagonal else mask
+        out = []
+        for y in range(h):
+            v = horiz[y]
+            if y > 0:
+                v |= vsrc[y-1]
+            if y < h - 1:
+                v |= vsrc[y+1]
+            out.append(v)
+        mask = out
+    return mask
+
+def erode(mask, width, radius=1, diagonal=False):
+    """Shrink mask by `radius` px. Pixels outside the grid count as empty."""
+    h = len(mask)
+    for _ in range(radius):
+        horiz = [r & (r << 1) & (r >> 1) for r in mask]
+        vsrc = horiz if diagonal else mask
+        out = []
+        for y in range(h):
+            v = horiz[y]
+            v &= vsrc[y-1] if y > 0 else 0
+            v &= vsrc[y+1] if y < h - 1 else 0
+            out.append(v)
+        mask = out
+    return mask
+
+def diamond_mask(width, height, cx, cy, hw, hh):
+    """Bit-row mask of the pixels fill_diamond(cx, cy, hw, hh) covers."""
+    full = (1 << width) - 1
+    rows = [0] * height
+    for y in range(max(0, cy - hh), min(height, cy + hh + 1)):
+        xspan = int(hw * (1.0 - abs(y - cy) / hh)) if hh > 0 else hw
+        bits = (1 << (2 * xspan + 1)) - 1
+        x0 = cx - xspan
+        rows[y] = (bits << x0 if x0 >= 0 else bits >> -x0) & full
+    return rows
+
+def diamond_ring(width, height, inset=1):
+    """Bit-row mask of the border outline_diamond draws `inset` px inside a
+    width x height tile: one pixel per row on each side, plus one per column."""
+    cx, cy = width // 2, height // 2
+    hw, hh = cx - inset, cy - inset
+    rows = [0] * height
+
+    def put(x, y):
+        if 0 <= x < width and 0 <= y < height:
+            rows[y] |= 1 << x
+
+    for y in range(cy - hh, cy + hh + 1):
+        xspan = int(hw * (1.0 - abs(y - cy) / hh)) if hh > 0 else hw
+        put(cx - xspan, y)
+        put(cx + xspan, y)
+    for x in range(cx - hw, cx + hw + 1):
+        yspan = int(hh * (1.0 - abs(x - cx) / hw)) if hw > 0 else hh
+        put(x, cy - yspan)
+        put(x, cy + yspan)
+    return rows
+
+def mask_to_plane(mask, width, alpha=255):
+    """Expand a bit-row mask into rows of alpha ints."""
+    plane = []
+    for bits in mask:
+        row = [0] * width
+        x = 0
+        while bits:
+            if bits & 1:
+                row[x] = alpha
+            bits >>= 1
+            x += 1
+        plane.append(row)
+    return plane
+
+def alpha_plane(grid):
+    return [[px[3] for px in row] for row in grid]
+
+def shift_plane(plane, dx, dy):
+    """Offset plane by (dx, dy), filling with 0. Row-slice copies only."""
+    h = len(plane)
+    w = len(plane[0]) if h else 0
+    blank = [0] * w
+    out = []
+    for y in range(h):
+        sy = y - dy
+        if not 0 <= sy < h or abs(dx) >= w:
+            out.append(blank[:])
+        elif dx >= 0:
+            out.append(blank[:dx] + plane[sy][:w-dx])
+        else:
+            out.append(plane[sy][-dx:] + blank[:-dx])
+    return out
+
+# ── Blur ──
+
+def _box_1d(vals, radius):
+    """Running-sum box filter over one row; outside samples count as 0."""
+    n = len(vals)
+    k = 2 * radius + 1
+    out = [0] * n
+    s = sum(vals[:radius])
+    for x in range(n):
+        if x + radius < n:
+            s += vals[x + radius]
+        if x - radius - 1 >= 0:
+            s -= vals[x - radius - 1]
+        out[x] = s // k
+    return out
+
+def box_blur_plane(plane, radius, passes=1):
+    """Separable box blur of a plane of ints (rows, then columns)."""
+    if radius <= 0:
+        return [row[:] for row in plane]
+    for _ in range(passes):
+        plane = [_box_1d(row, radius) for row in plane]
+        cols = [_box_1d(list(col), radius) for col in zip(*plane)]
+        plane = [list(row) for row in zip(*cols)]
+    return plane
+
+def box_blur(grid, radius, passes=1):
+    """Blur RGBA in place (premultiplied, so transparent pixels don't darken edges)."""
+    planes = [[[px[3] * px[c] // 255 for px in row] for row in grid] for c in range(3)]
+    planes.append(alpha_plane(grid))
+    planes = [box_blur_plane(p, radius, passes) for p in planes]
+    pr, pg, pb, pa = planes
+    for y, row in enumerate(grid):
+        for x in range(len(row)):
+            a = pa[y][x]
+            if a <= 0:
+                row[x] = (0, 0, 0, 0)
+            else:
+                row[x] = (min(255, pr[y][x] * 255 // a), min(255, pg[y][x] * 255 // a),
+                          min(255, pb[y][x] * 255 // a), min(255, a))
+
+# ── Effects ──
+
+def outline(grid, color, radius=1, threshold=1, diagonal=False):
+    """Paint `color` in a ring of `radius` px around the sprite silhouette."""
+    w = len(grid[0])
+    mask = alpha_mask(grid, threshold)
+    grown = dilate(mask, w, radius, diagonal)
+    ring = [g & ~m for g, m in zip(grown, mask)]
+    composite_under(grid, mask_to_plane(ring, w), color)
+
+def inner_outline(grid, color, radius=1, threshold=1):
+    """Recolour the outermost `radius` px of the silhouette."""
+    w = len(grid[0])
+    mask = alpha_mask(grid, threshold)
+    edge = [m & ~e for m, e in zip(mask, erode(mask, w, radius))]
+    for y, bits in enumerate(edge):
+        row = grid[y]
+        x = 0
+        while bits:
+            if bits & 1:
+                row[x] = over(row[x], color)
+            bits >>= 1
+            x += 1
+
+def drop_shadow(grid, dx=1, dy=1, blur=1, color=(0,0,0,90), passes=1):
+    """Offset the silhouette, blur it, and composite it underneath."""
+    plane = shift_plane(alpha_plane(grid), dx, dy)
+    plane = box_blur_plane(plane, blur, passes)
+    composite_under(grid, plane, color)
+
+def ground_shadow(grid, cx, cy, hw, hh, color=(0,0,0,60)):
+    """Flat diamond shadow on the ground plane at (cx, cy), composited underneath."""
+    w = len(grid[0])
+    composite_under(grid, mask_to_plane(diamond_mask(w, len(grid), cx, cy, hw, hh), w), color)
+
+def tile_border(grid, color, inset=1):
+    """Paint the tile diamond's border `inset` px inside the edge. Pixels are
+    replaced, not blended, so the border reads the same on every tile."""
+    for y, bits in enumerate(diamond_ring(len(grid[0]), len(grid), inset)):
+        row = grid[y]
+        x = 0
+        while bits:
+            if bits & 1:
+                row[x] = color
+            bits >>= 1
+            x += 1
+
+def glow(grid, radius=2, color=(255,200,80,160), passes=2):
+    """Soft halo around the silhouette (repeated box blur ~ gaussian)."""
+    plane = box_blur_plane(alpha_plane(grid), radius, passes)
+    composite_under(grid, plane, color)
+
+# ── Declarative application ──
+
+POST_OPS = {
+    "outline": outline,
+    "inner_outline": inner_outline,
+    "drop_shadow": drop_shadow,
+    "ground_shadow": ground_shadow,
+    "tile_border": tile_border,
+    "glow": glow,
+    "blur": box_blur,
+    "quantize": quantize,
+}
+
+def apply_post(grid, steps):
+    """Run a list of {"op": name, **kwargs} steps on grid in order. Returns grid."""
+    for step in steps or ():
+        args = dict(step)
+        op = args.pop("op")
+        if op not in POST_OPS:
+            raise ValueError(f"Unknown post-process op: {op}")
+        POST_OPS[op](grid, **args)
+    return grid
@@ -0,0 +1,136 @@
+"""Colour quantisation + ordered dithering for the noise-textured assets.
+The grass/earth/stone tiles and the rock get their texture from random
+per-pixel offsets, which leaves hundreds of unique colours and defeats PNG
+palette-style compression. quantize() reduces a grid to a fixed RGBA
+palette: median cut over the colour histogram, refined by a few weighted
+k-means passes, then each unique colour is mapped once through a lookup
+table. Optional Bayer dithering keeps the noisy look with far fewer
+colours. Uses only Python built-ins.
+
+Runs as a post step, with `colors` as the per-asset quality knob:
+    "post": [{"op": "quantize", "colors": 12, "dither": "bayer4"}]
+"""
+
+# ── Palette ──
+
+def histogram(grid):
+    """{color: count} over visible pixels."""
+    hist = {}
+    for row in grid:
+        for c in row:
+            if c[3]:
+                hist[c] = hist.get(c, 0) + 1
+    return hist
+
+def _split(box):
+    """Split a box of (color, count) at the weighted median of its widest channel."""
+    ch = max(range(4), key=lambda i: max(c[i] for c, _ in box) - min(c[i] for c, _ in box))
+    box.sort(key=lambda e: e[0][ch])
+    half = sum(n for _, n in box) / 2
+    acc = 0
+    for i, (_, n) in enumerate(box):
+        acc += n
+        if acc >= half:
+            cut = min(max(i + 1, 1), len(box) - 1)
+            return box[:cut], box[cut:]
+
+def _mean(entries):
+    total = sum(n for _, n in entries)
+    return tuple(round(sum(c[i] * n for c, n in entries) / total) for i in range(4))
+
+def median_cut(hist, colors):
+    boxes = [list(hist.items())]
+    while len(boxes) < colors:
+        # Widest box (channel range weighted by population) is split next
+        def score(box):
+            if len(box) < 2:
+                return -1
+            spread = max(max(c[i] for c, _ in box) - min(c[i] for c, _ in box) for i in range(4))
+            return spread * sum(n for _, n in box)
+        i = max(range(len(boxes)), key=lambda k: score(boxes[k]))
+        if score(boxes[i]) <= 0:
+            break
+        boxes[i:i+1] = _split(boxes[i])
+    return [_mean(b) for b in boxes]
+
+def _dist2(a, b):
+    return (a[0]-b[0])**2 + (a[1]-b[1])**2 + (a[2]-b[2])**2 + (a[3]-b[3])**2
+
+def nearest(palette, c):
+    return min(palette, key=lambda p: _dist2(p, c))
+
+def kmeans(hist, palette, iters=4):
+    """Weighted Lloyd refinement of a palette over the colour histogram."""
+    for _ in range(iters):
+        groups = {p: [] for p in palette}
+        for c, n in hist.items():
+            groups[nearest(palette, c)].append((c, n))
+        refined = [_mean(g) if g else p for p, g in groups.items()]
+        if refined == palette:
+            break
+        palette = list(dict.fromkeys(refined))
+    return palette
+
+def build_palette(grid, colors=16, iters=4):
+    hist = histogram(grid)
+    if len(hist) <= colors:
+        return list(hist)
+    return kmeans(hist, median_cut(hist, colors), iters)
+
+# ── Dithering ──
+
+def bayer(n):
+    """n x n ordered-dither matrix (n a power of two), values 0..n*n-1."""
+    m = [[0]]
+    while len(m) < n:
+        k = len(m)
+        m = [[4 * m[y % k][x % k] + (0, 2, 3, 1)[(y // k) * 2 + x // k] for x in range(2 * k)]
+             for y in range(2 * k)]
+    return m
+
+DITHERS = {"bayer2": 2, "bayer4": 4, "bayer8": 8}
+
+def palette_spacing(palette):
+    """Median distance from each palette colour to its nearest neighbour (RGB)."""
+    if len(palette) < 2:
+        return 0.0
+    d = sorted(min(sum((a[i]-b[i])**2 for i in range(3)) for b in palette if b is not a) ** 0.5
+               for a in palette)
+    return d[len(d) // 2]
+
+# ── Quantise ──
+
+def quantize(grid, colors=16, dither=None, iters=4, spread=None):
+    """Reduce grid (in place) to at most `colors` RGBA colours; returns the palette.
+    dither: None or "bayer2"/"bayer4"/"bayer8"; spread = dither amplitude in RGB
+    units (default: the palette's typical colour spacing)."""
+    palette = build_palette(grid, colors, iters)
+    if not palette:
+        return palette
+    lut = {}
+    if dither is None:
+        for row in grid:
+            for x, c in enumerate(row):
+                if c[3]:
+                    q = lut.get(c)
+                    if q is None:
+                        q = lut[c] = nearest(palette, c)
+                    row[x] = q
+        return palette
+    n = DITHERS[dither]
+    m = bayer(n)
+    amp = palette_spacing(palette) if spread is None else spread
+    # Per-cell RGB offset in [-amp/2, amp/2)
+    offs = [[round(((v + 0.5) / (n * n) - 0.5) * amp) for v in mrow] for mrow in m]
+    for y, row in enumerate(grid):
+        orow = offs[y % n]
+        for x, c in enumerate(row):
+            if not c[3]:
+                continue
+            o = orow[x % n]
+            key = (c[0] + o, c[1] + o, c[2] + o, c[3])
+            q = lut.get(key)
+            if q is None:
+                q = lut[key] = nearest(palette, key)
+            row[x] = q
+    return palette
@@ -0,0 +1,274 @@
+"""Signed distance fields for overlays and tile outlines.
+highlight.png, spawn_overlay.png, goal_overlay.png and the outline_diamond
+border on every tile are bands at fixed distances from the 64x32 tile
+diamond, as fill_diamond draws it on integer coordinates. One SDF of that
+diamond, sampled bilinearly, redraws any of them crisply at any zoom. The
+glow thickness becomes a distance range, not a pixel count baked into a
+bitmap. At zoom 1 the styles match the bitmaps within CHECK_TOLERANCE,
+apart from the two vertex pixels outline_diamond adds (--check).
+
+Distances come from the exact two-pass Euclidean distance transform of
+Felzenszwalb & Huttenlocher: a 1D lower envelope of parabolas run over
+every column, then over every row, in O(pixels). The mask is
+supersampled, so the edge is placed to 1/ss px before the field is
+sampled down to the output size. Uses only Python built-ins.
+
+Encoding: one byte per texel in R, G and B (A = 255). 128 is the edge,
+higher is inside, and 127 steps cover `spread` tile pixels, so a shader
+recovers d = (v * 255 - 128) / 127 * spread from a sampled value v in 0..1.
+
+Run: python sprite_sdf.py [--size 64x32] [--spread 4] [--out assets/tile_sdf.png]
+     python sprite_sdf.py --check                (styles vs the committed bitmaps)
+     python sprite_sdf.py --from assets/enemy_orc.png --size 32x32 --out orc_sdf.png
+     python sprite_sdf.py --preview sdf_preview/ [--zooms 1,2,4]
+"""
+import argparse, math, os, sys
+
+from asset_writer import write_atomic, write_import
+
+INF = 1e20
+TILE_W, TILE_H = 64, 32
+
+# The bitmaps step their bands one pixel along x; across the 2:1 diamond
+# edge that is 1/sqrt(5) px of true distance
+EDGE_PX = 1 / math.sqrt(5)
+
+# Looks drawn from the SDF: band colour, fill RGBA for the rest of the inside,
+# and (d0, d1, alpha) bands in x-pixels inside the edge. At zoom 1 they
+# redraw the bitmaps in CHECKS (see --check).
+STYLES = {
+    "highlight": ((255, 255, 200), (255, 255, 255, 35), [(0, 1, 200), (1, 2, 120), (2, 3, 60)]),
+    "spawn": ((200, 40, 40), (200, 40, 40, 50), [(2, 4, 100)]),
+    "goal": ((230, 190, 50), (230, 190, 50, 60), [(2, 4, 120)]),
+    "tile_outline": ((40, 55, 30), (0, 0, 0, 0), [(2, 4, 140)]),
+}
+CHECKS = {"highlight": "highlight.png", "spawn": "spawn_overlay.png", "goal": "goal_overlay.png"}
+CHECK_TOLERANCE = 16   # per channel
+CHECK_MAX_OFF = 0.005  # fraction of pixels allowed past the tolerance
+
+# ── Distance transform ──
+
+def edt_1d(f):
+    """Squared distance transform of one sampled function (list of floats)."""
+    n = len(f)
+    v = [0] * n
+    z = [0.0] * (n + 1)
+    z[0], z[1] = -INF, INF
+    k = 0
+    for q in range(1, n):
+        fq = f[q] + q * q
+        while True:
+            p = v[k]
+            s = (fq - f[p] - p * p) / (2 * (q - p))
+            if s > z[k]:
+                break
+            k -= 1
+        k += 1
+        v[k], z[k], z[k + 1] = q, s, INF
+    out = [0.0] * n
+    k = 0
+    for q in range(n):
+        while z[k + 1] < q:
+            k += 1
+        p = v[k]
+        out[q] = (q - p) * (q - p) + f[p]
+    return out
+
+def edt(mask):
+    """Squared distance from every cell to the nearest truthy cell of mask
+    (list of rows): columns first, then rows."""
+    cols = [edt_1d([0.0 if c else INF for c in col]) for col in zip(*mask)]
+    return [edt_1d(list(row)) for row in zip(*cols)]
+
+def signed_distance(mask):
+    """Per-cell distance to the shape edge in cells; positive inside."""
+    outside = edt(mask)
+    inside = edt([[not c for c in row] for row in mask])
+    return [[math.sqrt(di) - 0.5 if m else 0.5 - math.sqrt(do)
+             for m, do, di in zip(mrow, orow, irow)]
+            for mrow, orow, irow in zip(mask, outside, inside)]
+
+# ── Shapes ──
+
+def diamond_mask(w, h, ss=1, pad=0):
+    """Footprint of the tile bitmaps at ss samples per pixel, with pad pixels
+    of margin. fill_diamond covers pixels |x - hw| <= hw * (1 - |y - hh| / hh)
+    on integer coordinates, so as an area its diamond is centred on pixel
+    (hw, hh)'s centre and reaches half a pixel past those columns."""
+    hw, hh = w // 2, h // 2
+    cx, cy = hw + 0.5, hh + 0.5
+    ax = hw + 0.5
+    ay = ax * hh / hw
+    return [[abs((i + 0.5) / ss - pad - cx) / ax + abs((j + 0.5) / ss - pad - cy) / ay <= 1.0
+             for i in range((w + 2 * pad) * ss)] for j in range((h + 2 * pad) * ss)]
+
+def png_mask(path, threshold=128):
+    from texture_budget import read_png
+    w, h, rgba = read_png(path)
+    return [[rgba[(y * w + x) * 4 + 3] >= threshold for x in range(w)] for y in range(h)]
+
+def upsample(mask, ss, pad=0):
+    """Mask at ss x resolution with pad empty pixels around it."""
+    w = len(mask[0]) + 2 * pad
+    rows = [[False] * w] * pad + [[False] * pad + list(row) + [False] * pad for row in mask] + [[False] * w] * pad
+    return [[c for c in row for _ in range(ss)] for row in rows for _ in range(ss)]
+
+def sdf(mask, ss, out_w, out_h, pad=0):
+    """Distances in shape pixels (positive inside) at out_w x out_h texel
+    centres; mask is at ss x the shape's pixel resolution, with pad pixels
+    of margin so shapes touching the border still get true distances."""
+    d = signed_distance(mask)
+    off = pad * ss
+    mh, mw = len(mask), len(mask[0])
+    sx, sy = (mw - 2 * off) / out_w, (mh - 2 * off) / out_h
+    # Texel centres fall on sub-cell corners: average the four cells around them
+    out = []
+    for j in range(out_h):
+        y1 = min(mh - 1, off + int((j + 0.5) * sy))
+        y0 = max(0, y1 - 1)
+        row = []
+        for i in range(out_w):
+            x1 = min(mw - 1, off + int((i + 0.5) * sx))
+            x0 = max(0, x1 - 1)
+            row.append((d[y0][x0] + d[y0][x1] + d[y1][x0] + d[y1][x1]) / (4 * ss))
+        out.append(row)
+    return out
+
+def encode(dist, spread):
+    """Byte rows (RGBA, value in RGB) for distances in shape pixels."""
+    rows = []
+    for drow in dist:
+        b = bytearray()
+        for d in drow:
+            v = max(0, min(255, round(128 + d * 127 / spread)))
+            b += bytes((v, v, v, 255))
+        rows.append(bytes(b))
+    return rows
+
+def decode(rows, spread):
+    """Encoded byte rows -> distances (inverse of encode, to 1/127 spread)."""
+    return [[(row[i] - 128) * spread / 127 for i in range(0, len(row), 4)] for row in rows]
+
+# ── Drawing from an SDF ──
+
+def sample(dist, u, v):
+    """Bilinear distance at texel coords (u, v), texel centres at +0.5."""
+    h, w = len(dist), len(dist[0])
+    x, y = min(max(u - 0.5, 0.0), w - 1.0), min(max(v - 0.5, 0.0), h - 1.0)
+    x0, y0 = int(x), int(y)
+    x1, y1 = min(x0 + 1, w - 1), min(y0 + 1, h - 1)
+    fx, fy = x - x0, y - y0
+    top = dist[y0][x0] + (dist[y0][x1] - dist[y0][x0]) * fx
+    bot = dist[y1][x0] + (dist[y1][x1] - dist[y1][x0]) * fx
+    return top + (bot - top) * fy
+
+def _band(d, d0, d1, aa):
+    """Coverage of [d0, d1) at distance d with an aa-wide soft edge."""
+    lo = min(1.0, max(0.0, (d - d0) / aa + 0.5))
+    hi = min(1.0, max(0.0, (d1 - d) / aa + 0.5))
+    return lo * hi
+
+def shade(dist, style, width, height, zoom=1):
+    """Pixel grid of a STYLES look drawn at zoom x (width x height) shape
+    pixels; dist holds distances in shape pixels, at any texel resolution."""
+    color, fill, bands = STYLES[style]
+    h, w = len(dist), len(dist[0])
+    su, sv = w / (width * zoom), h / (height * zoom)
+    # Soft edges are half an output pixel's step across the edge wide, under
+    # half of any band, so bands don't smear and a pixel centred in one gets all of it
+    aa = EDGE_PX / (2 * zoom)
+    bands = [(d0 * EDGE_PX, d1 * EDGE_PX, al) for d0, d1, al in bands]
+    grid = []
+    for y in range(height * zoom):
+        row = []
+        for x in range(width * zoom):
+            d = sample(dist, (x + 0.5) * su, (y + 0.5) * sv)
+            cover = [_band(d, d0, d1, aa) for d0, d1, _ in bands]
+            band_a = sum(al * c for (_, _, al), c in zip(bands, cover))
+            fill_a = fill[3] * max(0.0, _band(d, 0.0, INF, aa) - sum(cover))
+            a = band_a + fill_a
+            rgb = color if band_a >= fill_a else fill[:3]
+            row.append(rgb + (min(255, round(a)),) if a >= 0.5 else (0, 0, 0, 0))
+        grid.append(row)
+    return grid
+
+def check(dist, assets="assets"):
+    """[(style, file, pixels off, total)] comparing shade(zoom=1) with the
+    bitmaps the styles replace: alpha, and colour where both are visible,
+    must agree within CHECK_TOLERANCE."""
+    from texture_budget import read_png
+    out = []
+    for style, name in CHECKS.items():
+        w, h, rgba = read_png(os.path.join(assets, name))
+        g = shade(dist, style, w, h)
+        off = 0
+        for y in range(h):
+            for x in range(w):
+                ref = rgba[(y * w + x) * 4:(y * w + x) * 4 + 4]
+                px = g[y][x]
+                if ref[3] == 0 and px[3] == 0:
+                    continue
+                diff = abs(px[3] - ref[3])
+                if min(px[3], ref[3]) > CHECK_TOLERANCE:
+                    diff = max(diff, max(abs(a - b) for a, b in zip(px[:3], ref[:3])))
+                off += diff > CHECK_TOLERANCE
+        out.append((style, name, off, w * h))
+    return out
+
+# ── CLI ──
+
+def check_file(path, spread):
+    """Print check() for an encoded tile SDF; exit status 1 if a style is off."""
+    from texture_budget import read_png
+    w, h, rgba = read_png(path)
+    rows = [rgba[y * w * 4:(y + 1) * w * 4] for y in range(h)]
+    bad = 0
+    for style, name, off, total in check(decode(rows, spread)):
+        ok = off <= total * CHECK_MAX_OFF
+        bad += not ok
+        print(f"  {style:<10} vs {name:<18} {off:>4} of {total} pixels off  {'ok' if ok else 'FAIL'}")
+    return 1 if bad else 0
+
+def tile_sdf(out_w=64, out_h=32, ss=8, pad=2):
+    """Tile diamond distances in tile pixels at out_w x out_h texels."""
+    return sdf(diamond_mask(TILE_W, TILE_H, ss, pad), ss, out_w, out_h, pad)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Export signed distance field textures")
+    ap.add_argument("--from", dest="src", help="PNG whose alpha is the shape (default: tile diamond)")
+    ap.add_argument("--size", default="64x32", help="SDF texture size WxH")
+    ap.add_argument("--spread", type=float, default=4.0, help="shape pixels covered by 127 steps")
+    ap.add_argument("--ss", type=int, default=8, help="mask supersampling")
+    ap.add_argument("--out", default=os.path.join("assets", "tile_sdf.png"))
+    ap.add_argument("--preview", help="directory for STYLES drawn from the SDF at --zooms")
+    ap.add_argument("--zooms", default="1,2,4")
+    ap.add_argument("--check", action="store_true",
+                    help="only compare --out's styles at zoom 1 with the bitmaps in CHECKS")
+    args = ap.parse_args(argv)
+    if args.check:
+        return check_file(args.out, args.spread)
+    from generate_sprites_v2 import encode_png
+    out_w, out_h = (int(v) for v in args.size.lower().split("x"))
+    if args.src:
+        mask = png_mask(args.src)
+        src_w, src_h = len(mask[0]), len(mask)
+        dist = sdf(upsample(mask, args.ss, 2), args.ss, out_w, out_h, 2)
+    else:
+        src_w, src_h = TILE_W, TILE_H
+        dist = tile_sdf(out_w, out_h, args.ss)
+    rows = encode(dist, args.spread)
+    write_atomic(args.out, encode_png(out_w, out_h, rows))
+    write_import(args.out)
+    print(f"Created {args.out} ({out_w}x{out_h}, spread {args.spread:g} px)")
+    if args.preview:
+        os.makedirs(args.preview, exist_ok=True)
+        dist = decode(rows, args.spread)  # what a shader samples
+        for style in STYLES:
+            for z in (int(v) for v in args.zooms.split(",")):
+                g = shade(dist, style, src_w, src_h, z)
+                path = os.path.join(args.preview, f"{style}_x{z}.png")
+                write_atomic(path, encode_png(len(g[0]), len(g), g))
+        print(f"Previews in {args.preview}/")
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+"""Sprite-sheet layouts: strips, rows x columns grids and combined sheets.
+A layout is plain JSON-able metadata — sheet size plus one [x, y, w, h]
+region per frame — so the same dict drives assembly and goes into the
+manifest. Frames are copied into the sheet one row slice at a time
+(sprite_frames.paste), so hundreds of frames assemble in milliseconds.
+Uses only Python built-ins.
+
+    lay = grid_layout(24, 32, 32, cols=8, pot=True)     # 8x3 grid, 256x128
+    sheet = assemble(lay["regions"], frames, lay["width"], lay["height"])
+
+    lay = rows_layout([("hero_walk", 32, 32, 4), ("orc_walk", 32, 32, 8)], pot=True)
+    # one row per animation; lay["animations"]["orc_walk"]["regions"]
+
+Run: python sprite_sheets.py [--frames 512] [--cols 0] [--pot]   (assembly benchmark)
+"""
+import argparse, sys, time
+
+from sprite_frames import paste
+
+T = (0, 0, 0, 0)
+
+def next_pow2(n):
+    return 1 << max(0, n - 1).bit_length()
+
+def grid_layout(count, fw, fh, cols=0, pot=False, max_width=0):
+    """Frames left-to-right, top-to-bottom. cols=0: one strip, or as many
+    columns as fit in max_width when that is set."""
+    if not cols:
+        cols = min(count, max_width // fw) if max_width else count
+    cols = max(1, cols)
+    rows = -(-count // cols)
+    width, height = cols * fw, rows * fh
+    if pot:
+        width, height = next_pow2(width), next_pow2(height)
+    return {"width": width, "height": height, "cols": cols, "rows": rows,
+            "frame_size": [fw, fh],
+            "regions": [[(i % cols) * fw, (i // cols) * fh, fw, fh] for i in range(count)]}
+
+def rows_layout(anims, pot=False):
+    """Combined sheet, one row per animation. anims = [(name, fw, fh, count)]."""
+    width, y, out = 0, 0, {}
+    for name, fw, fh, count in anims:
+        out[name] = {"row": len(out), "frame_size": [fw, fh],
+                     "regions": [[i * fw, y, fw, fh] for i in range(count)]}
+        width = max(width, fw * count)
+        y += fh
+    height = y
+    if pot:
+        width, height = next_pow2(width), next_pow2(height)
+    return {"width": width, "height": height, "animations": out}
+
+def assemble(regions, frames, width, height):
+    """New sheet with frames (grids or DeltaFrames) pasted at their regions."""
+    sheet = [[T] * width for _ in range(height)]
+    for (x, y, _, _), frame in zip(regions, frames):
+        paste(sheet, frame, x, y)
+    return sheet
+
+def assemble_rows(layout, frames_by_name):
+    """Sheet for a rows_layout from {name: frames}."""
+    regions, frames = [], []
+    for name, anim in layout["animations"].items():
+        regions += anim["regions"]
+        frames += frames_by_name[name]
+    return assemble(regions, frames, layout["width"], layout["height"])
+
+# ── Benchmark ──
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark sheet assembly")
+    ap.add_argument("--frames", type=int, default=512)
+    ap.add_argument("--size", type=int, default=32)
+    ap.add_argument("--cols", type=int, default=0, help="0 = fit in --max-width")
+    ap.add_argument("--max-width", type=int, default=2048)
+    ap.add_argument("--pot", action="store_true")
+    args = ap.parse_args(argv)
+    s = args.size
+    frames = [[[(i % 256, x, y, 255) for x in range(s)] for y in range(s)] for i in range(args.frames)]
+    t0 = time.perf_counter()
+    lay = grid_layout(args.frames, s, s, args.cols, args.pot, args.max_width)
+    assemble(lay["regions"], frames, lay["width"], lay["height"])
+    ms = (time.perf_counter() - t0) * 1000
+    print(f"{args.frames} frames of {s}x{s} -> {lay['cols']}x{lay['rows']} grid, "
+          f"{lay['width']}x{lay['height']}: {ms:.1f} ms")
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+"""Resolution-independent primitives with supersampled anti-aliasing.
+Shapes take float geometry in unit space — (0, 0) is the top-left of the
+canvas and (1, 1) the bottom-right — so one definition renders the 48px
+pixel-art frame and a 512px export alike. Each shape is sampled on an
+NxN grid per pixel: a sub-row at a time, analytic x-intervals are turned
+into integer subsample counts per pixel, and the counts become coverage
+when the colour is composited. Uses only Python built-ins.
+
+    g = make_grid(48, 48)
+    vc = VectorCanvas(g, ss=4)
+    vc.circle(0.5, 0.5, 0.3, (255, 150, 30, 128))
+    vc.ring_sector(0.5, 0.5, 0.30, 0.45, -1.57, 2.2, (255, 255, 220, 255))
+
+Modes: "replace" (default) lerps towards the colour by coverage, so a fully
+covered pixel is overwritten exactly like set_px; "over" alpha-blends.
+
+Run: python sprite_vector.py [--size 256] [--ss 4] [out.png]
+     (exports the fireball explosion sheet at any frame size)
+"""
+import argparse, math, sys
+
+from sprite_postfx import over
+
+class VectorCanvas:
+    """Anti-aliased drawing onto an existing pixel grid (rows of RGBA tuples)."""
+
+    def __init__(self, grid, ss=4):
+        self.grid = grid
+        self.h = len(grid)
+        self.w = len(grid[0]) if grid else 0
+        self.ss = ss
+        self.full = ss * ss
+
+    # ── Coverage ──
+
+    def _coverage(self, top, bottom, intervals, test=None):
+        """{py: [subsample counts per px]} for pixel rows covering [top, bottom] (pixel units).
+        intervals(y) gives sorted (xa, xb) spans of the shape on the sub-row at y;
+        test(x, y), if given, filters individual subsamples inside those spans."""
+        ss, w = self.ss, self.w
+        cov = {}
+        py0 = max(0, int(math.floor(top)))
+        py1 = min(self.h - 1, int(math.ceil(bottom)))
+        for py in range(py0, py1 + 1):
+            counts = None
+            for j in range(ss):
+                ys = py + (j + 0.5) / ss
+                for xa, xb in intervals(ys):
+                    # Subsample k (centre (k + 0.5) / ss) lies inside [xa, xb]
+                    k0 = max(0, math.ceil(xa * ss - 0.5))
+                    k1 = min(w * ss - 1, math.floor(xb * ss - 0.5))
+                    if k0 > k1:
+                        continue
+                    if counts is None:
+                        counts = [0] * w
+                    if test is not None:
+                        for k in range(k0, k1 + 1):
+                            if test((k + 0.5) / ss, ys):
+                                counts[k // ss] += 1
+                        continue
+                    p0, p1 = k0 // ss, k1 // ss
+                    if p0 == p1:
+                        counts[p0] += k1 - k0 + 1
+                        continue
+                    counts[p0] += ss - k0 % ss
+                    for px in range(p0 + 1, p1):
+                        counts[px] += ss
+                    counts[p1] += k1 % ss + 1
+            if counts is not None:
+                cov[py] = counts
+        return cov
+
+    def _composite(self, cov, color, mode):
+        full = self.full
+        cr, cg, cb, ca = color
+        for py, counts in cov.items():
+            row = self.grid[py]
+            for px, n in enumerate(counts):
+                if n == 0:
+                    continue
+                if mode == "over":
+                    row[px] = over(row[px], (cr, cg, cb, ca * n // full))
+                elif n == full:
+                    row[px] = color
+                else:
+                    row[px] = _lerp(row[px], color, n / full)
+
+    # ── Shapes (unit-space coordinates) ──
+
+    def circle(self, cx, cy, r, color, mode="replace"):
+        self.ellipse(cx, cy, r, r, color, mode)
+
+    def ellipse(self, cx, cy, rx, ry, color, mode="replace"):
+        """Ellipse with radii as fractions of canvas width / height."""
+        cx, cy, rx, ry = cx * self.w, cy * self.h, rx * self.w, ry * self.h
+        if rx <= 0 or ry <= 0:
+            return
+        def spans(y):
+            t = 1.0 - ((y - cy) / ry) ** 2
+            if t < 0:
+                return ()
+            dx = rx * math.sqrt(t)
+            return ((cx - dx, cx + dx),)
+        self._composite(self._coverage(cy - ry, cy + ry, spans), color, mode)
+
+    def polygon(self, points, color, mode="replace"):
+        """Even-odd filled polygon through unit-space points."""
+        pts = [(x * self.w, y * self.h) for x, y in points]
+        edges = [(pts[i], pts[(i + 1) % len(pts)]) for i in range(len(pts))]
+        def spans(y):
+            xs = []
+            for (x0, y0), (x1, y1) in edges:
+                if (y0 <= y < y1) or (y1 <= y < y0):
+                    xs.append(x0 + (y - y0) * (x1 - x0) / (y1 - y0))
+            xs.sort()
+            return list(zip(xs[0::2], xs[1::2]))
+        ys = [p[1] for p in pts]
+        self._composite(self._coverage(min(ys), max(ys), spans), color, mode)
+
+    def line(self, x0, y0, x1, y1, width, color, mode="replace"):
+        """Segment of the given thickness (in pixels), drawn as a quad."""
+        ax, ay, bx, by = x0 * self.w, y0 * self.h, x1 * self.w, y1 * self.h
+        length = math.hypot(bx - ax, by - ay)
+        if length == 0:
+            return
+        nx, ny = -(by - ay) / length * width / 2, (bx - ax) / length * width / 2
+        quad = [(ax + nx, ay + ny), (bx + nx, by + ny), (bx - nx, by - ny), (ax - nx, ay - ny)]
+        self.polygon([(x / self.w, y / self.h) for x, y in quad], color, mode)
+
+    def ring_sector(self, cx, cy, r0, r1, a0, a1, color, mode="replace"):
+        """Annulus r0..r1 (fractions of width) between angles a0..a1 (radians, a0 < a1)."""
+        cx, cy = cx * self.w, cy * self.h
+        r0, r1 = r0 * self.w, r1 * self.w
+        def spans(y):
+            dy = y - cy
+            if abs(dy) > r1:
+                return ()
+            ox = math.sqrt(r1 * r1 - dy * dy)
+            if abs(dy) >= r0:
+                return ((cx - ox, cx + ox),)
+            ix = math.sqrt(r0 * r0 - dy * dy)
+            return ((cx - ox, cx - ix), (cx + ix, cx + ox))
+        full_turn = a1 - a0 >= 2 * math.pi
+        def test(x, y):
+            a = (math.atan2(y - cy, x - cx) - a0) % (2 * math.pi)
+            return a <= a1 - a0
+        cov = self._coverage(cy - r1, cy + r1, spans, None if full_turn else test)
+        self._composite(cov, color, mode)
+
+    def radial_gradient(self, cx, cy, r, stops, mode="replace"):
+        """Multi-stop radial gradient (sprite_gradient), radius as a fraction of width."""
+        from sprite_gradient import radial_gradient
+        radial_gradient(self.grid, cx * self.w, cy * self.h, r * self.w, stops, mode)
+
+# ── Pixel maths ──
+
+def _lerp(base, color, t):
+    """Premultiplied mix of base towards color by t (no dark fringes over transparency)."""
+    br, bg, bb, ba = base
+    cr, cg, cb, ca = color
+    a = ba + (ca - ba) * t
+    if a <= 0:
+        return (0, 0, 0, 0)
+    wb, wc = ba * (1 - t) / a, ca * t / a
+    return (int(br * wb + cr * wc + 0.5), int(bg * wb + cg * wc + 0.5),
+            int(bb * wb + cb * wc + 0.5), int(a + 0.5))
+
+# ── Export ──
+
+def main(argv=None):
+    from generate_sprites_v2 import FIREBALL_EXPLODE_CURVES, draw_fireball_explode, make_grid, \
+        make_spritesheet, write_png
+    from sprite_curves import sample_curves
+    ap = argparse.ArgumentParser(description="Export the vector fireball explosion at any frame size")
+    ap.add_argument("out", nargs="?", default="fireball_explode_hd.png")
+    ap.add_argument("--size", type=int, default=256, help="frame size in pixels")
+    ap.add_argument("--ss", type=int, default=4, help="supersampling (NxN per pixel)")
+    ap.add_argument("--frames", type=int, default=4)
+    args = ap.parse_args(argv)
+    frames = []
+    for p in sample_curves(FIREBALL_EXPLODE_CURVES, args.frames):
+        f = make_grid(args.size, args.size)
+        draw_fireball_explode(VectorCanvas(f, args.ss), p)
+        frames.append(f)
+    write_png(args.out, args.size * len(frames), args.size, make_spritesheet(frames, args.size, args.size))
+
+if __name__ == "__main__":
+    sys.exit(main())
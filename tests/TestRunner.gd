@@ -5,6 +5,7 @@ extends SceneTree
 # Output: JSON on last stdout line prefixed with "JSON:" for launcher parsing
 
 const C = preload("res://scripts/Constants.gd")
+const Audio = preload("res://scripts/AudioManager.gd")
 
 var _details: Array = []
 var _pass_count: int = 0
@@ -159,6 +160,12 @@ func _run_asset_validation() -> void:
 		_begin()
 		_check(FileAccess.file_exists(path), "File not found: %s" % path)
 		_end("Asset exists: %s" % path.get_file())
+	# Baked SFX (bake_sfx.py) for every tone spec in AudioManager
+	for sound_name in Audio.SFX_TONES:
+		var sfx_path: String = Audio.SFX_DIR + sound_name + ".wav"
+		_begin()
+		_check(FileAccess.file_exists(sfx_path), "SFX not baked: %s (run bake_sfx.py)" % sfx_path)
+		_end("SFX baked: %s" % sound_name)
 
 # ── Scene Loading ──
 
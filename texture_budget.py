@@ -0,0 +1,235 @@
+"""Texture memory / VRAM budget report for assets/*.png.
+Decodes every PNG, reads its Godot .import settings and estimates what the
+texture costs at runtime: decoded RGBA size on the CPU and VRAM after
+import (compress mode, mipmaps, size limit). Flags textures that are
+oversized, mostly transparent, non-power-of-two, pixel-identical to
+another texture, or sheets with repeated frames. Frame sizes come from
+placeholder_manifest.json where listed. Uses only Python built-ins.
+
+Exits non-zero when a gate is hit, so it can run in CI:
+    python texture_budget.py --budget-kb 512 --fail-on duplicate,oversized
+
+Run: python texture_budget.py [--json report.json] [--empty 0.25] [--max-size 2048]
+"""
+import argparse, glob, hashlib, json, os, struct, sys, zlib
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+ASSETS = os.path.join(ROOT, "assets")
+MANIFEST = os.path.join(ROOT, "placeholder_manifest.json")
+
+# Godot 4 CompressedTexture2D compress/mode -> VRAM bytes per pixel
+COMPRESS_MODES = {0: ("lossless", 4), 1: ("lossy", 4), 2: ("vram_compressed", 1),
+                  3: ("vram_uncompressed", 4), 4: ("basis_universal", 1)}
+FLAGS = ("oversized", "mostly_empty", "npot", "duplicate", "dup_frames")
+
+# ── PNG decoding ──
+
+def _paeth(a, b, c):
+    p = a + b - c
+    pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+    if pa <= pb and pa <= pc:
+        return a
+    return b if pb <= pc else c
+
+def read_png(path):
+    """(width, height, RGBA bytes) for 8-bit PNGs of any colour type, all filters."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if data[:8] != b"\x89PNG\r\n\x1a\n":
+        raise ValueError(f"{path}: not a PNG")
+    pos, idat, plte, trns, ihdr = 8, [], b"", b"", None
+    while pos < len(data):
+        n, ctype = struct.unpack(">I4s", data[pos:pos+8])
+        body = data[pos+8:pos+8+n]
+        if ctype == b"IHDR":
+            ihdr = body
+        elif ctype == b"IDAT":
+            idat.append(body)
+        elif ctype == b"PLTE":
+            plte = body
+        elif ctype == b"tRNS":
+            trns = body
+        pos += 12 + n
+    if ihdr is None or len(ihdr) != 13:
+        raise ValueError(f"{path}: missing IHDR")
+    w, h, depth, color, _, _, interlace = struct.unpack(">IIBBBBB", ihdr)
+    if depth != 8 or interlace:
+        raise ValueError(f"{path}: only 8-bit non-interlaced PNGs are supported")
+    bpp = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}[color]
+    raw = zlib.decompress(b"".join(idat))
+    stride = w * bpp
+    out = bytearray()
+    prev = bytearray(stride)
+    for y in range(h):
+        ft = raw[y * (stride + 1)]
+        line = bytearray(raw[y * (stride + 1) + 1:(y + 1) * (stride + 1)])
+        for i in range(stride):
+            a = line[i - bpp] if i >= bpp else 0
+            if ft == 1:
+                line[i] = (line[i] + a) & 0xFF
+            elif ft == 2:
+                line[i] = (line[i] + prev[i]) & 0xFF
+            elif ft == 3:
+                line[i] = (line[i] + (a + prev[i]) // 2) & 0xFF
+            elif ft == 4:
+                c = prev[i - bpp] if i >= bpp else 0
+                line[i] = (line[i] + _paeth(a, prev[i], c)) & 0xFF
+        prev = line
+        if color == 6:
+            out += line
+        elif color == 2:
+            for i in range(0, stride, 3):
+                out += line[i:i+3] + b"\xff"
+        elif color == 0:
+            for v in line:
+                out += bytes((v, v, v, 255))
+        elif color == 4:
+            for i in range(0, stride, 2):
+                out += bytes((line[i], line[i], line[i], line[i+1]))
+        else:
+            for v in line:
+                out += plte[v*3:v*3+3] + bytes((trns[v] if v < len(trns) else 255,))
+    return w, h, bytes(out)
+
+# ── .import settings ──
+
+def read_import(path):
+    """[params] of a Godot .import file as {key: python value}."""
+    params, section = {}, None
+    if not os.path.exists(path):
+        return params
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line.startswith("["):
+                section = line.strip("[]")
+            elif section == "params" and "=" in line:
+                k, v = line.split("=", 1)
+                try:
+                    params[k] = json.loads(v)
+                except ValueError:
+                    params[k] = v
+    return params
+
+def vram_bytes(w, h, params):
+    """Estimated VRAM for a texture imported with `params`."""
+    limit = params.get("process/size_limit", 0)
+    if limit and max(w, h) > limit:
+        s = limit / max(w, h)
+        w, h = max(1, int(w * s)), max(1, int(h * s))
+    _, bpp = COMPRESS_MODES.get(params.get("compress/mode", 0), ("?", 4))
+    if bpp == 1:  # block formats pad to 4x4 blocks
+        w, h = (w + 3) // 4 * 4, (h + 3) // 4 * 4
+    total = w * h * bpp
+    if params.get("mipmaps/generate"):
+        while w > 1 or h > 1:
+            w, h = max(1, w // 2), max(1, h // 2)
+            total += w * h * bpp
+    return total
+
+# ── Analysis ──
+
+def frame_sizes():
+    """{asset filename: (fw, fh)} for sprite sheets listed in the manifest."""
+    if not os.path.exists(MANIFEST):
+        return {}
+    with open(MANIFEST) as f:
+        assets = json.load(f).get("assets", {})
+    return {os.path.basename(e["file"]): tuple(e["frame_size"])
+            for group in assets.values() for e in group if "frame_size" in e}
+
+def is_pow2(n):
+    return n > 0 and n & (n - 1) == 0
+
+def analyse(path, frames, max_size, empty):
+    w, h, rgba = read_png(path)
+    params = read_import(path + ".import")
+    visible = sum(1 for a in rgba[3::4] if a)
+    name = os.path.basename(path)
+    t = {"file": os.path.relpath(path, ROOT), "width": w, "height": h,
+         "mode": COMPRESS_MODES.get(params.get("compress/mode", 0), ("?",))[0],
+         "mipmaps": bool(params.get("mipmaps/generate")),
+         "decoded": w * h * 4, "vram": vram_bytes(w, h, params),
+         "visible": visible / (w * h), "hash": hashlib.sha1(struct.pack(">II", w, h) + rgba).hexdigest(),
+         "flags": []}
+    if max(w, h) > max_size:
+        t["flags"].append("oversized")
+    if t["visible"] < empty:
+        t["flags"].append("mostly_empty")
+    if not (is_pow2(w) and is_pow2(h)):
+        t["flags"].append("npot")
+    fw, fh = frames.get(name, (w, h))
+    if (fw, fh) != (w, h) and w % fw == 0 and h % fh == 0:
+        seen = set()
+        for fy in range(0, h, fh):
+            for fx in range(0, w, fw):
+                cell = b"".join(rgba[((fy + y) * w + fx) * 4:((fy + y) * w + fx + fw) * 4] for y in range(fh))
+                key = hashlib.sha1(cell).digest()
+                if key in seen:
+                    t["flags"].append("dup_frames")
+                    break
+                seen.add(key)
+            if "dup_frames" in t["flags"]:
+                break
+    return t
+
+def build_report(paths, max_size=2048, empty=0.25):
+    frames = frame_sizes()
+    textures = [analyse(p, frames, max_size, empty) for p in paths]
+    by_hash = {}
+    for t in textures:
+        by_hash.setdefault(t["hash"], []).append(t)
+    for group in by_hash.values():
+        if len(group) > 1:
+            for t in group:
+                t["flags"].append("duplicate")
+                t["duplicate_of"] = [o["file"] for o in group if o is not t]
+    textures.sort(key=lambda t: (-t["vram"], t["file"]))
+    return {"textures": textures,
+            "total_decoded": sum(t["decoded"] for t in textures),
+            "total_vram": sum(t["vram"] for t in textures),
+            "wasted_vram": sum(int(t["vram"] * (1 - t["visible"])) for t in textures)}
+
+def print_report(report):
+    print(f"{'#':>3} {'texture':<30} {'size':>9} {'mode':<9} {'vis%':>5} {'decoded':>9} {'vram':>9}  flags")
+    for i, t in enumerate(report["textures"], 1):
+        flags = ", ".join(t["flags"])
+        if "duplicate_of" in t:
+            flags += f" ({', '.join(os.path.basename(f) for f in t['duplicate_of'])})"
+        print(f"{i:>3} {os.path.basename(t['file']):<30} {t['width']:>4}x{t['height']:<4} {t['mode']:<9} "
+              f"{t['visible']*100:>5.1f} {t['decoded']/1024:>7.1f}KB {t['vram']/1024:>7.1f}KB  {flags}")
+    print(f"\n{len(report['textures'])} textures: {report['total_decoded']/1024:.1f} KB decoded, "
+          f"{report['total_vram']/1024:.1f} KB VRAM ({report['wasted_vram']/1024:.1f} KB transparent)")
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Texture memory / VRAM budget report for assets/")
+    ap.add_argument("paths", nargs="*", help="PNG files (default: assets/*.png)")
+    ap.add_argument("--max-size", type=int, default=2048, help="flag textures larger than this (px)")
+    ap.add_argument("--empty", type=float, default=0.25, help="flag textures with less visible coverage")
+    ap.add_argument("--budget-kb", type=float, help="fail if total VRAM exceeds this")
+    ap.add_argument("--fail-on", default="", help=f"comma list of flags that fail the run: {','.join(FLAGS)}")
+    ap.add_argument("--json", help="also write the report here")
+    args = ap.parse_args(argv)
+
+    paths = args.paths or sorted(glob.glob(os.path.join(ASSETS, "*.png")))
+    report = build_report(paths, args.max_size, args.empty)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+    failures = []
+    if args.budget_kb is not None and report["total_vram"] > args.budget_kb * 1024:
+        failures.append(f"total VRAM {report['total_vram']/1024:.1f} KB > budget {args.budget_kb:g} KB")
+    for flag in filter(None, args.fail_on.split(",")):
+        if flag not in FLAGS:
+            ap.error(f"unknown flag: {flag}")
+        hits = [os.path.basename(t["file"]) for t in report["textures"] if flag in t["flags"]]
+        if hits:
+            failures.append(f"{flag}: {', '.join(hits)}")
+    for msg in failures:
+        print(f"FAIL {msg}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())